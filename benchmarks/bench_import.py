@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:12:09 2026
+
+@author: Labadmin
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Import statement -> heavy modules it must not import
+CASES = {'import dronesurveymapper': ['PIL', 'cv2', 'pandas', 'pyproj', 'shapely'],
+         'from dronesurveymapper.image import read_image_metadata': ['cv2', 'pandas', 'pyproj', 'shapely'],
+         'from dronesurveymapper.image import EXIFXMPReader': ['cv2', 'pandas', 'pyproj', 'shapely'],
+         'from dronesurveymapper.image import SurveyImagesToSpatial': ['cv2', 'pyproj', 'shapely'],
+         'from dronesurveymapper.video import read_telemetry_json': ['cv2', 'PIL', 'pyproj', 'shapely'],
+         'from dronesurveymapper.video import DJIVideoExifReader': ['PIL', 'pyproj', 'shapely']}
+HEAVY_MODULES = ['PIL', 'cv2', 'pandas', 'pyarrow', 'pyproj', 'shapely', 'geopandas', 'tqdm']
+
+_CHILD = '''
+import sys, time, json
+t = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - t
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+
+def time_import(statement, repeat=5):
+    """
+    Times an import statement in fresh interpreters.
+
+    Args:
+        statement (str): The import statement.
+        repeat (int): Number of fresh interpreters. The fastest run is kept.
+
+    Returns:
+        seconds (float): Fastest import time.
+        loaded (list of str): Heavy modules loaded by the statement.
+
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')]))}
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', _CHILD.format(statement=statement, heavy=HEAVY_MODULES)],
+                             stdout=subprocess.PIPE, check=True, env=env, text=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best['seconds'], best['loaded']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import-time benchmark. Fails if an entry point imports a forbidden heavy module.')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per statement (fastest is kept).')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for statement, forbidden in CASES.items():
+        seconds, loaded = time_import(statement, args.repeat)
+        leaked = [module for module in forbidden if module in loaded]
+        failed |= bool(leaked)
+        status = f'FAIL imports {leaked}' if leaked else 'ok'
+        print(f'{seconds * 1000:8.1f} ms  {statement:<60} loads {loaded}  {status}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
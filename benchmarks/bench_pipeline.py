@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:05:12 2026
+
+@author: Labadmin
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import synthetic
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dronesurveymapper.image.discovery import iter_survey_images  # noqa: E402
+from dronesurveymapper.image.ingest import iter_image_metadata  # noqa: E402
+from dronesurveymapper.image.survey_table import build_survey_table, set_projection  # noqa: E402
+from dronesurveymapper.image.get_metadata import EXIFXMPReader, SurveyImagesToSpatial  # noqa: E402
+from dronesurveymapper.writers import write_features, point_chunks  # noqa: E402
+from dronesurveymapper.video.video_exif_reader import DJIVideoExifReader  # noqa: E402
+from dronesurveymapper.video.frame_table import build_frame_table, write_frame_table  # noqa: E402
+
+SCALES = [100, 10000, 100000]
+IMAGE_STAGES = ['discovery', 'metadata parse', 'table build', 'reprojection', 'geojson write',
+                'exifxmpreader', 'survey end-to-end']
+TELEMETRY_STAGES = ['telemetry parse', 'csv write']
+STAGES = IMAGE_STAGES + TELEMETRY_STAGES
+
+
+def measure(func, memory=True):
+    """
+    Times a stage, then runs it again under tracemalloc for its peak Python memory (tracing slows the stage down, so
+    the two are measured separately).
+
+    Args:
+        func (callable): The stage, called without arguments.
+        memory (bool): If True (default), also measure the peak memory.
+
+    Returns:
+        seconds (float): Wall time of the stage.
+        peak_bytes (int): Peak memory allocated during the stage (None if memory is False).
+        result: Return value of the stage.
+
+    """
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    peak_bytes = None
+    if memory:
+        del result
+        tracemalloc.start()
+        result = func()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak_bytes, result
+
+
+def image_stages(survey_dir, out_dir, stages, out_epsg, workers):
+    """
+    Yields the image stages of a synthetic survey. Each stage uses the output of the previous ones.
+
+    Yields:
+        stage (str): Stage name.
+        func (callable): The stage.
+
+    """
+    state = {}
+
+    def discovery():
+        state['paths'] = list(iter_survey_images(survey_dir, recursive=True))
+        return state['paths']
+
+    def metadata_parse():
+        state['records'] = [metadata for _, metadata, _ in iter_image_metadata(state['paths'], workers=workers)]
+        return state['records']
+
+    def table_build():
+        state['table'] = build_survey_table(state['records'])
+        return state['table']
+
+    def reprojection():
+        set_projection(state['table'], out_epsg)
+
+    def geojson_write():
+        return write_features(os.path.join(out_dir, 'survey.geojson'), point_chunks([state['table']]), out_epsg,
+                              driver='GeoJSON')
+
+    def exifxmpreader():
+        return [EXIFXMPReader(path, out_epsg).reproject_coords() for path in state['paths']]
+
+    def survey_end_to_end():
+        survey = SurveyImagesToSpatial(survey_dir, out_epsg, workers=workers, load=False, recursive=True,
+                                       progress=False)
+        return survey.write_spatial(os.path.join(out_dir, 'survey_e2e.geojson'))
+
+    funcs = {'discovery': discovery,
+             'metadata parse': metadata_parse,
+             'table build': table_build,
+             'reprojection': reprojection,
+             'geojson write': geojson_write,
+             'exifxmpreader': exifxmpreader,
+             'survey end-to-end': survey_end_to_end}
+    # Stages that feed the selected ones always run
+    needed = {'metadata parse': ['discovery'],
+              'table build': ['discovery', 'metadata parse'],
+              'reprojection': ['discovery', 'metadata parse', 'table build'],
+              'geojson write': ['discovery', 'metadata parse', 'table build', 'reprojection'],
+              'exifxmpreader': ['discovery']}
+    required = set(stages)
+    for stage in stages:
+        required.update(needed.get(stage, []))
+    for stage in IMAGE_STAGES:
+        if stage in required:
+            yield stage, funcs[stage]
+
+
+def telemetry_stages(txt_path, out_dir, stages):
+    """
+    Yields the telemetry stages of a synthetic video.
+
+    Yields:
+        stage (str): Stage name.
+        func (callable): The stage.
+
+    """
+    # The reader only needs the video file to exist when the telemetry comes from a text file
+    video_path = os.path.join(out_dir, 'synthetic.MP4')
+    open(video_path, 'wb').close()
+    reader = DJIVideoExifReader(video_path, out_dir, txt_path=txt_path)
+
+    def telemetry_parse():
+        return reader.parse_exiftxt()
+
+    def csv_write():
+        table = build_frame_table(reader.telemetry)
+        write_frame_table(table, os.path.join(out_dir, 'frames.csv'))
+        return table
+
+    if 'telemetry parse' in stages or 'csv write' in stages:
+        yield 'telemetry parse', telemetry_parse
+    if 'csv write' in stages:
+        yield 'csv write', csv_write
+
+
+def run(scales, work_dir, stages=STAGES, out_epsg='EPSG:32612', workers=1, memory=True):
+    """
+    Generates the synthetic data (reused between runs) and benchmarks each stage at each scale.
+    Image stages process `scale` images, telemetry stages a flight of `scale` samples.
+
+    Args:
+        scales (list of int): Numbers of images / telemetry samples.
+        work_dir (str): Folder for the synthetic data and outputs.
+        stages (list of str): Stages to report. Default is all of STAGES.
+        out_epsg (str): EPSG of the reprojection and outputs. Default is 'EPSG:32612'.
+        workers (int): Number of parallel metadata readers. Default is 1.
+        memory (bool): If True (default), also measure the peak memory of each stage.
+
+    Returns:
+        results (list of dict): One result per scale and stage.
+
+    """
+    results = []
+    for scale in scales:
+        out_dir = os.path.join(work_dir, f'out_{scale}')
+        os.makedirs(out_dir, exist_ok=True)
+        jobs = []
+        if any(stage in IMAGE_STAGES for stage in stages):
+            survey_dir = synthetic.write_survey(os.path.join(work_dir, f'survey_{scale}'), scale)
+            jobs += list(image_stages(survey_dir, out_dir, stages, out_epsg, workers))
+        if any(stage in TELEMETRY_STAGES for stage in stages):
+            txt_path = os.path.join(work_dir, f'telemetry_{scale}.txt')
+            if not os.path.isfile(txt_path):
+                synthetic.write_exiftool_text(txt_path, scale)
+            jobs += list(telemetry_stages(txt_path, out_dir, stages))
+
+        for stage, func in jobs:
+            seconds, peak_bytes, _ = measure(func, memory and stage in stages)
+            if stage not in stages:
+                continue
+            result = {'scale': scale, 'stage': stage, 'seconds': seconds,
+                      'items_per_second': scale / seconds if seconds > 0 else None, 'peak_mb': None}
+            if peak_bytes is not None:
+                result['peak_mb'] = peak_bytes / 1e6
+            results.append(result)
+            peak = '' if peak_bytes is None else f'{peak_bytes / 1e6:9.1f} MB'
+            print(f'{scale:>8} {stage:<18} {seconds:9.3f} s {result["items_per_second"]:12.0f} /s {peak}')
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='End-to-end benchmark of the image and telemetry pipelines on synthetic '
+                                                 'DJI data. Runs offline; the data is generated once in work_dir.')
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES, help='Numbers of images / telemetry samples.')
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES, metavar='STAGE',
+                        help=f'Stages to run, among {STAGES}.')
+    parser.add_argument('--work_dir', default=os.path.join(tempfile.gettempdir(), 'dronesurveymapper_bench'),
+                        help='Folder for the synthetic data and outputs.')
+    parser.add_argument('--out_epsg', default='EPSG:32612', help='EPSG of the reprojection and outputs.')
+    parser.add_argument('--workers', type=int, default=1, help='Number of parallel metadata readers.')
+    parser.add_argument('--no_memory', action='store_true', help='Skip the peak memory runs.')
+    parser.add_argument('--json', default=None, help='Optional path to write the results as JSON.')
+    args = parser.parse_args(argv)
+
+    print(f'{"scale":>8} {"stage":<18} {"time":>11} {"throughput":>15} {"peak memory":>12}')
+    results = run(args.scales, args.work_dir, args.stages, args.out_epsg, args.workers, not args.no_memory)
+    if args.json is not None:
+        with open(args.json, 'w') as f_out:
+            json.dump({'python': sys.version, 'workers': args.workers, 'results': results}, f_out, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
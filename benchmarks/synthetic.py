@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:20:44 2026
+
+@author: Labadmin
+"""
+import io
+import os
+import math
+import struct
+import datetime
+
+from PIL import Image
+
+XMP_TEMPLATE = ('<?xpacket begin="\ufeff" id="W5M0MpCehiHzreSzNTczkc9d"?>\n'
+                '<x:xmpmeta xmlns:x="adobe:ns:meta/">\n'
+                ' <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">\n'
+                '  <rdf:Description rdf:about="DJI Meta Data"\n'
+                '    xmlns:tiff="http://ns.adobe.com/tiff/1.0/"\n'
+                '    xmlns:exif="http://ns.adobe.com/exif/1.0/"\n'
+                '    xmlns:drone-dji="http://www.dji.com/drone-dji/1.0/"\n'
+                '   tiff:Make="DJI"\n'
+                '   tiff:Model="{model}"\n'
+                '   drone-dji:GpsStatus="RTK"\n'
+                '   drone-dji:AltitudeType="RtkAlt"\n'
+                '   drone-dji:AbsoluteAltitude="{absolute_altitude:+.3f}"\n'
+                '   drone-dji:RelativeAltitude="{relative_altitude:+.3f}"\n'
+                '   drone-dji:GimbalRollDegree="+0.00"\n'
+                '   drone-dji:GimbalYawDegree="{yaw:+.2f}"\n'
+                '   drone-dji:GimbalPitchDegree="-90.00"\n'
+                '   drone-dji:FlightRollDegree="{roll:+.2f}"\n'
+                '   drone-dji:FlightYawDegree="{yaw:+.2f}"\n'
+                '   drone-dji:FlightPitchDegree="{pitch:+.2f}"\n'
+                '   drone-dji:FlightXSpeed="+5.20"\n'
+                '   drone-dji:FlightYSpeed="+0.10"\n'
+                '   drone-dji:FlightZSpeed="+0.00"\n'
+                '   drone-dji:CamReverse="0"\n'
+                '   drone-dji:GimbalReverse="0"\n'
+                '   drone-dji:RtkFlag="50"\n'
+                '   drone-dji:RtkStdLon="0.012"\n'
+                '   drone-dji:RtkStdLat="0.011"\n'
+                '   drone-dji:RtkStdHgt="0.025"\n'
+                '   drone-dji:DewarpFlag="0"\n'
+                '   drone-dji:CaptureUUID="{uuid}"/>\n'
+                ' </rdf:RDF>\n'
+                '</x:xmpmeta>\n'
+                '<?xpacket end="w"?>')
+XMP_HEADER = b'http://ns.adobe.com/xap/1.0/\x00'
+
+# Survey start, origin (Edmonton) and lawnmower pattern of the synthetic flights
+START_TIME = datetime.datetime(2024, 6, 1, 17, 0, 0)
+ORIGIN = (-113.5, 53.5)
+LINE_LENGTH = 50
+SPACING_DEG = 2e-4
+
+
+def _dms(value):
+    value = abs(value)
+    degrees = int(value)
+    minutes = int((value - degrees) * 60)
+    seconds = (value - degrees - minutes / 60) * 3600
+    return (degrees, minutes, round(seconds, 4))
+
+
+def _segment(marker, payload):
+    return b'\xff' + bytes([marker]) + struct.pack('>H', len(payload) + 2) + payload
+
+
+def _scan_data(width, height):
+    """
+    Encodes a small image once and returns everything after its header segments (quantization tables, frame header,
+    Huffman tables, scan), so each synthetic JPEG only needs its own EXIF and XMP segments.
+    """
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (96, 128, 80)).save(buffer, 'JPEG', quality=75)
+    data = buffer.getvalue()
+    pos = 2
+    # Skip the APP segments (JFIF) written by PIL
+    while 0xE0 <= data[pos + 1] <= 0xEF:
+        pos += 2 + struct.unpack('>H', data[pos + 2:pos + 4])[0]
+    return data[pos:]
+
+
+def survey_position(i):
+    """
+    Position of the i-th image of a synthetic lawnmower survey.
+
+    Args:
+        i (int): Image number.
+
+    Returns:
+        lon (float): Longitude.
+        lat (float): Latitude.
+        yaw (float): Flight direction (degrees).
+
+    """
+    line, step = divmod(i, LINE_LENGTH)
+    if line % 2:
+        step = LINE_LENGTH - 1 - step
+    return ORIGIN[0] + step * SPACING_DEG, ORIGIN[1] + line * SPACING_DEG, 90.0 if line % 2 == 0 else -90.0
+
+
+def make_dji_jpeg(i, model='M3M', width=64, height=48, scan_data=None):
+    """
+    Builds a synthetic DJI JPEG: a tiny image with a realistic EXIF block (camera, date, 35mm focal length, GPS IFD) and
+    drone-dji XMP packet, laid out like a DJI file (SOI, APP1 Exif, APP1 XMP, image data).
+
+    Args:
+        i (int): Image number, used for the position, time and attitude.
+        model (str): Camera model. Default is 'M3M'.
+        width (int): Image width (px). Default is 64.
+        height (int): Image height (px). Default is 48.
+        scan_data (bytes): Optional output of _scan_data(width, height), reused between images.
+
+    Returns:
+        data (bytes): The JPEG.
+
+    """
+    if scan_data is None:
+        scan_data = _scan_data(width, height)
+    lon, lat, yaw = survey_position(i)
+    relative_altitude = 100.0 + 0.5 * math.sin(i / 10)
+    absolute_altitude = 712.0 + relative_altitude
+
+    exif = Image.Exif()
+    exif[0x010F] = 'DJI'
+    exif[0x0110] = model
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x9003] = (START_TIME + datetime.timedelta(seconds=2 * i)).strftime('%Y:%m:%d %H:%M:%S')
+    exif_ifd[0xA405] = 24
+    exif_ifd[0xA404] = 1.0
+    exif_ifd[0xA002] = width
+    exif_ifd[0xA003] = height
+    gps_ifd = exif.get_ifd(0x8825)
+    gps_ifd[0] = b'\x02\x03\x00\x00'
+    gps_ifd[1] = 'N' if lat >= 0 else 'S'
+    gps_ifd[2] = _dms(lat)
+    gps_ifd[3] = 'E' if lon >= 0 else 'W'
+    gps_ifd[4] = _dms(lon)
+    gps_ifd[5] = b'\x00'
+    gps_ifd[6] = round(absolute_altitude, 3)
+
+    xmp = XMP_TEMPLATE.format(model=model, absolute_altitude=absolute_altitude, relative_altitude=relative_altitude,
+                              yaw=yaw, roll=0.5 * math.sin(i), pitch=-2.0, uuid=f'{i:032X}')
+    return (b'\xff\xd8'
+            + _segment(0xE1, b'Exif\x00\x00' + exif.tobytes())
+            + _segment(0xE1, XMP_HEADER + xmp.encode('utf-8'))
+            + scan_data)
+
+
+def write_survey(folder, n_images, images_per_folder=999, model='M3M'):
+    """
+    Writes a synthetic survey laid out like a DJI SD card (DCIM/100MEDIA, DCIM/101MEDIA, ...).
+    An existing survey of the same size is reused.
+
+    Args:
+        folder (str): Root of the survey.
+        n_images (int): Number of images.
+        images_per_folder (int): Images per media folder. Default is 999, as on DJI cards.
+        model (str): Camera model. Default is 'M3M'.
+
+    Returns:
+        folder (str): Root of the survey.
+
+    """
+    marker = os.path.join(folder, f'.synthetic_{n_images}')
+    if os.path.isfile(marker):
+        return folder
+    scan_data = _scan_data(64, 48)
+    for i in range(n_images):
+        media_dir = os.path.join(folder, 'DCIM', f'{100 + i // images_per_folder}MEDIA')
+        if i % images_per_folder == 0:
+            os.makedirs(media_dir, exist_ok=True)
+        with open(os.path.join(media_dir, f'DJI_{i % images_per_folder + 1:04d}.JPG'), 'wb') as f_out:
+            f_out.write(make_dji_jpeg(i, model, scan_data=scan_data))
+    open(marker, 'w').close()
+    return folder
+
+
+def _text_line(tag, value):
+    return f'{tag:<32}: {value}\n'
+
+
+def _text_dms(value, positive, negative):
+    degrees, minutes, seconds = _dms(value)
+    return f'{degrees} deg {minutes}\' {seconds:.2f}" {positive if value >= 0 else negative}'
+
+
+def write_exiftool_text(path, n_samples, sample_seconds=0.1):
+    """
+    Writes synthetic 'exiftool -ee' output of a DJI video, as read by DJIVideoExifReader(txt_path=...).
+    Like real output, the file starts with the container tags, repeats the protocol block every few samples and
+    formats sample times as '12.30 s' below 30 s and 'H:MM:SS' above.
+
+    Args:
+        path (str): Output path.
+        n_samples (int): Number of telemetry samples (flight length = n_samples * sample_seconds).
+        sample_seconds (float): Time between samples. Default is 0.1 (10 Hz).
+
+    Returns:
+        path (str): The output path.
+
+    """
+    with open(path, 'w') as f_out:
+        f_out.write(_text_line('ExifTool Version Number', '12.40'))
+        f_out.write(_text_line('File Name', os.path.basename(path).replace('.txt', '.MP4')))
+        f_out.write(_text_line('Image Width', '3840'))
+        f_out.write(_text_line('Image Height', '2160'))
+        for i in range(n_samples):
+            elapsed = i * sample_seconds
+            lon, lat, yaw = survey_position(i // 10)
+            lines = []
+            if elapsed < 30:
+                lines.append(_text_line('Sample Time', f'{elapsed:.2f} s'))
+            else:
+                lines.append(_text_line('Sample Time', str(datetime.timedelta(seconds=int(elapsed)))))
+            lines.append(_text_line('Sample Duration', f'{sample_seconds:.2f} s'))
+            if i % 10 == 0:
+                lines += [_text_line('Protocol', 'dvtm_ac203.proto'), _text_line('Model', 'DJI Air 3')]
+            time = START_TIME + datetime.timedelta(seconds=elapsed)
+            lines += [_text_line('ISO', '100'),
+                      _text_line('Shutter Speed', '1/1000'),
+                      _text_line('F Number', '2.8'),
+                      _text_line('Digital Zoom', '1.00'),
+                      _text_line('Drone Roll', f'{0.5 * math.sin(i / 7):.1f}'),
+                      _text_line('Drone Pitch', '-2.0'),
+                      _text_line('Drone Yaw', f'{yaw:.1f}'),
+                      _text_line('GPS Latitude', _text_dms(lat, 'N', 'S')),
+                      _text_line('GPS Longitude', _text_dms(lon, 'E', 'W')),
+                      _text_line('Absolute Altitude', '+812.000'),
+                      _text_line('Relative Altitude', '+100.000'),
+                      _text_line('Gimbal Pitch', '-90.0'),
+                      _text_line('Gimbal Yaw', f'{yaw:.1f}'),
+                      _text_line('GPS Date/Time', time.strftime('%Y:%m:%d %H:%M:%S.') + f'{time.microsecond // 1000:03d}Z')]
+            f_out.writelines(lines)
+    return path
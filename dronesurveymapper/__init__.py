@@ -5,5 +5,10 @@ Created on Tue May 20 15:00:33 2025
 @author: Labadmin
 """
 
-from . import image
-from . import video
\ No newline at end of file
+from ._lazy import lazy_exports
+
+# Subpackages and modules are imported on first access (PEP 562), so 'import dronesurveymapper' is cheap and an image
+# run never imports the video stack (OpenCV), nor a video run the image stack
+_SUBMODULES = ('image', 'video', 'projection', 'writers', 'footprints', 'metrics')
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {name: () for name in _SUBMODULES})
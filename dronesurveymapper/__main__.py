@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:41:07 2026
+
+@author: Labadmin
+"""
+from .cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:12:41 2026
+
+@author: Labadmin
+"""
+import sys
+import importlib
+import importlib.util
+
+
+def lazy_exports(package, exports):
+    """
+    Builds the PEP 562 module __getattr__ and __dir__ of a package whose submodules are imported on first access.
+    Exported names resolve to their value in the submodule that provides them, and any other submodule (e.g.,
+    'package.get_metadata') resolves to the module itself, as it would after an eager import.
+
+    Args:
+        package (str): Name of the package (its __name__).
+        exports (dict): Submodule name -> public names it provides.
+
+    Returns:
+        all (list of str): The exported names and submodules, for __all__.
+        getattr (callable): The module __getattr__.
+        dir (callable): The module __dir__.
+
+    """
+    name_to_module = {name: module for module, names in exports.items() for name in names}
+    public = list(dict.fromkeys([*exports, *name_to_module]))
+
+    def __getattr__(name):
+        module = name_to_module.get(name)
+        if module is not None:
+            value = getattr(importlib.import_module(f'.{module}', package), name)
+            setattr(sys.modules[package], name, value)  # Later lookups skip __getattr__
+            return value
+        # Importing a submodule also sets it as an attribute of the package
+        if not name.startswith('__') and importlib.util.find_spec(f'{package}.{name}') is not None:
+            return importlib.import_module(f'.{name}', package)
+        raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(public))
+
+    return public, __getattr__, __dir__
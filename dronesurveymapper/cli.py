@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:02:51 2026
+
+@author: Labadmin
+"""
+import argparse
+
+
+def _image(args):
+    from .image.get_metadata import SurveyImagesToSpatial
+
+    xmp_fields = None
+    if args.xmp_fields is not None:
+        xmp_fields = 'all' if args.xmp_fields == ['all'] else args.xmp_fields
+    # Streamed when only the points are written; with footprints the table is read once and used for both layers
+    survey = SurveyImagesToSpatial(args.survey_dir, args.out_epsg, workers=args.workers, cache=args.cache,
+                                   load=args.footprints is not None, recursive=args.recursive, xmp_fields=xmp_fields)
+    n_images = survey.write_spatial(args.output)
+    print(f'Wrote {n_images} images to {args.output}')
+    if args.footprints is not None:
+        n_footprints = survey.write_footprints(args.footprints)
+        print(f'Wrote {n_footprints} footprints to {args.footprints}')
+    for image_path, error in survey.failures:
+        print(f'Skipped {image_path}: {error}')
+    return 0
+
+
+def _video(args):
+    from .video.video_exif_reader import DJIVideoExifReader
+
+    reader = DJIVideoExifReader(args.video_path, args.output_dir, exiftool=args.exiftool)
+    if not args.no_frames:
+        reader.extract_frames_from_video(interval_seconds=args.interval_seconds, mode=args.mode,
+                                         image_format=args.image_format)
+    reader.save_frame_csv(path=args.frames_output, out_epsg=args.out_epsg)
+    return 0
+
+
+def _batch(args):
+    from .video.batch import run_batch
+
+    return run_batch(args)
+
+
+def _watch(args):
+    from .watch import FolderWatcher
+
+    watcher = FolderWatcher(args.folder, args.output, args.out_epsg, video_output_root=args.video_output,
+                            footprints_output=args.footprints, settle_seconds=args.settle_seconds,
+                            workers=args.workers, exiftool=args.exiftool, interval_seconds=args.interval_seconds)
+    print(f'Watching {args.folder} (Ctrl+C to stop)')
+
+    def report(n_images, n_videos):
+        print(f'Added {n_images} images and processed {n_videos} videos')
+
+    watcher.run(poll_seconds=args.poll_seconds, max_polls=args.max_polls, callback=report)
+    for path, error in watcher.failures:
+        print(f'Failed {path}: {error}')
+    return 1 if watcher.failures else 0
+
+
+def build_parser():
+    """
+    Builds the dronesurveymapper argument parser, with one subcommand per workflow.
+
+    Returns:
+        parser (argparse.ArgumentParser): The parser.
+
+    """
+    from .video.batch import add_batch_arguments
+
+    parser = argparse.ArgumentParser(prog='dronesurveymapper',
+                                     description='Map drone survey images and videos for use in GIS.')
+    parser.add_argument('--metrics', default=None, help='Write per-stage timings and counters of the run to this JSON file.')
+    parser.add_argument('--metrics_summary', action='store_true', help='Print a summary of the timings and counters at the end.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    image = subparsers.add_parser('image', help='Map a folder of survey images.')
+    image.add_argument('survey_dir', help='Folder containing the drone images, or a .zip/.tar archive of it.')
+    image.add_argument('output', help='Output path (.geojson, .fgb, .gpkg or .parquet).')
+    image.add_argument('--out_epsg', default='EPSG:4326', help='EPSG code of the output, e.g., EPSG:32611.')
+    image.add_argument('--recursive', action='store_true', help='Also read images in sub-folders.')
+    image.add_argument('--workers', type=int, default=1, help='Number of parallel metadata readers.')
+    image.add_argument('--cache', default=None, help='Path to a persistent metadata cache (SQLite).')
+    image.add_argument('--footprints', default=None, help='Optional output path for the image footprints.')
+    image.add_argument('--xmp_fields', nargs='+', default=None,
+                       help="XMP fields to add as columns (column names or properties), or 'all'.")
+    image.set_defaults(run=_image)
+
+    video = subparsers.add_parser('video', help='Extract the telemetry and frames of one DJI video.')
+    video.add_argument('video_path', help='Path to the DJI video.')
+    video.add_argument('output_dir', help='Folder for the frames and frame table.')
+    video.add_argument('--interval_seconds', type=float, default=1, help='Time between extracted frames.')
+    video.add_argument('--mode', default='grab', choices=['grab', 'seek', 'keyframe'], help='Frame sampling mode.')
+    video.add_argument('--image_format', default='jpg', help='Frame image format.')
+    video.add_argument('--no_frames', action='store_true', help='Only write the frame table.')
+    video.add_argument('--frames_output', default=None,
+                       help='Frame table path (.csv, .parquet, or a spatial format for frame points). Default is output_dir/frames.csv.')
+    video.add_argument('--out_epsg', default='EPSG:4326', help='EPSG code of the frame points.')
+    video.add_argument('--exiftool', default='exiftool', help='exiftool executable.')
+    video.set_defaults(run=_video)
+
+    batch = subparsers.add_parser('batch', help='Extract the telemetry and frames of many DJI videos.')
+    add_batch_arguments(batch)
+    batch.set_defaults(run=_batch)
+
+    watch = subparsers.add_parser('watch', help='Watch a folder and add new images and videos as they arrive.')
+    watch.add_argument('folder', help='Folder to watch.')
+    watch.add_argument('output', help='GeoPackage (.gpkg) of image points, extended as images arrive.')
+    watch.add_argument('--out_epsg', default='EPSG:4326', help='EPSG code of the output.')
+    watch.add_argument('--video_output', default=None, help='Folder for the video outputs. Videos are ignored if not given.')
+    watch.add_argument('--footprints', default=None, help='Optional GeoPackage (.gpkg) of image footprints.')
+    watch.add_argument('--poll_seconds', type=float, default=10, help='Time between scans of the folder.')
+    watch.add_argument('--settle_seconds', type=float, default=5,
+                       help='Time a file must stay unchanged before it is processed.')
+    watch.add_argument('--max_polls', type=int, default=None, help='Stop after this many scans.')
+    watch.add_argument('--workers', type=int, default=1, help='Number of parallel metadata readers.')
+    watch.add_argument('--interval_seconds', type=float, default=1, help='Time between extracted video frames.')
+    watch.add_argument('--exiftool', default='exiftool', help='exiftool executable.')
+    watch.set_defaults(run=_watch)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics is None and not args.metrics_summary:
+        return args.run(args)
+
+    from .metrics import collect_metrics
+
+    with collect_metrics() as metrics:
+        try:
+            return args.run(args)
+        finally:
+            # Also reported when the run fails or is interrupted
+            metrics.stop()
+            if args.metrics is not None:
+                metrics.save_json(args.metrics)
+            if args.metrics_summary:
+                print(metrics.summary())
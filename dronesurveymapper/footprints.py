@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:47:12 2026
+
+@author: Labadmin
+"""
+import numpy as np
+import shapely
+from pyproj import Geod
+
+from .metrics import get_metrics
+from .projection import reproject_lon_lat
+
+# Diagonal of a 36 x 24 mm frame; 35mm equivalent focal lengths are defined against it
+FULL_FRAME_DIAGONAL_MM = np.hypot(36.0, 24.0)
+# Image corners as (right, up) multiples of the half field of view: top-left, top-right, bottom-right, bottom-left
+CORNERS = np.array([[-1.0, 1.0], [1.0, 1.0], [1.0, -1.0], [-1.0, -1.0]])
+
+_GEOD = Geod(ellps='WGS84')
+
+
+def field_of_view(focal_length_35mm, width, height, zoom=None):
+    """
+    Horizontal and vertical fields of view from 35mm equivalent focal lengths, for arrays of images.
+
+    Args:
+        focal_length_35mm (array-like): 35mm equivalent focal lengths (mm).
+        width (array-like): Image widths (px).
+        height (array-like): Image heights (px).
+        zoom (array-like): Optional digital zoom ratios; they narrow the field of view.
+
+    Returns:
+        hfov (np.ndarray): Horizontal fields of view (radians).
+        vfov (np.ndarray): Vertical fields of view (radians).
+
+    """
+    focal = np.asarray(focal_length_35mm, dtype=np.float64)
+    width = np.asarray(width, dtype=np.float64)
+    height = np.asarray(height, dtype=np.float64)
+    if zoom is not None:
+        zoom = np.asarray(zoom, dtype=np.float64)
+        focal = focal * np.where(np.isfinite(zoom) & (zoom > 0), zoom, 1.0)
+    # Equivalent sensor size with the aspect ratio of the image
+    diagonal_px = np.hypot(width, height)
+    sensor_w = FULL_FRAME_DIAGONAL_MM * width / diagonal_px
+    sensor_h = FULL_FRAME_DIAGONAL_MM * height / diagonal_px
+    return 2 * np.arctan(sensor_w / (2 * focal)), 2 * np.arctan(sensor_h / (2 * focal))
+
+
+def rotation_matrices(yaw, pitch, roll):
+    """
+    Camera-to-world rotations for arrays of gimbal angles, in one batched computation.
+    The world frame is east-north-up. The camera looks north with level pitch at yaw=pitch=roll=0.
+    Yaw is clockwise from north, pitch is positive up (-90 is nadir) and roll is positive clockwise (DJI conventions).
+
+    Args:
+        yaw (array-like): Yaw angles (degrees).
+        pitch (array-like): Pitch angles (degrees).
+        roll (array-like): Roll angles (degrees).
+
+    Returns:
+        rotations (np.ndarray): (n, 3, 3) rotation matrices mapping camera (right, forward, up) to (east, north, up).
+
+    """
+    yaw = np.deg2rad(np.asarray(yaw, dtype=np.float64))
+    pitch = np.deg2rad(np.asarray(pitch, dtype=np.float64))
+    roll = np.deg2rad(np.asarray(roll, dtype=np.float64))
+    n = yaw.shape[0]
+    zeros, ones = np.zeros(n), np.ones(n)
+
+    def stack(rows):
+        return np.stack([np.stack(row, axis=-1) for row in rows], axis=-2)
+
+    cy, sy = np.cos(-yaw), np.sin(-yaw)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cr, sr = np.cos(roll), np.sin(roll)
+    rz = stack([[cy, -sy, zeros], [sy, cy, zeros], [zeros, zeros, ones]])
+    rx = stack([[ones, zeros, zeros], [zeros, cp, -sp], [zeros, sp, cp]])
+    ry = stack([[cr, zeros, sr], [zeros, ones, zeros], [-sr, zeros, cr]])
+    return rz @ rx @ ry
+
+
+def ground_offsets(height, yaw, pitch, roll, hfov, vfov, max_distance=None):
+    """
+    Intersects the four corner rays of each image with flat ground, height metres below the camera.
+
+    Args:
+        height (array-like): Camera heights above the ground (m).
+        yaw (array-like): Gimbal yaw (degrees, clockwise from north).
+        pitch (array-like): Gimbal pitch (degrees, -90 is nadir).
+        roll (array-like): Gimbal roll (degrees).
+        hfov (array-like): Horizontal fields of view (radians).
+        vfov (array-like): Vertical fields of view (radians).
+        max_distance (float): Optional maximum ground distance of a corner from the camera (m).
+
+    Returns:
+        offsets (np.ndarray): (n, 4, 2) east/north offsets (m) of the corners. NaN where a corner ray does not reach the
+            ground (at or above the horizon, or beyond max_distance).
+
+    """
+    height = np.asarray(height, dtype=np.float64)
+    tan_h = np.tan(np.asarray(hfov, dtype=np.float64) / 2)
+    tan_v = np.tan(np.asarray(vfov, dtype=np.float64) / 2)
+    # Corner rays in camera (right, forward, up) coordinates: (n, 4, 3)
+    rays = np.stack([CORNERS[:, 0] * tan_h[:, None],
+                     np.ones((len(height), 4)),
+                     CORNERS[:, 1] * tan_v[:, None]], axis=-1)
+    rays = np.einsum('nij,nkj->nki', rotation_matrices(yaw, pitch, roll), rays)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(rays[..., 2] < 0, -height[:, None] / rays[..., 2], np.nan)
+    offsets = rays[..., :2] * t[..., None]
+    if max_distance is not None:
+        offsets[np.hypot(offsets[..., 0], offsets[..., 1]) > max_distance] = np.nan
+    return offsets
+
+
+def footprint_polygons(lon, lat, height, yaw, pitch, roll, hfov, vfov, out_epsg='EPSG:4326', max_distance=None):
+    """
+    Ground footprints of many images at once.
+    Corner offsets are computed in metres and applied on the ellipsoid from each camera position, then reprojected.
+
+    Args:
+        lon (array-like): Camera longitudes (EPSG:4326).
+        lat (array-like): Camera latitudes (EPSG:4326).
+        height (array-like): Camera heights above the ground (m).
+        yaw, pitch, roll (array-like): Gimbal angles (degrees), see rotation_matrices.
+        hfov, vfov (array-like): Fields of view (radians), see field_of_view.
+        out_epsg (str): EPSG of the polygons. Default is 'EPSG:4326'.
+        max_distance (float): Optional maximum ground distance of a corner from the camera (m).
+
+    Returns:
+        polygons (np.ndarray): shapely Polygons, None where the footprint is undefined (missing inputs, or the view
+            reaches the horizon).
+
+    """
+    with get_metrics().timer('footprints.compute'):
+        return _footprint_polygons(lon, lat, height, yaw, pitch, roll, hfov, vfov, out_epsg, max_distance)
+
+
+def _footprint_polygons(lon, lat, height, yaw, pitch, roll, hfov, vfov, out_epsg, max_distance):
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    offsets = ground_offsets(height, yaw, pitch, roll, hfov, vfov, max_distance)
+    polygons = np.full(len(lon), None, dtype=object)
+    valid = np.isfinite(offsets).all(axis=(1, 2)) & np.isfinite(lon) & np.isfinite(lat)
+    if not valid.any():
+        return polygons
+
+    offsets = offsets[valid]
+    azimuth = np.degrees(np.arctan2(offsets[..., 0], offsets[..., 1])).ravel()
+    distance = np.hypot(offsets[..., 0], offsets[..., 1]).ravel()
+    corner_lon, corner_lat, _ = _GEOD.fwd(np.repeat(lon[valid], 4), np.repeat(lat[valid], 4), azimuth, distance)
+    x, y = reproject_lon_lat(corner_lon, corner_lat, out_epsg)
+    polygons[valid] = shapely.polygons(np.stack([x, y], axis=-1).reshape(-1, 4, 2))
+    return polygons
+
+
+def survey_footprints(table, out_epsg, ground_elevation=None, max_distance=None):
+    """
+    Footprints of every image of a survey table.
+    By default the ground is flat at the take-off point ('Flight Height (m)' is the height above it). With
+    ground_elevation, the ground is flat at that elevation and the camera height is 'Altitude (m)' minus it.
+    Missing gimbal yaw falls back to the flight yaw and missing roll to 0.
+
+    Args:
+        table (pd.DataFrame): Survey table from survey_table.build_survey_table.
+        out_epsg (str): EPSG of the polygons.
+        ground_elevation (float): Optional constant ground elevation (m, same datum as 'Altitude (m)').
+        max_distance (float): Optional maximum ground distance of a corner from the camera (m).
+
+    Returns:
+        polygons (np.ndarray): shapely Polygons, None where the footprint is undefined.
+
+    """
+    missing = [name for name in ('Gimbal Yaw (deg)', 'Gimbal Pitch (deg)', 'Gimbal Roll (deg)', 'Flight Yaw (deg)')
+               if name not in table.columns]
+    if missing:
+        raise ValueError(f'Footprints need the {missing} columns; include them in xmp_fields.')
+    if ground_elevation is None:
+        height = table['Flight Height (m)'].to_numpy(dtype=np.float64)
+    else:
+        height = table['Altitude (m)'].to_numpy(dtype=np.float64) - ground_elevation
+    yaw = table['Gimbal Yaw (deg)'].fillna(table['Flight Yaw (deg)'])
+    hfov, vfov = field_of_view(table['35mm Focal Length'].to_numpy(dtype=np.float64, na_value=np.nan),
+                               table['Image Width (px)'].to_numpy(dtype=np.float64, na_value=np.nan),
+                               table['Image Height (px)'].to_numpy(dtype=np.float64, na_value=np.nan),
+                               table['Digital Zoom Ratio'].to_numpy(dtype=np.float64))
+    return footprint_polygons(table['Longitude'], table['Latitude'], height,
+                              yaw.to_numpy(dtype=np.float64),
+                              table['Gimbal Pitch (deg)'].to_numpy(dtype=np.float64),
+                              table['Gimbal Roll (deg)'].fillna(0.0).to_numpy(dtype=np.float64),
+                              hfov, vfov, out_epsg, max_distance)
+
+
+def frame_footprints(table, focal_length_35mm, width, height, out_epsg, ground_elevation=None, max_distance=None):
+    """
+    Footprints of the frames of a video, from a frame table (see video.frame_table.build_frame_table).
+    The ground is flat at the take-off point ('Relative Altitude'), or at ground_elevation ('Absolute Altitude' minus it).
+
+    Args:
+        table (pd.DataFrame): Frame table.
+        focal_length_35mm (float): 35mm equivalent focal length of the video camera (mm).
+        width (int): Frame width (px).
+        height (int): Frame height (px).
+        out_epsg (str): EPSG of the polygons.
+        ground_elevation (float): Optional constant ground elevation (m, same datum as 'Absolute Altitude').
+        max_distance (float): Optional maximum ground distance of a corner from the camera (m).
+
+    Returns:
+        polygons (np.ndarray): shapely Polygons, None where the footprint is undefined.
+
+    """
+    n = len(table)
+    if ground_elevation is None:
+        camera_height = table['Relative Altitude'].to_numpy(dtype=np.float64)
+    else:
+        camera_height = table['Absolute Altitude'].to_numpy(dtype=np.float64) - ground_elevation
+    roll = table['Gimbal Roll'] if 'Gimbal Roll' in table else np.zeros(n)
+    hfov, vfov = field_of_view(np.full(n, focal_length_35mm), np.full(n, width), np.full(n, height),
+                               table['Digital Zoom'].to_numpy(dtype=np.float64))
+    return footprint_polygons(table['GPS Longitude'], table['GPS Latitude'], camera_height,
+                              table['Gimbal Yaw'].to_numpy(dtype=np.float64),
+                              table['Gimbal Pitch'].to_numpy(dtype=np.float64),
+                              np.nan_to_num(np.asarray(roll, dtype=np.float64)),
+                              hfov, vfov, out_epsg, max_distance)
+
+
+def polygon_chunks(tables, footprints, **kwargs):
+    """
+    Turns a stream of tables into (properties, footprint polygons) chunks for writers.write_features,
+    leaving out the rows without a footprint.
+
+    Args:
+        tables (iterable of pd.DataFrame): Survey or frame tables.
+        footprints (callable): Function of (table, **kwargs) returning the polygons, e.g., survey_footprints.
+        **kwargs: Passed to footprints.
+
+    Yields:
+        properties (pd.DataFrame): The table columns, without projected 'x' and 'y'.
+        geometry (np.ndarray): shapely Polygons.
+
+    """
+    for table in tables:
+        polygons = footprints(table, **kwargs)
+        valid = ~shapely.is_missing(polygons)
+        properties = table[valid].drop(columns=[c for c in ('x', 'y') if c in table.columns])
+        yield properties, polygons[valid]
@@ -4,5 +4,23 @@ Created on Tue May 20 14:40:54 2025
 
 @author: Labadmin
 """
+from .._lazy import lazy_exports
 
-from .get_metadata import *
+# Submodule -> public names it provides. Submodules are imported on first access (PEP 562), so importing the
+# package does not pull in PIL, pandas, pyproj or shapely until they are used.
+_EXPORTS = {
+    'get_metadata': ('EXIFXMPReader', 'SurveyImagesToSpatial'),
+    'jpeg_segments': ('EXIF_HEADER', 'XMP_HEADER', 'SEGMENTS', 'JPEGHeader', 'read_jpeg_header'),
+    'image_metadata': ('XMP_NAMESPACES', 'FIELD_GROUPS', 'FIELD_GROUP_SEGMENTS', 'ImageMetadata', 'parse_xmp',
+                       'parse_dji_xmp', 'resolve_field_groups', 'read_image_metadata'),
+    'xmp_schema': ('XMP_SCHEMA', 'DEFAULT_XMP_FIELDS', 'resolve_xmp_fields', 'type_xmp_column'),
+    'ingest': ('EXECUTORS', 'iter_image_metadata'),
+    'metadata_cache': ('CACHE_VERSION', 'file_signature', 'cache_key', 'MetadataCache'),
+    'survey_table': ('SURVEY_COLUMNS', 'EXIF_DATETIME_FORMAT', 'build_survey_table', 'set_projection'),
+    'discovery': ('EXTENSION_SETS', 'JPEG_EXTENSIONS', 'iter_survey_images', 'require_jpeg_extensions'),
+    'archive': ('ARCHIVE_SEPARATOR', 'ARCHIVE_EXTENSIONS', 'is_archive', 'split_member_path', 'list_members',
+                'open_member', 'member_signature', 'close_archive', 'close_archives'),
+    'survey_index': ('INDEX_VERSION', 'SurveyIndex'),
+}
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
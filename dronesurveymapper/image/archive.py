@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 19:12:48 2026
+
+@author: Labadmin
+"""
+import io
+import os
+import calendar
+import tarfile
+import zipfile
+import threading
+
+# Images inside an archive are addressed as '<archive path>::<member name>', e.g., 'survey.zip::DCIM/100MEDIA/DJI_0001.JPG'
+ARCHIVE_SEPARATOR = '::'
+ARCHIVE_EXTENSIONS = ('.zip', '.tar')
+# Compressed tars have no random access: every member read would decompress the archive from its start
+COMPRESSED_TAR_EXTENSIONS = ('.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+# (process id, archive path) -> ((size, mtime_ns), _Archive). Archives are reopened in forked workers so no file offset is shared
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def is_archive(path):
+    """
+    Whether a path is a ZIP or TAR archive that can be used as a survey source.
+
+    Args:
+        path (str): Path to test.
+
+    Returns:
+        is_archive (bool): True for an existing .zip, .tar (or compressed tar) file.
+
+    """
+    return path.lower().endswith(ARCHIVE_EXTENSIONS + COMPRESSED_TAR_EXTENSIONS) and os.path.isfile(path)
+
+
+def member_path(archive_path, member):
+    """
+    Returns:
+        path (str): The '<archive path>::<member name>' path of an archive member.
+
+    """
+    return f'{archive_path}{ARCHIVE_SEPARATOR}{member}'
+
+
+def split_member_path(path):
+    """
+    Splits an archive member path.
+
+    Args:
+        path (str): A file path or a '<archive path>::<member name>' path.
+
+    Returns:
+        archive_path (str): The archive path, or path itself if it is not an archive member.
+        member (str): The member name, None if path is not an archive member.
+
+    """
+    if ARCHIVE_SEPARATOR in path:
+        archive_path, member = path.split(ARCHIVE_SEPARATOR, 1)
+        if archive_path.lower().endswith(ARCHIVE_EXTENSIONS + COMPRESSED_TAR_EXTENSIONS):
+            return archive_path, member
+    return path, None
+
+
+class _MemberFile(io.RawIOBase):
+    def __init__(self, fin, offset, size):
+        """
+        Seekable read-only view of the bytes of one member of an uncompressed tar.
+        """
+        self._fin = fin
+        self._offset = offset
+        self._size = size
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += self._size
+        self._pos = max(pos, 0)
+        return self._pos
+
+    def readinto(self, buffer):
+        n = max(min(len(buffer), self._size - self._pos), 0)
+        if n == 0:
+            return 0
+        self._fin.seek(self._offset + self._pos)
+        n = self._fin.readinto(memoryview(buffer)[:n])
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._fin.close()
+        super().close()
+
+
+class _Archive:
+    def __init__(self, archive_path):
+        """
+        Member index of a ZIP or uncompressed TAR archive, read once from its central directory (ZIP) or member headers
+        (TAR) without reading any member data.
+        """
+        lower = archive_path.lower()
+        if lower.endswith(COMPRESSED_TAR_EXTENSIONS):
+            raise ValueError(f'{archive_path} is a compressed tar, which cannot be read without decompressing it whole. '
+                             'Use a .zip or an uncompressed .tar.')
+        self.archive_path = archive_path
+        self._zip = None
+        self.members = {}  # name -> (size, mtime_ns, tar data offset)
+        if lower.endswith('.zip'):
+            # ZipFile reads members through a shared, locked handle, so one instance serves every thread
+            self._zip = zipfile.ZipFile(archive_path)
+            for info in self._zip.infolist():
+                if not info.is_dir():
+                    # ZIP times are local times with a 2 s resolution; they are only compared to themselves
+                    mtime_ns = calendar.timegm(info.date_time + (0, 0, -1)) * 1_000_000_000
+                    self.members[info.filename] = (info.file_size, mtime_ns, None)
+        else:
+            # Opened in plain 'r:' mode, tarfile seeks from header to header without reading the member data
+            with tarfile.open(archive_path, 'r:') as tar:
+                for info in tar:
+                    if info.isfile() and not info.issparse():
+                        self.members[info.name] = (info.size, int(info.mtime) * 1_000_000_000, info.offset_data)
+
+    def open(self, member):
+        if member not in self.members:
+            raise FileNotFoundError(f'No member {member} in {self.archive_path}')
+        if self._zip is not None:
+            return self._zip.open(member)
+        size, _, offset = self.members[member]
+        return io.BufferedReader(_MemberFile(open(self.archive_path, 'rb'), offset, size))
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+def _get_archive(archive_path):
+    # The archive's size and mtime are part of the key: a rewritten archive is indexed again (its old index would list
+    # the old members, sign them with stale sizes and times and, for a TAR, read from stale offsets)
+    st = os.stat(archive_path)
+    key = (os.getpid(), os.path.abspath(archive_path))
+    signature = (st.st_size, st.st_mtime_ns)
+    cached = _archives.get(key)
+    if cached is None or cached[0] != signature:
+        with _archives_lock:
+            cached = _archives.get(key)
+            if cached is None or cached[0] != signature:
+                if cached is not None:
+                    cached[1].close()
+                cached = _archives[key] = (signature, _Archive(archive_path))
+    return cached[1]
+
+
+def list_members(archive_path):
+    """
+    Lists the files of an archive.
+
+    Args:
+        archive_path (str): Path to a .zip or .tar archive.
+
+    Returns:
+        members (list of str): Member names (with '/' separators), sorted.
+
+    """
+    return sorted(_get_archive(archive_path).members)
+
+
+def open_member(path):
+    """
+    Opens an archive member as a seekable binary file object. Only the bytes that are read are decompressed (ZIP) or
+    read from disk (TAR), so reading a JPEG header never touches the image data.
+
+    Args:
+        path (str): '<archive path>::<member name>' path.
+
+    Returns:
+        fin (file): Binary file object. Close it (or use it as a context manager) when done.
+
+    """
+    archive_path, member = split_member_path(path)
+    if member is None:
+        raise ValueError(f'{path} is not an archive member path (<archive>{ARCHIVE_SEPARATOR}<member>)')
+    return _get_archive(archive_path).open(member)
+
+
+def member_signature(path):
+    """
+    Returns the (size, mtime) signature of an archive member, read from the archive index.
+
+    Args:
+        path (str): '<archive path>::<member name>' path.
+
+    Returns:
+        size (int): Member size in bytes.
+        mtime_ns (int): Member modification time in nanoseconds.
+
+    """
+    archive_path, member = split_member_path(path)
+    members = _get_archive(archive_path).members
+    if member not in members:
+        raise FileNotFoundError(f'No member {member} in {archive_path}')
+    size, mtime_ns, _ = members[member]
+    return size, mtime_ns
+
+
+def close_archive(archive_path):
+    """
+    Closes an archive opened by this process, e.g., after a pass over the survey it holds.
+
+    Args:
+        archive_path (str): Path to the archive.
+
+    """
+    with _archives_lock:
+        cached = _archives.pop((os.getpid(), os.path.abspath(archive_path)), None)
+    if cached is not None:
+        cached[1].close()
+
+
+def close_archives():
+    """
+    Closes every archive opened by this process.
+    """
+    with _archives_lock:
+        for _, archive in _archives.values():
+            archive.close()
+        _archives.clear()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 17:21:35 2026
+
+@author: Labadmin
+"""
+import os
+from fnmatch import fnmatch
+
+from .archive import is_archive, list_members, member_path
+
+# Named extension sets. Only JPEGs carry the header segments the metadata reader parses.
+EXTENSION_SETS = {'jpeg': ('.jpg', '.jpeg'),
+                  'dng': ('.dng',),
+                  'tiff': ('.tif', '.tiff')}
+JPEG_EXTENSIONS = EXTENSION_SETS['jpeg']
+
+
+def _resolve_extensions(extensions):
+    if isinstance(extensions, str):
+        extensions = [extensions]
+    resolved = set()
+    for ext in extensions:
+        ext = ext.lower()
+        if ext in EXTENSION_SETS:
+            resolved.update(EXTENSION_SETS[ext])
+        else:
+            resolved.add(ext if ext.startswith('.') else f'.{ext}')
+    return tuple(resolved)
+
+
+def require_jpeg_extensions(extensions):
+    """
+    Checks that extensions only select JPEGs, the only images whose metadata the reader can parse
+    (see jpeg_segments.read_jpeg_header). Other extension sets are only meant for listing files.
+
+    Args:
+        extensions (iterable of str): File extensions or names of EXTENSION_SETS.
+
+    Returns:
+        extensions (tuple of str): The resolved extensions.
+
+    """
+    resolved = _resolve_extensions(extensions)
+    unsupported = sorted(set(resolved) - set(JPEG_EXTENSIONS))
+    if unsupported:
+        raise ValueError(f'Cannot read metadata from {unsupported} files; only JPEG images ({list(JPEG_EXTENSIONS)}) are supported')
+    return resolved
+
+
+def _matches(rel_path, patterns):
+    return any(fnmatch(rel_path, pattern) for pattern in patterns)
+
+
+def iter_survey_images(root,
+                       recursive=True,
+                       include=None,
+                       exclude=None,
+                       extensions=JPEG_EXTENSIONS,
+                       follow_symlinks=False):
+    """
+    Lazily walks a survey folder and yields image paths as they are found, so processing can start before the walk finishes.
+    Directories are walked depth-first with entries sorted by name, so the order is deterministic.
+    root may also be a ZIP or TAR archive of a survey: its members are listed from the archive index, without extracting
+    anything, and yielded as '<archive>::<member>' paths (see archive.open_member), sorted by name.
+
+    Args:
+        root (str): Folder to search, e.g., an SD card root or a project/date/flight archive, or a .zip/.tar archive.
+        recursive (bool): If True (default), descend into sub-folders (e.g., DCIM/100MEDIA, DCIM/101MEDIA).
+        include (list of str): Glob patterns matched against the path relative to root (with '/' separators).
+            If given, only matching files are yielded.
+        exclude (list of str): Glob patterns matched against relative paths of files and folders. Matching folders are not entered.
+        extensions (iterable of str): File extensions (case-insensitive) or names of EXTENSION_SETS, e.g., ['jpeg', 'dng'].
+            Default is JPG/JPEG.
+        follow_symlinks (bool): If True, descend into symlinked folders (each real folder is visited once).
+            Symlinked files are always yielded.
+
+    Yields:
+        image_path (str): Path to an image.
+
+    """
+    extensions = _resolve_extensions(extensions)
+    include = list(include or [])
+    exclude = list(exclude or [])
+    if is_archive(root):
+        yield from _iter_archive_images(root, recursive, include, exclude, extensions)
+        return
+    visited = set()
+    stack = [(root, '')]
+    while stack:
+        directory, rel_dir = stack.pop()
+        if follow_symlinks:
+            st = os.stat(directory)
+            if (st.st_dev, st.st_ino) in visited:
+                continue  # Symlink loop or a folder reached twice
+            visited.add((st.st_dev, st.st_ino))
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except (PermissionError, FileNotFoundError):
+            if not rel_dir:
+                raise  # A missing or unreadable root is an error, not an empty survey
+            continue  # Sub-folder removed or unreadable since it was listed
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f'{rel_dir}{entry.name}'
+            if exclude and _matches(rel_path, exclude):
+                continue
+            try:
+                is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+            except OSError:
+                continue
+            if is_dir:
+                if recursive:
+                    subdirs.append((entry.path, f'{rel_path}/'))
+            elif entry.name.lower().endswith(extensions):
+                if include and not _matches(rel_path, include):
+                    continue
+                yield entry.path
+        # Reversed so sub-folders are popped in name order
+        stack.extend(reversed(subdirs))
+
+
+def _iter_archive_images(archive_path, recursive, include, exclude, extensions):
+    for member in list_members(archive_path):
+        if not member.lower().endswith(extensions):
+            continue
+        parts = member.split('/')
+        if not recursive and len(parts) > 1:
+            continue
+        # Exclude patterns apply to the member and to each of its folders, as in a folder walk
+        if exclude and any(_matches('/'.join(parts[:i]), exclude) for i in range(1, len(parts) + 1)):
+            continue
+        if include and not _matches(member, include):
+            continue
+        yield member_path(archive_path, member)
@@ -4,223 +4,352 @@ Created on Thu Mar 13 14:18:00 2025
 
 @author: Labadmin
 """
-from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
-from pyproj import Transformer, CRS
-import os
-import geopandas as gpd
-from shapely.geometry import Point
+import warnings
 from tqdm import tqdm
 
+from .image_metadata import read_image_metadata, resolve_field_groups, FIELD_GROUPS, FIELD_GROUP_SEGMENTS
+from .ingest import iter_image_metadata
+from .archive import is_archive, close_archive
+from .metadata_cache import MetadataCache
+from .discovery import iter_survey_images, require_jpeg_extensions, JPEG_EXTENSIONS
+
 
 class EXIFXMPReader:
+    __slots__ = ('image_path', 'out_epsg', '_metadata', '_loaded', '_transformer')
+
     def __init__(self,
                  image_path,
-                 out_epsg='EPSG:4326'):
+                 out_epsg='EPSG:4326',
+                 fields=None):
         """
         XMPReader reads the XMP data of a single drone (DJI JPEG) image and parses some relevant metadata.
         Properties include coordinates and heights.
-        TODO: Some of the parsing can be cleaned up (less hardcoded numbers)
-        TODO: There are many more properties in the XMP data; should add more (e.g., date, yaw/pitch/roll of drone and camera, etc)
+        Fields are read lazily: nothing is read until a property is first accessed, and then only the field group it
+        belongs to (see image_metadata.FIELD_GROUPS) and the groups parsed from the same segment, so e.g. lon_lat also
+        reads date_time but never parses the XMP or the frame size. A later access that needs a group not read yet
+        reads every remaining group at once, so the image is opened at most twice.
 
         Args:
             image_path (str): path to the DJI drone image
             out_epsg (str): The EPSG that is desired. e.g., if EPSG:32611 is desired, out_epsg='EPSG:32611'. Default is EPSG:4326.
+            fields (iterable of str): Optional field groups to read together on first access, e.g., ['gps', 'xmp'],
+                saving a re-open when several groups are needed.
 
         """
         # Set attributes
         self.image_path = image_path
-        self.xmp_string = self._read_xmp_data()
-        self.exif_dict = self._read_exif_data()
-        self.lon_lat = self._get_lon_lat()
-        self.flight_height = self._get_flight_height()
-        self.date_time = self._get_date_time()
-        self.altitude = self._get_altitude()
-        self.image_dims = self._get_image_dims()
-        self.camera_model = self._get_camera_model()
-        self.focal_length_35mm = self._get_35mm_focal_length()
-
-        # Set transform
-        self.transformer = self._set_transform(out_epsg)
+        self.out_epsg = out_epsg
+        self._metadata = None
+        self._loaded = frozenset()
+        self._transformer = None
+        if fields is not None:
+            self._load(resolve_field_groups(fields))
 
-    def _convert_to_degrees(self, value):
+    def _load(self, groups):
         """
-        Converts from DMS coordinates to degrees
-
-        Args:
-            value (tuple): DMS coordinate.
-
-        Returns:
-            float: degree coordinates of value.
-
+        Reads the field groups that have not been read yet.
         """
-        d, m, s = value
-        return d + (m / 60.0) + (s / 3600.0)
+        missing = frozenset(groups) - self._loaded
+        if not missing:
+            return self._metadata
+        if self._metadata is None:
+            segments = {FIELD_GROUP_SEGMENTS[group] for group in missing}
+            missing = frozenset(group for group, segment in FIELD_GROUP_SEGMENTS.items() if segment in segments)
+        else:
+            # Reopening the image costs more than parsing the remaining segments
+            missing = frozenset(FIELD_GROUPS) - self._loaded
+        metadata = read_image_metadata(self.image_path, fields=missing)
+        if self._metadata is None:
+            self._metadata = metadata
+        else:
+            for group in missing:
+                for name in FIELD_GROUPS[group]:
+                    setattr(self._metadata, name, getattr(metadata, name))
+        self._loaded |= missing
+        return self._metadata
+
+    @property
+    def metadata(self):
+        return self._load(FIELD_GROUPS)
+
+    @property
+    def lon_lat(self):
+        return self._load(['gps']).lon_lat
+
+    @property
+    def altitude(self):
+        return self._load(['gps']).altitude
+
+    @property
+    def flight_height(self):
+        return self._load(['xmp']).flight_height
+
+    @property
+    def date_time(self):
+        return self._load(['exif']).date_time
+
+    @property
+    def camera_model(self):
+        return self._load(['exif']).camera_model
+
+    @property
+    def focal_length_35mm(self):
+        return self._load(['exif']).focal_length_35mm
+
+    @property
+    def image_dims(self):
+        return self._load(['dims']).image_dims
+
+    @property
+    def transformer(self):
+        if self._transformer is None:
+            self._transformer = self._set_transform(self.out_epsg)
+        return self._transformer
+
+    def _set_transform(self, out_epsg):
+        from ..projection import get_transformer
+        return get_transformer(out_epsg)
 
-    def _read_xmp_data(self):
+    def reproject_coords(self):
         """
-        Reads the XMP data from a JPEG image
+        Reprojects the coordinates from lat/lon (EPSG:4326) to the given EPSG
 
         Returns:
-            xmp_string (str): The XMP data as a continuous string.
+            x_t (float): Transformed x coordinate.
+            y_t (float): Transformed y coordinate.
 
         """
-        # Open the image
-        with open(self.image_path, "rb") as fin:
-            # Read as a string
-            img = fin.read()
-            img_as_string = str(img)
-            # Parse the XMP
-            xmp_start = img_as_string.find('<x:xmpmeta')
-            xmp_end = img_as_string.find('</x:xmpmeta')
-            if xmp_start != xmp_end:
-                xmp_string = img_as_string[xmp_start:xmp_end + 12]
-        return xmp_string
+        lon, lat = self.lon_lat
+        x_t, y_t = self.transformer.transform(lon, lat)
+        return (x_t, y_t)
+
 
-    def _read_exif_data(self):
+class SurveyImagesToSpatial:
+    def __init__(self,
+                 survey_dir,
+                 out_epsg,
+                 workers=1,
+                 executor='thread',
+                 max_in_flight=None,
+                 cache=None,
+                 rebuild_cache=False,
+                 load=True,
+                 recursive=False,
+                 include=None,
+                 exclude=None,
+                 extensions=JPEG_EXTENSIONS,
+                 follow_symlinks=False,
+                 xmp_fields=None,
+                 fields=None,
+                 progress=True):
         """
-        Reads the EXIF data from a JPEG image
+        Reads a directory of survey images, converts to geospatial format (a GeoJSON of points containing metadata attributes)
+        Images that cannot be read are skipped and recorded in self.failures as (image path, error) tuples.
+        With load=False nothing is read up front and write_spatial streams features straight from ingestion.
 
-        Returns:
-            exif_dict (str): A dict with EXIF tags as keys
+        Args:
+            img_dir (str): Directory to the folder containing drone JPEGs, or a ZIP/TAR archive of it (read in place, see discovery.iter_survey_images).
+            out_epsg (str): The EPSG that is desired. e.g., if EPSG:32611 is desired, out_epsg='EPSG:32611'
+            workers (int): Number of parallel metadata readers. 1 (default) reads sequentially, None uses all cores.
+            executor (str): 'thread' for I/O-bound sources (network shares, SD cards), 'process' for parse-bound local disks.
+            max_in_flight (int): Maximum number of images being read at once. Default is 4 * workers.
+            cache (str or MetadataCache): Optional persistent metadata cache (SQLite path). Unchanged images are not re-read.
+            rebuild_cache (bool): If True, drop every record in the cache before reading.
+            load (bool): If True (default), read all metadata into self.img_metadata now.
+            recursive (bool): If True, also read images in sub-folders (e.g., DCIM/100MEDIA, DCIM/101MEDIA). Default is False.
+            include (list of str): Glob patterns (relative to survey_dir) an image must match to be read.
+            exclude (list of str): Glob patterns (relative to survey_dir) of images and folders to skip.
+            extensions (iterable of str): Image extensions to read. Default is JPG/JPEG. Only JPEG extensions are accepted,
+                as metadata is parsed from the JPEG header (e.g., ['.jpg'] to skip '.jpeg').
+            follow_symlinks (bool): If True, descend into symlinked folders.
+            xmp_fields (str or list of str): XMP fields to add as columns (see xmp_schema.resolve_xmp_fields).
+                Default is the gimbal and flight attitude, 'all' adds every field of XMP_SCHEMA.
+            fields (iterable of str): Field groups to read (see image_metadata.FIELD_GROUPS). Default is all of them.
+                e.g., fields=['gps'] reads only the coordinates, skipping the XMP and the frame size, for quick extents.
+                The columns of unread groups are empty.
+            progress (bool): If True (default), show a progress bar while reading. For per-stage timings, counters and
+                the slowest images, run under metrics.collect_metrics instead.
 
         """
-        with Image.open(self.image_path) as image:
-            exif_data = image._getexif()
-        if not exif_data:
-            raise Exception(f'Could not read EXIF data for {self.image_path}')
-        exif_dict = {TAGS.get(tag, tag): value for tag, value in exif_data.items()}
-        return exif_dict
+        # Checked before anything (e.g., a cache rebuild) is done
+        extensions = require_jpeg_extensions(extensions)
+        self.out_epsg = out_epsg
+        self.workers = workers
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.failures = []
+        # A cache given as a path is opened for each pass over the survey and closed after it
+        self._cache_path = cache if isinstance(cache, str) else None
+        if self._cache_path is not None and rebuild_cache:
+            MetadataCache(self._cache_path, rebuild=True).close()
+        elif cache is not None and rebuild_cache:
+            cache.clear()
+        self.cache = cache if self._cache_path is None else None
+        self.survey_dir = survey_dir
+        self.discovery_options = {'recursive': recursive,
+                                  'include': include,
+                                  'exclude': exclude,
+                                  'extensions': extensions,
+                                  'follow_symlinks': follow_symlinks}
+        self.xmp_fields = xmp_fields
+        self.progress = progress
+        # Coordinates are always needed
+        self.fields = None if fields is None else resolve_field_groups(fields) | {'gps'}
+        self.imgs = []  # Filled as images are discovered
+        self.img_metadata = self._get_image_metadata() if load else None
 
-    def _get_lon_lat(self):
+    def _get_image_metadata(self):
         """
-        Parses the longitude and latitude from the EXIF data. DJI stores this in Degrees/Minutes/Seconds by default, this converts to EPSG:4326.
+        Gets coordinates and metadata for each image in the survey.
 
         Returns:
-            gps_longitude (float): Longitude of the drone at the time of image capture in EPSG:4326.
-            gps_latitude (float): Latitude of the drone at the time of image capture in EPSG:4326.
+            img_data (pd.DataFrame): Typed survey table with coordinates and metadata (see survey_table.build_survey_table).
 
         """
-        gps_info = self.exif_dict.get('GPSInfo')
-        gps_data = {GPSTAGS.get(tag, tag): value for tag, value in gps_info.items()}
+        from .survey_table import build_survey_table
 
-        # Extract latitude and longitude
-        if 'GPSLatitude' in gps_data and 'GPSLongitude' in gps_data:
-            lat = self._convert_to_degrees(gps_data['GPSLatitude'])
-            lon = self._convert_to_degrees(gps_data['GPSLongitude'])
+        img_data = build_survey_table(self._iter_records(), self.out_epsg, self.xmp_fields)
+        if self.failures:
+            warnings.warn(f'Could not read {len(self.failures)} of {len(self.imgs)} images, see SurveyImagesToSpatial.failures')
+        return img_data
 
-            # Adjust for hemisphere
-            if gps_data.get('GPSLatitudeRef') == 'S':
-                lat = -lat
-            if gps_data.get('GPSLongitudeRef') == 'W':
-                lon = -lon
+    def _iter_records(self):
+        """
+        Yields the metadata of each readable image, recording the failures.
 
-            return (lon, lat)
+        Yields:
+            metadata (ImageMetadata): The parsed metadata.
 
-    def _get_flight_height(self):
         """
-        Parses the relative altitude from the XMP data. Returns in METRES
+        self.failures = []
+        if self._cache_path is not None:
+            self.cache = MetadataCache(self._cache_path)
+        pbar = tqdm(desc='Reading image metadata', unit='img', disable=not self.progress)
+        try:
+            for img, metadata, error in iter_image_metadata(self._iter_paths(),
+                                                            workers=self.workers,
+                                                            executor=self.executor,
+                                                            max_in_flight=self.max_in_flight,
+                                                            cache=self.cache,
+                                                            fields=self.fields):
+                pbar.update(1)
+                if error is None and metadata.lon_lat is None:
+                    error = 'No GPS coordinates in EXIF data'
+                if error is not None:
+                    self.failures.append((img, error))
+                    continue
+                yield metadata
+        finally:
+            pbar.close()
+            if self._cache_path is not None:
+                self.cache.close()
+            if is_archive(self.survey_dir):
+                close_archive(self.survey_dir)
+
+    def _iter_paths(self):
+        """
+        Lazily discovers the survey images, recording them in self.imgs as they are found.
 
-        Returns:
-            flight_height (float): Relative altitude (m) of the drone at the time of image capture.
+        Yields:
+            image_path (str): Path to an image.
 
         """
-        flight_height = float(self.xmp_string[self.xmp_string.find('drone-dji:RelativeAltitude="') + len('drone-dji:RelativeAltitude="'):self.xmp_string.find('drone-dji:GimbalRollDegree=') - 7])
-        return flight_height
+        self.imgs = []
+        for image_path in iter_survey_images(self.survey_dir, **self.discovery_options):
+            self.imgs.append(image_path)
+            yield image_path
 
-    def _get_date_time(self):
-        return self.exif_dict.get('DateTimeOriginal')
+    def iter_tables(self, chunk_size=10000):
+        """
+        Yields the survey table in chunks. If the metadata was not loaded, the chunks are built as images are read.
 
-    def _get_altitude(self):
-        return self.exif_dict.get('GPSInfo')[6]
+        Args:
+            chunk_size (int): Maximum number of images per chunk.
 
-    def _get_image_dims(self):
-        with Image.open(self.image_path) as image:
-            sz = image.size  # (width, height)
-        return sz
+        Yields:
+            table (pd.DataFrame): Survey table chunk (see survey_table.build_survey_table).
 
-    def _get_camera_model(self):
-        return self.exif_dict.get('Model')
+        """
+        from .survey_table import build_survey_table
+
+        if self.img_metadata is not None:
+            for start in range(0, max(len(self.img_metadata), 1), chunk_size):
+                yield self.img_metadata.iloc[start:start + chunk_size]
+            return
+
+        records = []
+        n_chunks = 0
+        for metadata in self._iter_records():
+            records.append(metadata)
+            if len(records) >= chunk_size:
+                yield build_survey_table(records, self.out_epsg, self.xmp_fields)
+                n_chunks += 1
+                records = []
+        # An empty table still carries the survey schema, so writers produce an empty layer with the survey columns
+        if records or not n_chunks:
+            yield build_survey_table(records, self.out_epsg, self.xmp_fields)
+        if self.failures:
+            warnings.warn(f'Could not read {len(self.failures)} of {len(self.imgs)} images, see SurveyImagesToSpatial.failures')
+
+    def write_spatial(self, path, driver=None, chunk_size=10000):
+        """
+        Writes a point at each image with the metadata associated with that image, streaming chunk by chunk.
 
-    def _get_35mm_focal_length(self):
-        return self.exif_dict.get('FocalLengthIn35mmFilm')
+        Args:
+            path (str): Output path.
+            driver (str): 'GeoJSON', 'FlatGeobuf', 'GPKG' or 'GeoParquet'. Inferred from the extension (.geojson, .fgb, .gpkg, .parquet) if None.
+            chunk_size (int): Maximum number of images held in memory at once when streaming.
 
-    def _set_transform(self, out_epsg):
-        in_crs = CRS.from_epsg(4326)
-        out_crs = CRS.from_epsg(int(out_epsg.lower().replace('epsg:', '')))
-        transformer = Transformer.from_crs(in_crs, out_crs, always_xy=True)
-        return transformer
+        Returns:
+            n_features (int): Number of features written.
 
-    def reproject_coords(self):
         """
-        Reprojects the coordinates from lat/lon (EPSG:4326) to the given EPSG
+        from ..writers import write_features, point_chunks
+
+        return write_features(path, point_chunks(self.iter_tables(chunk_size)), self.out_epsg, driver=driver)
+
+    def write_footprints(self, path, driver=None, chunk_size=10000, ground_elevation=None, max_distance=None):
+        """
+        Writes the ground footprint polygon of each image with its metadata, streaming chunk by chunk
+        (see footprints.survey_footprints). Images whose footprint is undefined (e.g., no gimbal pitch, or a view that
+        reaches the horizon) are left out.
+
+        Args:
+            path (str): Output path.
+            driver (str): 'GeoJSON', 'FlatGeobuf', 'GPKG' or 'GeoParquet'. Inferred from the extension (.geojson, .fgb, .gpkg, .parquet) if None.
+            chunk_size (int): Maximum number of images held in memory at once when streaming.
+            ground_elevation (float): Optional constant ground elevation (m). Default is flat ground at the take-off point.
+            max_distance (float): Optional maximum ground distance of a footprint corner from the camera (m).
 
         Returns:
-            x_t (float): Transformed x coordinate.
-            y_t (float): Transformed y coordinate.
+            n_features (int): Number of footprints written.
 
         """
-        x_t, y_t = self.transformer.transform(self.lon_lat[0], self.lon_lat[1])
-        return (x_t, y_t)
+        from ..footprints import polygon_chunks, survey_footprints
+        from ..writers import write_features
 
+        chunks = polygon_chunks(self.iter_tables(chunk_size), survey_footprints, out_epsg=self.out_epsg,
+                                ground_elevation=ground_elevation, max_distance=max_distance)
+        return write_features(path, chunks, self.out_epsg, driver=driver, geometry_type='Polygon')
 
-class SurveyImagesToSpatial:
-    def __init__(self,
-                 survey_dir,
-                 out_epsg):
+    def build_index(self, footprints=True, ground_elevation=None, max_distance=None):
         """
-        Reads a directory of survey images, converts to geospatial format (a GeoJSON of points containing metadata attributes)
+        Builds a spatial and temporal query index over the survey (see survey_index.SurveyIndex).
 
         Args:
-            img_dir (str): Directory to the folder containing drone JPEGs.
-            out_epsg (str): The EPSG that is desired. e.g., if EPSG:32611 is desired, out_epsg='EPSG:32611'
+            footprints (bool): If True (default), also index the image footprints.
+            ground_elevation (float): Optional constant ground elevation (m) for the footprints.
+            max_distance (float): Optional maximum ground distance of a footprint corner from the camera (m).
 
-        """
-        self.out_epsg = out_epsg
-        self.imgs = [os.path.join(survey_dir, img) for img in os.listdir(survey_dir) if img.lower().endswith('.jpg')]
-        self.img_metadata = self._get_image_metadata()
+        Returns:
+            index (SurveyIndex): The index, in out_epsg.
 
-    def _get_image_metadata(self):
         """
-        Gets coordinates and metadata for each image in the survey.
+        from .survey_index import SurveyIndex
 
-        Returns:
-            img_data (dict): Dictionary with coordinates and metadata.
-
-        """
-        img_coords = []
-        img_names = []
-        heights = []
-        datetimes = []
-        altitudes = []
-        image_dims = []
-        camera_models = []
-        focal_lengths = []
-        pbar = tqdm(total=len(self.imgs), desc='Reading image metadata')
-        for img in self.imgs:
-            Reader = EXIFXMPReader(img, self.out_epsg)
-            x, y = Reader.reproject_coords()
-            img_coords.append((x, y))
-            _, t = os.path.split(img)
-            img_names.append(t)
-            heights.append(str(Reader.flight_height))  # Must be strings
-            datetimes.append(str(Reader.date_time))
-            altitudes.append(str(Reader.altitude))
-            image_dims.append(str(Reader.image_dims))
-            camera_models.append(str(Reader.camera_model))
-            focal_lengths.append(str(Reader.focal_length_35mm))
-            pbar.update(1)
-
-        pbar.close()
-        img_data = {'Coordinates': img_coords,
-                    'Filename': img_names,
-                    'Date Time': datetimes,
-                    'Altitude (m)': altitudes,
-                    'Flight Height (m)': heights,
-                    'Image Dimensions (w x h)': image_dims,
-                    'Camera Model': camera_models,
-                    '35mm Focal Length': focal_lengths}
-        return img_data
+        if self.img_metadata is None:
+            self.img_metadata = self._get_image_metadata()
+        return SurveyIndex(self.img_metadata, self.out_epsg, footprints, ground_elevation, max_distance)
 
     def img_to_geojson(self, geojson_path):
         """
@@ -230,8 +359,4 @@ class SurveyImagesToSpatial:
             geojson_path (str): Path to save the GeoJSON.
 
         """
-        geometry = [Point(x, y) for x, y in self.img_metadata['Coordinates']]
-        gdf = gpd.GeoDataFrame(geometry=geometry, crs=f'{self.out_epsg}')
-        for key, values in self.img_metadata.items():
-            gdf[key] = values
-        gdf.to_file(geojson_path, driver='GeoJSON')
+        self.write_spatial(geojson_path, driver='GeoJSON')
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:03:27 2026
+
+@author: Labadmin
+"""
+import re
+from dataclasses import dataclass, field
+from PIL import Image
+from PIL.ExifTags import TAGS, GPSTAGS
+
+from .archive import open_member, split_member_path
+from .jpeg_segments import read_jpeg_header
+from ..metrics import get_metrics
+
+_EXIF_IFD = 0x8769
+_GPS_IFD = 0x8825
+# Field groups that can be read independently -> ImageMetadata fields they fill
+FIELD_GROUPS = {'gps': ('lon', 'lat', 'altitude'),
+                'exif': ('date_time', 'camera_make', 'camera_model', 'focal_length_35mm', 'digital_zoom_ratio'),
+                'xmp': ('flight_height', 'dji', 'xmp'),
+                'dims': ('width', 'height')}
+# JPEG segment each field group is parsed from. Groups sharing a segment cost nothing extra to read together
+FIELD_GROUP_SEGMENTS = {'gps': 'exif', 'exif': 'exif', 'xmp': 'xmp', 'dims': 'sof'}
+# XMP namespaces whose properties are extracted
+XMP_NAMESPACES = ('drone-dji', 'tiff', 'exif')
+# Matches both attribute (ns:Name="value") and element (<ns:Name>value</ns:Name>) properties of those namespaces
+_XMP_PROPERTY_RE = re.compile(rb'\b(drone-dji|tiff|exif):(\w+)(?:="([^"]*)"|>([^<]*)</\1:\2>)')
+
+
+@dataclass
+class ImageMetadata:
+    """
+    Metadata of a single drone image, parsed in one pass from the JPEG header.
+
+    Attributes:
+        image_path (str): Path to the image.
+        lon (float): Longitude (EPSG:4326) of the drone at the time of capture.
+        lat (float): Latitude (EPSG:4326) of the drone at the time of capture.
+        altitude (float): GPS altitude (m) above sea level.
+        flight_height (float): Relative altitude (m) of the drone above the take-off point.
+        date_time (str): EXIF DateTimeOriginal, 'YYYY:MM:DD HH:MM:SS'.
+        width (int): Image width (px).
+        height (int): Image height (px).
+        camera_make (str): EXIF Make.
+        camera_model (str): EXIF Model.
+        focal_length_35mm (int): 35mm equivalent focal length (mm).
+        digital_zoom_ratio (float): EXIF DigitalZoomRatio.
+        dji (dict): Every drone-dji:* XMP property, keyed by property name, as strings.
+        xmp (dict): Every tiff:* and exif:* XMP property, keyed by 'namespace:Name', as strings.
+        bytes_read (int): Number of bytes read from the file.
+
+    """
+    image_path: str
+    lon: float = None
+    lat: float = None
+    altitude: float = None
+    flight_height: float = None
+    date_time: str = None
+    width: int = None
+    height: int = None
+    camera_make: str = None
+    camera_model: str = None
+    focal_length_35mm: int = None
+    digital_zoom_ratio: float = None
+    dji: dict = field(default_factory=dict)
+    xmp: dict = field(default_factory=dict)
+    bytes_read: int = 0
+
+    @property
+    def lon_lat(self):
+        if self.lon is None or self.lat is None:
+            return None
+        return (self.lon, self.lat)
+
+    @property
+    def image_dims(self):
+        if self.width is None:
+            return None
+        return (self.width, self.height)
+
+    def xmp_property(self, key):
+        """
+        Looks up an XMP property by its qualified name, e.g., 'drone-dji:GimbalYawDegree' or 'tiff:Model'.
+
+        Args:
+            key (str): 'namespace:Name'.
+
+        Returns:
+            value (str): The raw value, None if absent.
+
+        """
+        namespace, _, name = key.partition(':')
+        if namespace == 'drone-dji':
+            return self.dji.get(name)
+        return self.xmp.get(key)
+
+
+def _convert_to_degrees(value):
+    """
+    Converts from DMS coordinates to degrees
+
+    Args:
+        value (tuple): DMS coordinate.
+
+    Returns:
+        float: degree coordinates of value.
+
+    """
+    d, m, s = value
+    return float(d) + (float(m) / 60.0) + (float(s) / 3600.0)
+
+
+def _to_float(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _to_str(value):
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    return value.strip('\x00 ')
+
+
+def parse_xmp(xmp):
+    """
+    Pulls every drone-dji, tiff and exif property out of an XMP packet in a single regex pass.
+
+    Args:
+        xmp (bytes): The XMP packet.
+
+    Returns:
+        properties (dict): 'namespace:Name' mapped to the string value. The first occurrence of a property wins.
+
+    """
+    properties = {}
+    if not xmp:
+        return properties
+    for namespace, name, attribute, element in _XMP_PROPERTY_RE.findall(xmp):
+        key = f"{namespace.decode('ascii')}:{name.decode('ascii')}"
+        if key not in properties:
+            properties[key] = (attribute or element).decode('utf-8', errors='replace').strip()
+    return properties
+
+
+def _split_xmp(properties):
+    """
+    Splits parsed XMP properties into the drone-dji properties (without namespace) and the others.
+    """
+    dji = {}
+    xmp = {}
+    for key, value in properties.items():
+        if key.startswith('drone-dji:'):
+            dji[key[len('drone-dji:'):]] = value
+        else:
+            xmp[key] = value
+    return dji, xmp
+
+
+def parse_dji_xmp(xmp):
+    """
+    Pulls every drone-dji:* property out of an XMP packet (see parse_xmp).
+
+    Args:
+        xmp (bytes): The XMP packet.
+
+    Returns:
+        dji (dict): drone-dji property names (without namespace) mapped to their string values.
+
+    """
+    return _split_xmp(parse_xmp(xmp))[0]
+
+
+def _parse_exif(exif_bytes, exif_ifd=True, gps_ifd=True):
+    """
+    Parses an APP1 EXIF payload into flat tag dicts.
+
+    Args:
+        exif_bytes (bytes): The APP1 EXIF payload.
+        exif_ifd (bool): If False, the Exif sub-IFD is not parsed.
+        gps_ifd (bool): If False, the GPS IFD is not parsed.
+
+    Returns:
+        exif_dict (dict): IFD0 and Exif sub-IFD tags, keyed by tag name.
+        gps_data (dict): GPS IFD tags, keyed by tag name.
+
+    """
+    exif = Image.Exif()
+    exif.load(exif_bytes)
+    exif_dict = {}
+    if exif_ifd:
+        exif_dict = {TAGS.get(tag, tag): value for tag, value in exif.items()}
+        exif_dict.update({TAGS.get(tag, tag): value for tag, value in exif.get_ifd(_EXIF_IFD).items()})
+    gps_data = {}
+    if gps_ifd:
+        gps_data = {GPSTAGS.get(tag, tag): value for tag, value in exif.get_ifd(_GPS_IFD).items()}
+    return exif_dict, gps_data
+
+
+def resolve_field_groups(fields=None):
+    """
+    Validates a selection of field groups.
+
+    Args:
+        fields (iterable of str): Any of 'gps', 'exif', 'xmp' and 'dims' (see FIELD_GROUPS). Default is all of them.
+
+    Returns:
+        fields (frozenset of str): The groups.
+
+    """
+    if fields is None:
+        return frozenset(FIELD_GROUPS)
+    if isinstance(fields, str):
+        fields = [fields]
+    fields = frozenset(fields)
+    unknown = fields - set(FIELD_GROUPS)
+    if unknown:
+        raise ValueError(f'Unknown field groups {sorted(unknown)}, expected any of {list(FIELD_GROUPS)}')
+    return fields
+
+
+def read_image_metadata(source, image_path=None, fields=None):
+    """
+    Reads the metadata of a drone (DJI JPEG) image with a single open and a single parse of its header.
+    With a subset of field groups only the segments they need are read and parsed, e.g., fields=['gps'] stops after the
+    EXIF segment and never parses the XMP or the frame size. Fields of other groups are left as None.
+
+    Args:
+        source (str or file): Path to the image, '<archive>::<member>' path of an image in a ZIP/TAR archive (only its
+            header bytes are read), or a binary file object positioned at the start of it.
+        image_path (str): Path recorded in the returned metadata. Defaults to source when source is a path.
+        fields (iterable of str): Field groups to read, any of 'gps', 'exif', 'xmp' and 'dims'. Default is all of them.
+
+    Returns:
+        metadata (ImageMetadata): The parsed metadata.
+
+    """
+    if image_path is None:
+        image_path = source if isinstance(source, str) else getattr(source, 'name', None)
+
+    fields = resolve_field_groups(fields)
+    if hasattr(source, 'read'):
+        return _read_image_metadata(source, image_path, fields)
+    if split_member_path(source)[1] is not None:
+        with open_member(source) as fin:
+            return _read_image_metadata(fin, image_path, fields)
+    with open(source, 'rb') as fin:
+        return _read_image_metadata(fin, image_path, fields)
+
+
+def _read_image_metadata(fin, image_path, fields):
+    start = fin.tell()
+    segments = {FIELD_GROUP_SEGMENTS[group] for group in fields}
+    metrics = get_metrics()
+    with metrics.timer('image.header'):
+        header = read_jpeg_header(fin, segments)
+    metrics.count('image.bytes_read', header.bytes_read)
+    if 'exif' in segments and header.exif is None:
+        raise Exception(f'Could not read EXIF data for {image_path}')
+    exif_dict, gps_data = {}, {}
+    if header.exif is not None:
+        with metrics.timer('image.exif'):
+            exif_dict, gps_data = _parse_exif(header.exif, exif_ifd='exif' in fields, gps_ifd='gps' in fields)
+
+    metadata = ImageMetadata(image_path=image_path, bytes_read=header.bytes_read)
+    if 'gps' in fields:
+        _set_gps(metadata, gps_data)
+    if 'exif' in fields:
+        _set_exif(metadata, exif_dict)
+    if 'xmp' in fields:
+        with metrics.timer('image.xmp'):
+            metadata.dji, metadata.xmp = _split_xmp(parse_xmp(header.xmp))
+        metadata.flight_height = _to_float(metadata.dji.get('RelativeAltitude'))
+
+    # Dimensions, from the SOF segment. Fall back to PIL on the same handle if there was none
+    if 'dims' in fields:
+        if header.image_dims is not None:
+            metadata.width, metadata.height = header.image_dims
+        else:
+            fin.seek(start)
+            with Image.open(fin) as image:
+                metadata.width, metadata.height = image.size
+
+    return metadata
+
+
+def _set_gps(metadata, gps_data):
+    # Coordinates. DJI stores these in Degrees/Minutes/Seconds
+    if 'GPSLatitude' in gps_data and 'GPSLongitude' in gps_data:
+        lat = _convert_to_degrees(gps_data['GPSLatitude'])
+        lon = _convert_to_degrees(gps_data['GPSLongitude'])
+        # Adjust for hemisphere
+        if _to_str(gps_data.get('GPSLatitudeRef')) == 'S':
+            lat = -lat
+        if _to_str(gps_data.get('GPSLongitudeRef')) == 'W':
+            lon = -lon
+        metadata.lon = lon
+        metadata.lat = lat
+
+    altitude = _to_float(gps_data.get('GPSAltitude'))
+    if altitude is not None and gps_data.get('GPSAltitudeRef') in (1, b'\x01'):
+        altitude = -altitude  # Below sea level
+    metadata.altitude = altitude
+
+
+def _set_exif(metadata, exif_dict):
+    metadata.date_time = _to_str(exif_dict.get('DateTimeOriginal'))
+    metadata.camera_make = _to_str(exif_dict.get('Make'))
+    metadata.camera_model = _to_str(exif_dict.get('Model'))
+    focal_length_35mm = exif_dict.get('FocalLengthIn35mmFilm')
+    metadata.focal_length_35mm = int(focal_length_35mm) if focal_length_35mm is not None else None
+    metadata.digital_zoom_ratio = _to_float(exif_dict.get('DigitalZoomRatio'))
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 11:26:52 2026
+
+@author: Labadmin
+"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .image_metadata import read_image_metadata, resolve_field_groups
+from .metadata_cache import cache_key, file_signature
+from ..metrics import Metrics, get_metrics, set_metrics
+
+EXECUTORS = {'thread': ThreadPoolExecutor,
+             'process': ProcessPoolExecutor}
+
+
+def _read_one(image_path, fields=None):
+    """
+    Reads the metadata of one image, returning the error instead of raising it so one bad file does not abort a survey.
+
+    Args:
+        image_path (str): Path to the image.
+        fields (frozenset of str): Field groups to read (see image_metadata.FIELD_GROUPS). Default is all of them.
+
+    Returns:
+        metadata (ImageMetadata): The parsed metadata, None on failure.
+        error (str): Description of the failure, None on success.
+
+    """
+    metrics = get_metrics()
+    metrics.count('image.files')
+    try:
+        with metrics.timer('image.read', image_path):
+            return read_image_metadata(image_path, fields=fields), None
+    except Exception as e:
+        metrics.count('image.failures')
+        return None, f'{type(e).__name__}: {e}'
+
+
+def _read_one_measured(image_path, fields=None):
+    """
+    _read_one for worker processes while metrics are collected: the metrics of the read are returned to the parent.
+
+    Returns:
+        result (tuple): The return value of _read_one.
+        stages (dict): Stage name -> StageStats of the read.
+        counters (dict): Counter name -> value of the read.
+
+    """
+    metrics = Metrics()
+    previous = set_metrics(metrics)
+    try:
+        return _read_one(image_path, fields), metrics.stages, metrics.counters
+    finally:
+        set_metrics(previous)
+
+
+def iter_image_metadata(image_paths, workers=1, executor='thread', max_in_flight=None, cache=None, fields=None):
+    """
+    Reads the metadata of many images, optionally in parallel. Results are yielded in the order of image_paths.
+
+    Args:
+        image_paths (iterable of str): Paths to the images. May be a lazy iterator.
+        workers (int): Number of parallel workers. 1 reads sequentially in the calling thread, None uses os.cpu_count().
+        executor (str): 'thread' for I/O-bound sources (network shares, SD cards), 'process' for parse-bound local disks.
+        max_in_flight (int): Maximum number of images submitted but not yet yielded. Default is 4 * workers.
+        cache (MetadataCache): Optional persistent cache. Unchanged images are served from it and new reads are stored in it.
+        fields (iterable of str): Field groups to read (see image_metadata.FIELD_GROUPS). Default is all of them.
+            Partial reads are served from the cache but never stored in it.
+
+    Yields:
+        image_path (str): Path to the image.
+        metadata (ImageMetadata): The parsed metadata, None on failure.
+        error (str): Description of the failure, None on success.
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and executor not in EXECUTORS:
+        raise ValueError(f'Unknown executor {executor}, expected one of {list(EXECUTORS)}')
+    if max_in_flight is None:
+        max_in_flight = 4 * workers
+    fields = resolve_field_groups(fields)
+    # Only complete records are cached
+    store = cache is not None and fields == resolve_field_groups()
+    metrics = get_metrics()
+    # Worker processes do not share the parent's metrics, so their reads report back with the result
+    measured = metrics.enabled and workers > 1 and executor == 'process'
+    read_one = _read_one_measured if measured else _read_one
+
+    def lookup(image_path):
+        # Returns (cache key, signature, cached metadata)
+        if cache is None:
+            return None, None, None
+        try:
+            signature = file_signature(image_path)
+        except OSError:
+            return None, None, None
+        key = cache_key(image_path)
+        cached = cache.get(key, *signature)
+        if cached is not None:
+            metrics.count('image.cache_hits')
+        return key, signature, cached
+
+    def finish(image_path, key, signature, result):
+        metadata, error = result
+        if store and key is not None and error is None:
+            cache.put(key, *signature, metadata)
+        return (image_path, metadata, error)
+
+    def drain(image_path, key, signature, cached, future):
+        if future is None:
+            return (image_path, cached, None)
+        if measured:
+            result, stages, counters = future.result()
+            metrics.merge(stages, counters)
+            return finish(image_path, key, signature, result)
+        return finish(image_path, key, signature, future.result())
+
+    try:
+        if workers <= 1:
+            for image_path in image_paths:
+                key, signature, cached = lookup(image_path)
+                if cached is not None:
+                    yield (image_path, cached, None)
+                else:
+                    yield finish(image_path, key, signature, _read_one(image_path, fields))
+            return
+
+        pending = deque()
+        with EXECUTORS[executor](max_workers=workers) as pool:
+            for image_path in image_paths:
+                key, signature, cached = lookup(image_path)
+                future = None if cached is not None else pool.submit(read_one, image_path, fields)
+                pending.append((image_path, key, signature, cached, future))
+                # Bound the work in flight, draining in submission order
+                if len(pending) >= max_in_flight:
+                    yield drain(*pending.popleft())
+            while pending:
+                yield drain(*pending.popleft())
+    finally:
+        if cache is not None:
+            cache.commit()
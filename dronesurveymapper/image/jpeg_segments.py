@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 09:12:41 2026
+
+@author: Labadmin
+"""
+import struct
+
+# JPEG markers that are not followed by a length field
+_STANDALONE_MARKERS = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8}
+# Start-of-frame markers (SOF0-SOF15, excluding DHT, JPG and DAC)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_APP1 = 0xE1
+_SOS = 0xDA
+_EOI = 0xD9
+
+EXIF_HEADER = b'Exif\x00\x00'
+XMP_HEADER = b'http://ns.adobe.com/xap/1.0/\x00'
+# Segments read_jpeg_header can collect
+SEGMENTS = frozenset(('exif', 'xmp', 'sof'))
+
+
+class JPEGHeader:
+    def __init__(self):
+        """
+        Container for the metadata segments found in the header of a JPEG image.
+
+        Attributes:
+            exif (bytes): The APP1 EXIF payload, including the 'Exif\\x00\\x00' header. None if not present.
+            xmp (bytes): The XMP packet from the APP1 XMP segment. None if not present.
+            width (int): Image width (px) from the SOF segment. None if not present.
+            height (int): Image height (px) from the SOF segment. None if not present.
+            bytes_read (int): Number of bytes consumed from the file before the walk stopped.
+
+        """
+        self.exif = None
+        self.xmp = None
+        self.width = None
+        self.height = None
+        self.bytes_read = 0
+
+    @property
+    def image_dims(self):
+        if self.width is None:
+            return None
+        return (self.width, self.height)
+
+
+def _read_exact(fin, n):
+    data = fin.read(n)
+    if len(data) != n:
+        raise ValueError('Unexpected end of file while reading JPEG header')
+    return data
+
+
+def read_jpeg_header(source, segments=None):
+    """
+    Walks the marker segments of a JPEG and collects the EXIF, XMP and SOF segments.
+    The walk stops at the start of scan (SOS), so the compressed image data is never read,
+    or as soon as every requested segment has been found.
+    Segments that are not needed are skipped with a seek rather than read.
+
+    Args:
+        source (str or file): Path to a JPEG image, or a binary file object positioned at the start of one.
+        segments (iterable of str): Segments to collect, any of 'exif', 'xmp' and 'sof'. Default is all of them.
+
+    Returns:
+        header (JPEGHeader): The metadata segments of the image.
+
+    """
+    segments = SEGMENTS if segments is None else frozenset(segments)
+    unknown = segments - SEGMENTS
+    if unknown:
+        raise ValueError(f'Unknown JPEG segments {sorted(unknown)}, expected any of {sorted(SEGMENTS)}')
+    if hasattr(source, 'read'):
+        return _walk_segments(source, segments)
+    with open(source, 'rb') as fin:
+        return _walk_segments(fin, segments)
+
+
+def _walk_segments(fin, segments):
+    header = JPEGHeader()
+    start = fin.tell()
+    if _read_exact(fin, 2) != b'\xff\xd8':
+        raise ValueError('Not a JPEG image (missing SOI marker)')
+
+    while True:
+        # Markers may be preceded by any number of 0xFF fill bytes
+        byte = _read_exact(fin, 1)
+        if byte != b'\xff':
+            raise ValueError(f'Invalid JPEG marker at offset {fin.tell() - 1}')
+        while byte == b'\xff':
+            byte = _read_exact(fin, 1)
+        marker = byte[0]
+
+        if marker in _STANDALONE_MARKERS:
+            continue
+        if marker in (_SOS, _EOI):
+            break
+
+        length = struct.unpack('>H', _read_exact(fin, 2))[0] - 2
+        if length < 0:
+            raise ValueError(f'Invalid JPEG segment length at offset {fin.tell() - 2}')
+
+        if marker == _APP1 and (('exif' in segments and header.exif is None) or
+                                ('xmp' in segments and header.xmp is None)):
+            payload = _read_exact(fin, length)
+            if 'exif' in segments and header.exif is None and payload.startswith(EXIF_HEADER):
+                header.exif = payload
+            elif 'xmp' in segments and header.xmp is None and payload.startswith(XMP_HEADER):
+                header.xmp = payload[len(XMP_HEADER):]
+        elif marker in _SOF_MARKERS and 'sof' in segments:
+            payload = _read_exact(fin, length)
+            header.height, header.width = struct.unpack('>HH', payload[1:5])
+        else:
+            fin.seek(length, 1)
+
+        if (('exif' not in segments or header.exif is not None) and
+                ('xmp' not in segments or header.xmp is not None) and
+                ('sof' not in segments or header.width is not None)):
+            break
+
+    header.bytes_read = fin.tell() - start
+    return header
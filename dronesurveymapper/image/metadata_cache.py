@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 13:35:19 2026
+
+@author: Labadmin
+"""
+import os
+import json
+import time
+import sqlite3
+from dataclasses import asdict, fields
+
+from .archive import member_path, member_signature, split_member_path
+from .image_metadata import ImageMetadata
+
+# Bump when ImageMetadata changes so stale caches are rebuilt rather than misread
+CACHE_VERSION = 2
+
+
+def file_signature(path):
+    """
+    Returns the (size, mtime) signature used to decide whether a cached entry is still valid.
+    Archive members ('<archive>::<member>') are signed with the member's size and time from the archive index.
+
+    Args:
+        path (str): Path to the file or archive member.
+
+    Returns:
+        size (int): File size in bytes.
+        mtime_ns (int): Modification time in nanoseconds.
+
+    """
+    if split_member_path(path)[1] is not None:
+        return member_signature(path)
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def cache_key(path):
+    """
+    Returns the key of an image in the cache: its absolute path, or for an archive member the absolute archive path
+    and the member name ('<archive>::<member>').
+
+    Args:
+        path (str): Path to the file or archive member.
+
+    Returns:
+        key (str): The cache key.
+
+    """
+    archive_path, member = split_member_path(path)
+    if member is None:
+        return os.path.abspath(path)
+    return member_path(os.path.abspath(archive_path), member)
+
+
+class MetadataCache:
+    def __init__(self,
+                 cache_path,
+                 max_entries=None,
+                 rebuild=False):
+        """
+        Persistent SQLite index of parsed image metadata, keyed by path, size and modification time.
+        A cached record is only served while the file's size and mtime are unchanged.
+        Records are stored in EPSG:4326, so changing the output EPSG never forces a re-read.
+
+        Args:
+            cache_path (str): Path to the SQLite database. Created if it does not exist.
+            max_entries (int): Maximum number of records kept; the least recently used are evicted. None is unbounded.
+            rebuild (bool): If True, drop every cached record and start empty.
+
+        """
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._touched = []
+        self._pending_writes = 0
+
+        self.conn = sqlite3.connect(cache_path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS records ('
+                          'path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, '
+                          'accessed REAL, record TEXT)')
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if rebuild or row is None or int(row[0]) != CACHE_VERSION:
+            self.clear()
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def get(self, path, size, mtime_ns):
+        """
+        Returns the cached metadata for a file, or None if it is missing or stale.
+
+        Args:
+            path (str): Cache key of the file (usually its absolute path).
+            size (int): Current file size in bytes.
+            mtime_ns (int): Current modification time in nanoseconds.
+
+        Returns:
+            metadata (ImageMetadata): The cached metadata, None on a miss.
+
+        """
+        row = self.conn.execute('SELECT size, mtime_ns, record FROM records WHERE path = ?', (path,)).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched.append(path)
+        return _record_from_json(row[2])
+
+    def put(self, path, size, mtime_ns, metadata):
+        """
+        Stores the metadata for a file, replacing any previous record.
+
+        Args:
+            path (str): Cache key of the file (usually its absolute path).
+            size (int): File size in bytes.
+            mtime_ns (int): Modification time in nanoseconds.
+            metadata (ImageMetadata): The parsed metadata.
+
+        """
+        self.conn.execute('INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)',
+                          (path, size, mtime_ns, time.time(), json.dumps(asdict(metadata))))
+        self._pending_writes += 1
+        if self._pending_writes >= 500:
+            self.commit()
+
+    def invalidate(self, path):
+        """
+        Removes the record for a file.
+
+        Args:
+            path (str): Cache key of the file.
+
+        """
+        self.conn.execute('DELETE FROM records WHERE path = ?', (path,))
+        self.conn.commit()
+
+    def clear(self):
+        """
+        Removes every record.
+        """
+        self.conn.execute('DELETE FROM records')
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(CACHE_VERSION),))
+        self.conn.commit()
+
+    def commit(self):
+        """
+        Flushes pending writes and access times, then evicts the least recently used records beyond max_entries.
+        """
+        if self._touched:
+            now = time.time()
+            self.conn.executemany('UPDATE records SET accessed = ? WHERE path = ?',
+                                  [(now, path) for path in self._touched])
+            self._touched = []
+        if self.max_entries is not None:
+            self.conn.execute('DELETE FROM records WHERE path IN ('
+                              'SELECT path FROM records ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                              (self.max_entries,))
+        self.conn.commit()
+        self._pending_writes = 0
+
+    def close(self):
+        """
+        Commits and closes the database.
+        """
+        if self.conn is not None:
+            self.commit()
+            self.conn.close()
+            self.conn = None
+
+
+def _record_from_json(text):
+    values = json.loads(text)
+    known = {f.name for f in fields(ImageMetadata)}
+    return ImageMetadata(**{k: v for k, v in values.items() if k in known})
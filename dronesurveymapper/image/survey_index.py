@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:26:40 2026
+
+@author: Labadmin
+"""
+import json
+import numpy as np
+import pandas as pd
+import shapely
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..footprints import survey_footprints
+from ..projection import normalize_epsg
+from .survey_table import set_projection
+
+INDEX_VERSION = 1
+
+
+class SurveyIndex:
+    def __init__(self, table, out_epsg=None, footprints=True, ground_elevation=None, max_distance=None):
+        """
+        In-memory spatial and temporal index over a survey table: STRtrees over the image points and footprints and a
+        sorted time index. Queries return the matching rows of the table, in table order.
+        Coordinates passed to and returned by queries are in the index CRS (out_epsg).
+
+        Args:
+            table (pd.DataFrame): Survey table from survey_table.build_survey_table (e.g., SurveyImagesToSpatial.img_metadata).
+            out_epsg (str): CRS of the index. Default is the CRS of the table's 'x'/'y' columns.
+            footprints (bool or array-like): True (default) computes the image footprints (see footprints.survey_footprints),
+                False skips them, or an array of shapely Polygons (None where undefined) gives them directly.
+            ground_elevation (float): Passed to survey_footprints.
+            max_distance (float): Passed to survey_footprints.
+
+        """
+        if out_epsg is None:
+            out_epsg = table.attrs.get('crs')
+            if out_epsg is None or 'x' not in table.columns:
+                raise ValueError('The table has no projected coordinates; pass out_epsg.')
+        self.crs = normalize_epsg(out_epsg)
+        table = table.reset_index(drop=True)
+        if table.attrs.get('crs') is None or normalize_epsg(table.attrs['crs']) != self.crs or 'x' not in table.columns:
+            table = table.copy()
+            set_projection(table, self.crs)
+        self.table = table
+
+        self.points = shapely.points(table['x'].to_numpy(dtype=np.float64), table['y'].to_numpy(dtype=np.float64))
+        self.point_tree = shapely.STRtree(self.points)
+
+        if footprints is True:
+            footprints = survey_footprints(table, self.crs, ground_elevation, max_distance)
+        if footprints is False or footprints is None:
+            self.footprints = None
+            self.footprint_tree = None
+        else:
+            self.footprints = np.asarray(footprints, dtype=object)
+            if len(self.footprints) != len(table):
+                raise ValueError(f'Got {len(self.footprints)} footprints for {len(table)} images')
+            # Rows without a footprint are never returned by footprint queries
+            self._footprint_rows = np.flatnonzero(~shapely.is_missing(self.footprints))
+            self.footprint_tree = shapely.STRtree(self.footprints[self._footprint_rows])
+
+        times = table['Date Time'].to_numpy(dtype='datetime64[ns]')
+        valid = ~np.isnat(times)
+        order = np.argsort(times[valid], kind='stable')
+        self._time_rows = np.flatnonzero(valid)[order]
+        self._times = times[valid][order]
+
+    def __len__(self):
+        return len(self.table)
+
+    def _rows(self, rows):
+        return self.table.iloc[np.sort(rows)]
+
+    def _require_footprints(self):
+        if self.footprint_tree is None:
+            raise ValueError('The index was built without footprints.')
+
+    def within(self, geometry):
+        """
+        Images taken within a polygon (or any shapely geometry).
+
+        Args:
+            geometry (shapely.Geometry): Area of interest, in the index CRS.
+
+        Returns:
+            images (pd.DataFrame): Matching rows of the table.
+
+        """
+        return self._rows(self.point_tree.query(geometry, predicate='intersects'))
+
+    def within_bbox(self, xmin, ymin, xmax, ymax):
+        """
+        Images taken within a bounding box.
+
+        Args:
+            xmin, ymin, xmax, ymax (float): Bounds, in the index CRS.
+
+        Returns:
+            images (pd.DataFrame): Matching rows of the table.
+
+        """
+        return self.within(shapely.box(xmin, ymin, xmax, ymax))
+
+    def footprints_intersecting(self, geometry):
+        """
+        Images whose footprint overlaps a geometry, e.g., the outline of a plot.
+
+        Args:
+            geometry (shapely.Geometry): Area of interest, in the index CRS.
+
+        Returns:
+            images (pd.DataFrame): Matching rows of the table.
+
+        """
+        self._require_footprints()
+        return self._rows(self._footprint_rows[self.footprint_tree.query(geometry, predicate='intersects')])
+
+    def covering(self, x, y):
+        """
+        Images whose footprint covers a ground point.
+
+        Args:
+            x (float): x coordinate, in the index CRS.
+            y (float): y coordinate, in the index CRS.
+
+        Returns:
+            images (pd.DataFrame): Matching rows of the table.
+
+        """
+        self._require_footprints()
+        point = shapely.Point(x, y)
+        return self._rows(self._footprint_rows[self.footprint_tree.query(point, predicate='covered_by')])
+
+    def between(self, start=None, end=None, camera_model=None):
+        """
+        Images taken in a time window, optionally from one camera model.
+
+        Args:
+            start (str or datetime): Start of the window (inclusive). Default is unbounded.
+            end (str or datetime): End of the window (inclusive). Default is unbounded.
+            camera_model (str or list of str): Optional camera model(s) to keep.
+
+        Returns:
+            images (pd.DataFrame): Matching rows of the table.
+
+        """
+        return self._rows(self._query_rows(start=start, end=end, camera_model=camera_model))
+
+    def query(self, geometry=None, start=None, end=None, camera_model=None, footprints=False):
+        """
+        Combined query: every given condition must hold.
+
+        Args:
+            geometry (shapely.Geometry): Optional area of interest, in the index CRS.
+            start (str or datetime): Optional start of the time window (inclusive).
+            end (str or datetime): Optional end of the time window (inclusive).
+            camera_model (str or list of str): Optional camera model(s) to keep.
+            footprints (bool): If True, match geometry against the footprints instead of the image points.
+
+        Returns:
+            images (pd.DataFrame): Matching rows of the table.
+
+        """
+        return self._rows(self._query_rows(geometry, start, end, camera_model, footprints))
+
+    def _query_rows(self, geometry=None, start=None, end=None, camera_model=None, footprints=False):
+        rows = np.arange(len(self.table))
+        if geometry is not None:
+            if footprints:
+                self._require_footprints()
+                rows = self._footprint_rows[self.footprint_tree.query(geometry, predicate='intersects')]
+            else:
+                rows = self.point_tree.query(geometry, predicate='intersects')
+        if start is not None or end is not None:
+            lo = 0 if start is None else np.searchsorted(self._times, np.datetime64(pd.Timestamp(start), 'ns'), 'left')
+            hi = len(self._times) if end is None else np.searchsorted(self._times, np.datetime64(pd.Timestamp(end), 'ns'), 'right')
+            rows = np.intersect1d(rows, self._time_rows[lo:hi])
+        if camera_model is not None:
+            models = [camera_model] if isinstance(camera_model, str) else list(camera_model)
+            rows = rows[self.table['Camera Model'].iloc[rows].isin(models).to_numpy()]
+        return rows
+
+    def save(self, path):
+        """
+        Persists the index (table and footprints) to a Parquet file. The trees are rebuilt on load.
+
+        Args:
+            path (str): Output path.
+
+        """
+        table = self.table.copy()
+        if self.footprints is not None:
+            table['footprint'] = shapely.to_wkb(self.footprints)
+        arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+        index_meta = {'version': INDEX_VERSION, 'crs': self.crs, 'footprints': self.footprints is not None}
+        metadata = {**(arrow_table.schema.metadata or {}), b'survey_index': json.dumps(index_meta).encode()}
+        pq.write_table(arrow_table.replace_schema_metadata(metadata), path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index saved with save.
+
+        Args:
+            path (str): Path to the Parquet file.
+
+        Returns:
+            index (SurveyIndex): The index.
+
+        """
+        arrow_table = pq.read_table(path)
+        metadata = (arrow_table.schema.metadata or {}).get(b'survey_index')
+        if metadata is None:
+            raise ValueError(f'{path} is not a saved SurveyIndex')
+        index_meta = json.loads(metadata)
+        if index_meta['version'] != INDEX_VERSION:
+            raise ValueError(f'{path} has index version {index_meta["version"]}, expected {INDEX_VERSION}')
+        table = arrow_table.to_pandas()
+        footprints = False
+        if index_meta['footprints']:
+            footprints = shapely.from_wkb(table.pop('footprint').to_numpy())
+        table.attrs['crs'] = index_meta['crs']
+        return cls(table, index_meta['crs'], footprints=footprints)
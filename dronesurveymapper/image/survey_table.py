@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 14:52:06 2026
+
+@author: Labadmin
+"""
+import os
+import numpy as np
+import pandas as pd
+
+from ..metrics import get_metrics
+from ..projection import reproject_lon_lat
+from .xmp_schema import resolve_xmp_fields, type_xmp_column
+
+# Column name -> dtype of the survey table. Writers consume these columns directly.
+SURVEY_COLUMNS = {'Filename': 'object',
+                  'Path': 'object',
+                  'Longitude': 'float64',
+                  'Latitude': 'float64',
+                  'Date Time': 'datetime64[ns]',
+                  'Altitude (m)': 'float64',
+                  'Flight Height (m)': 'float64',
+                  'Image Width (px)': 'Int32',
+                  'Image Height (px)': 'Int32',
+                  'Camera Model': 'category',
+                  '35mm Focal Length': 'Int32',
+                  'Digital Zoom Ratio': 'float64'}
+
+EXIF_DATETIME_FORMAT = '%Y:%m:%d %H:%M:%S'
+
+
+def build_survey_table(records, out_epsg=None, xmp_fields=None):
+    """
+    Builds a typed, column-oriented table from image metadata records.
+    Coordinates and heights are float64, dimensions and focal lengths are (nullable) int32,
+    datetimes are parsed and camera models are categorical.
+
+    Args:
+        records (iterable of ImageMetadata): The image metadata.
+        out_epsg (str): If given, 'x' and 'y' columns are added with the coordinates reprojected to this EPSG.
+        xmp_fields (str or list of str): XMP fields to add as columns (see xmp_schema.resolve_xmp_fields).
+            Default is the gimbal and flight attitude.
+
+    Returns:
+        table (pd.DataFrame): One row per image, with the columns in SURVEY_COLUMNS, the XMP fields (plus 'x' and 'y').
+
+    """
+    # Records may be read lazily; only the time spent building the table is counted
+    with get_metrics().consumer_timer('survey.table', records) as records:
+        xmp_columns = resolve_xmp_fields(xmp_fields)
+        columns = {name: [] for name in SURVEY_COLUMNS}
+        columns.update({name: [] for name, _, _ in xmp_columns})
+        for record in records:
+            columns['Filename'].append(os.path.basename(record.image_path))
+            columns['Path'].append(record.image_path)
+            columns['Longitude'].append(record.lon)
+            columns['Latitude'].append(record.lat)
+            columns['Date Time'].append(record.date_time)
+            columns['Altitude (m)'].append(record.altitude)
+            columns['Flight Height (m)'].append(record.flight_height)
+            columns['Image Width (px)'].append(record.width)
+            columns['Image Height (px)'].append(record.height)
+            columns['Camera Model'].append(record.camera_model)
+            columns['35mm Focal Length'].append(record.focal_length_35mm)
+            columns['Digital Zoom Ratio'].append(record.digital_zoom_ratio)
+            for name, key, _ in xmp_columns:
+                columns[name].append(record.xmp_property(key))
+
+        columns['Date Time'] = pd.to_datetime(pd.Series(columns['Date Time'], dtype='object'),
+                                              format=EXIF_DATETIME_FORMAT, errors='coerce')
+        table = pd.DataFrame({name: pd.Series(columns[name], dtype=dtype) for name, dtype in SURVEY_COLUMNS.items()})
+        for name, _, dtype in xmp_columns:
+            # XMP values are strings such as '+12.30'
+            table[name] = type_xmp_column(columns[name], dtype)
+
+    if out_epsg is not None:
+        set_projection(table, out_epsg)
+    return table
+
+
+def set_projection(table, out_epsg):
+    """
+    Adds (or replaces) the projected 'x' and 'y' columns of a survey table, reprojecting all rows in one call.
+
+    Args:
+        table (pd.DataFrame): Survey table from build_survey_table.
+        out_epsg (str): The EPSG that is desired, e.g., 'EPSG:32611'.
+
+    """
+    with get_metrics().timer('survey.reproject'):
+        x, y = reproject_lon_lat(table['Longitude'].to_numpy(dtype=np.float64),
+                                 table['Latitude'].to_numpy(dtype=np.float64),
+                                 out_epsg)
+    table['x'] = x
+    table['y'] = y
+    table.attrs['crs'] = out_epsg
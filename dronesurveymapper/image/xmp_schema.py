@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:08:15 2026
+
+@author: Labadmin
+"""
+import numpy as np
+import pandas as pd
+
+# Column name -> (XMP property, dtype) of the XMP fields that can be added to the survey table
+XMP_SCHEMA = {'Gimbal Yaw (deg)': ('drone-dji:GimbalYawDegree', 'float64'),
+              'Gimbal Pitch (deg)': ('drone-dji:GimbalPitchDegree', 'float64'),
+              'Gimbal Roll (deg)': ('drone-dji:GimbalRollDegree', 'float64'),
+              'Flight Yaw (deg)': ('drone-dji:FlightYawDegree', 'float64'),
+              'Flight Pitch (deg)': ('drone-dji:FlightPitchDegree', 'float64'),
+              'Flight Roll (deg)': ('drone-dji:FlightRollDegree', 'float64'),
+              'Flight X Speed (m/s)': ('drone-dji:FlightXSpeed', 'float64'),
+              'Flight Y Speed (m/s)': ('drone-dji:FlightYSpeed', 'float64'),
+              'Flight Z Speed (m/s)': ('drone-dji:FlightZSpeed', 'float64'),
+              'Absolute Altitude (m)': ('drone-dji:AbsoluteAltitude', 'float64'),
+              'Relative Altitude (m)': ('drone-dji:RelativeAltitude', 'float64'),
+              'RTK Flag': ('drone-dji:RtkFlag', 'Int32'),
+              'RTK Std Lon (m)': ('drone-dji:RtkStdLon', 'float64'),
+              'RTK Std Lat (m)': ('drone-dji:RtkStdLat', 'float64'),
+              'RTK Std Height (m)': ('drone-dji:RtkStdHgt', 'float64'),
+              'RTK Diff Age (s)': ('drone-dji:RtkDiffAge', 'float64'),
+              'GPS Status': ('drone-dji:GpsStatus', 'category'),
+              'Altitude Type': ('drone-dji:AltitudeType', 'category'),
+              'Surveying Mode': ('drone-dji:SurveyingMode', 'Int32'),
+              'Dewarp Flag': ('drone-dji:DewarpFlag', 'Int32'),
+              'Image Source': ('drone-dji:ImageSource', 'category'),
+              'Capture UUID': ('drone-dji:CaptureUUID', 'object'),
+              'LRF Status': ('drone-dji:LRFStatus', 'category'),
+              'LRF Target Distance (m)': ('drone-dji:LRFTargetDistance', 'float64'),
+              'LRF Target Lon': ('drone-dji:LRFTargetLon', 'float64'),
+              'LRF Target Lat': ('drone-dji:LRFTargetLat', 'float64'),
+              'LRF Target Altitude (m)': ('drone-dji:LRFTargetAbsAlt', 'float64'),
+              'XMP Make': ('tiff:Make', 'category'),
+              'XMP Model': ('tiff:Model', 'category')}
+# XMP fields added to the survey table by default
+DEFAULT_XMP_FIELDS = ['Gimbal Yaw (deg)', 'Gimbal Pitch (deg)', 'Gimbal Roll (deg)',
+                      'Flight Yaw (deg)', 'Flight Pitch (deg)', 'Flight Roll (deg)']
+
+
+def resolve_xmp_fields(xmp_fields=None):
+    """
+    Resolves a selection of XMP fields to (column, XMP property, dtype) triples.
+
+    Args:
+        xmp_fields (str or list of str): None for DEFAULT_XMP_FIELDS, 'all' for every field of XMP_SCHEMA, or a list of
+            XMP_SCHEMA column names and/or qualified XMP properties (e.g., 'drone-dji:CamReverse'). Properties that are
+            not in the schema become text columns named after the property.
+
+    Returns:
+        fields (list of tuple): (column, XMP property, dtype) of each selected field.
+
+    """
+    if xmp_fields is None:
+        xmp_fields = DEFAULT_XMP_FIELDS
+    elif xmp_fields == 'all':
+        xmp_fields = list(XMP_SCHEMA)
+    fields = []
+    for name in xmp_fields:
+        if name in XMP_SCHEMA:
+            fields.append((name, *XMP_SCHEMA[name]))
+        elif ':' in name:
+            fields.append((name, name, 'object'))
+        else:
+            raise ValueError(f'Unknown XMP field {name}, expected a column of XMP_SCHEMA or a qualified property such as drone-dji:{name}')
+    return fields
+
+
+def type_xmp_column(values, dtype):
+    """
+    Converts the raw string values of one XMP field to its dtype in one vectorized step.
+    Values that do not parse become missing.
+
+    Args:
+        values (list of str): Raw values (None where absent).
+        dtype (str): 'float64', 'Int32', 'category' or 'object'.
+
+    Returns:
+        column (pd.Series): The typed column.
+
+    """
+    values = pd.Series(values, dtype='object')
+    if dtype == 'float64':
+        return pd.to_numeric(values, errors='coerce').astype(np.float64)
+    if dtype == 'Int32':
+        numbers = pd.to_numeric(values, errors='coerce').astype(np.float64)
+        return numbers.where(numbers == np.round(numbers)).astype('Int32')
+    return values.astype(dtype)
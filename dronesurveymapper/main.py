@@ -19,5 +19,5 @@ if __name__ == '__main__':
     output_dir = './test/'
     VidReader = DJIVideoExifReader(video_path, output_dir)
     VidReader.extract_frames_from_video()
-    frames, frame_keys = VidReader.parse_exiftxt()
-    VidReader.save_frame_csv(frames, frame_keys)
+    # Rows are the telemetry at the time of each extracted frame
+    VidReader.save_frame_csv()
@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 16:37:25 2026
+
+@author: Labadmin
+"""
+import json
+import time
+import heapq
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds (s) of the latency histogram buckets. Latencies above the last bound go in a final overflow bucket
+HISTOGRAM_BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class StageStats:
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets', 'slowest')
+
+    def __init__(self):
+        """
+        Latency statistics of one stage: count, total, min/max, a histogram over HISTOGRAM_BOUNDS and the slowest items.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.slowest = []  # Min-heap of (seconds, item)
+
+    def add(self, seconds, item=None, n_slowest=10):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        bucket = 0
+        while bucket < len(HISTOGRAM_BOUNDS) and seconds > HISTOGRAM_BOUNDS[bucket]:
+            bucket += 1
+        self.buckets[bucket] += 1
+        if item is not None:
+            if len(self.slowest) < n_slowest:
+                heapq.heappush(self.slowest, (seconds, item))
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (seconds, item))
+
+    def merge(self, other, n_slowest=10):
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.slowest = heapq.nlargest(n_slowest, self.slowest + other.slowest)
+        heapq.heapify(self.slowest)
+
+    def quantile(self, q):
+        """
+        Approximate latency quantile, as the upper bound of the histogram bucket it falls in.
+
+        Args:
+            q (float): Quantile, between 0 and 1.
+
+        Returns:
+            seconds (float): The quantile (the max latency if it falls in the overflow bucket).
+
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(HISTOGRAM_BOUNDS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {'count': self.count,
+                'total_s': self.total,
+                'mean_s': self.total / self.count if self.count else None,
+                'min_s': self.min,
+                'max_s': self.max,
+                'p50_s': self.quantile(0.5),
+                'p95_s': self.quantile(0.95),
+                'histogram': {'bounds_s': list(HISTOGRAM_BOUNDS), 'counts': list(self.buckets)},
+                'slowest': [{'item': item, 'seconds': seconds} for seconds, item in sorted(self.slowest, reverse=True)]}
+
+
+class _Timer:
+    __slots__ = ('metrics', 'stage', 'item', 'start')
+
+    def __init__(self, metrics, stage, item):
+        self.metrics = metrics
+        self.stage = stage
+        self.item = item
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.stage, time.perf_counter() - self.start, self.item)
+        return False
+
+
+class _TimedIterator:
+    __slots__ = ('iterator', 'seconds')
+
+    def __init__(self, iterable):
+        self.iterator = iter(iterable)
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self.iterator)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+class Metrics:
+    enabled = True
+
+    def __init__(self, n_slowest=10):
+        """
+        Collects per-stage latencies and counters over a run, from any thread.
+        Stages are named '<area>.<stage>' (e.g., 'image.exif', 'video.exiftool', 'write.GeoJSON') and counters likewise
+        (e.g., 'image.files', 'image.bytes_read'). Activate with set_metrics or collect_metrics so the image and video
+        code records into it.
+
+        Args:
+            n_slowest (int): Number of slowest items (e.g., image paths) kept per stage. Default is 10.
+
+        """
+        self.n_slowest = n_slowest
+        self.stages = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.stopped = None
+        self._lock = threading.Lock()
+
+    def timer(self, stage, item=None):
+        """
+        Context manager timing a block as one occurrence of a stage.
+
+        Args:
+            stage (str): Stage name.
+            item (str): Optional item being processed (e.g., the image path), kept if among the slowest.
+
+        """
+        return _Timer(self, stage, item)
+
+    def consumer_timer(self, stage, iterable):
+        """
+        Context manager timing a block that consumes an iterable, excluding the time spent producing its items
+        (e.g., a writer consuming chunks that are read lazily). Yields the iterable to consume.
+
+        Args:
+            stage (str): Stage name.
+            iterable (iterable): The iterable consumed by the block.
+
+        """
+        return self._consumer_timer(stage, iterable)
+
+    @contextmanager
+    def _consumer_timer(self, stage, iterable):
+        timed = _TimedIterator(iterable)
+        start = time.perf_counter()
+        try:
+            yield timed
+        finally:
+            self.record(stage, time.perf_counter() - start - timed.seconds)
+
+    def record(self, stage, seconds, item=None):
+        """
+        Records one occurrence of a stage.
+
+        Args:
+            stage (str): Stage name.
+            seconds (float): Latency of the occurrence.
+            item (str): Optional item being processed.
+
+        """
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.add(seconds, item, self.n_slowest)
+
+    def count(self, name, value=1):
+        """
+        Increments a counter.
+
+        Args:
+            name (str): Counter name.
+            value (int or float): Increment. Default is 1.
+
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, stages, counters):
+        """
+        Adds metrics collected elsewhere, e.g., in a worker process.
+
+        Args:
+            stages (dict): Stage name -> StageStats, e.g., the stages of another Metrics.
+            counters (dict): Counter name -> value.
+
+        """
+        with self._lock:
+            for stage, stats in stages.items():
+                if stage not in self.stages:
+                    self.stages[stage] = StageStats()
+                self.stages[stage].merge(stats, self.n_slowest)
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def stop(self):
+        """
+        Stops the run clock used for the rates. Called by collect_metrics on exit.
+        """
+        if self.stopped is None:
+            self.stopped = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return (self.stopped if self.stopped is not None else time.perf_counter()) - self.started
+
+    def to_dict(self):
+        """
+        Returns:
+            metrics (dict): Elapsed time, counters with their per-second rates, and per-stage statistics.
+
+        """
+        elapsed = self.elapsed
+        with self._lock:
+            counters = dict(self.counters)
+            stages = {stage: stats.to_dict() for stage, stats in sorted(self.stages.items())}
+        return {'elapsed_s': elapsed,
+                'counters': counters,
+                'rates_per_s': {name: value / elapsed for name, value in counters.items()} if elapsed > 0 else {},
+                'stages': stages}
+
+    def save_json(self, path):
+        """
+        Writes the metrics (see to_dict) as JSON.
+
+        Args:
+            path (str): Output path.
+
+        """
+        with open(path, 'w') as f_out:
+            json.dump(self.to_dict(), f_out, indent=1)
+
+    def summary(self):
+        """
+        Returns:
+            summary (str): Human-readable summary: counters and rates, then one line per stage sorted by total time.
+
+        """
+        metrics = self.to_dict()
+        lines = [f"Run time {metrics['elapsed_s']:.2f} s"]
+        for name, value in sorted(metrics['counters'].items()):
+            lines.append(f"  {name:<24} {value:>14,.0f}  ({metrics['rates_per_s'].get(name, 0):,.1f}/s)")
+        stages = sorted(metrics['stages'].items(), key=lambda stage: stage[1]['total_s'], reverse=True)
+        for stage, stats in stages:
+            lines.append(f"  {stage:<24} {stats['total_s']:9.3f} s total  {stats['count']:>8} x  "
+                         f"mean {stats['mean_s'] * 1000:8.2f} ms  p95 {stats['p95_s'] * 1000:8.2f} ms  "
+                         f"max {stats['max_s'] * 1000:8.2f} ms")
+            for slow in stats['slowest'][:3]:
+                lines.append(f"      {slow['seconds'] * 1000:8.2f} ms  {slow['item']}")
+        return '\n'.join(lines)
+
+    def log_summary(self, logger=None, level=logging.INFO):
+        """
+        Logs the summary.
+
+        Args:
+            logger (logging.Logger): Logger to use. Default is the 'dronesurveymapper' logger.
+            level (int): Log level. Default is INFO.
+
+        """
+        if logger is None:
+            logger = logging.getLogger('dronesurveymapper')
+        logger.log(level, self.summary())
+
+
+class NullMetrics:
+    enabled = False
+
+    def timer(self, stage, item=None):
+        return _NULL_TIMER
+
+    def consumer_timer(self, stage, iterable):
+        return nullcontext(iterable)
+
+    def record(self, stage, seconds, item=None):
+        pass
+
+    def count(self, name, value=1):
+        pass
+
+
+_NULL_TIMER = nullcontext()
+NULL_METRICS = NullMetrics()
+_active = NULL_METRICS
+
+
+def get_metrics():
+    """
+    Returns:
+        metrics (Metrics or NullMetrics): The active metrics. NULL_METRICS (which records nothing) unless enabled.
+
+    """
+    return _active
+
+
+def set_metrics(metrics):
+    """
+    Activates a Metrics for the image and video code to record into (None disables recording).
+    Metrics are process-wide; worker processes report their task latencies back to the parent.
+
+    Args:
+        metrics (Metrics): The metrics to activate, or None.
+
+    Returns:
+        previous (Metrics or NullMetrics): The previously active metrics.
+
+    """
+    global _active
+    previous = _active
+    _active = NULL_METRICS if metrics is None else metrics
+    return previous
+
+
+@contextmanager
+def collect_metrics(n_slowest=10):
+    """
+    Context manager collecting metrics for the duration of a block, e.g.
+
+        with collect_metrics() as metrics:
+            SurveyImagesToSpatial(survey_dir, 'EPSG:32611').write_spatial('survey.fgb')
+        print(metrics.summary())
+
+    Args:
+        n_slowest (int): Number of slowest items kept per stage. Default is 10.
+
+    Yields:
+        metrics (Metrics): The collected metrics.
+
+    """
+    metrics = Metrics(n_slowest)
+    previous = set_metrics(metrics)
+    try:
+        yield metrics
+    finally:
+        metrics.stop()
+        set_metrics(previous)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 12:48:10 2026
+
+@author: Labadmin
+"""
+from functools import lru_cache
+import numpy as np
+from pyproj import Transformer, CRS
+
+
+def normalize_epsg(epsg):
+    """
+    Normalizes an EPSG code to the form 'EPSG:####'.
+
+    Args:
+        epsg (str or int): EPSG code, e.g., 'EPSG:32611', 'epsg:32611' or 32611.
+
+    Returns:
+        epsg (str): The code as 'EPSG:####'.
+
+    """
+    return f"EPSG:{int(str(epsg).lower().replace('epsg:', ''))}"
+
+
+@lru_cache(maxsize=64)
+def _cached_transformer(in_epsg, out_epsg):
+    in_crs = CRS.from_epsg(int(in_epsg.split(':')[1]))
+    out_crs = CRS.from_epsg(int(out_epsg.split(':')[1]))
+    return Transformer.from_crs(in_crs, out_crs, always_xy=True)
+
+
+def get_transformer(out_epsg, in_epsg='EPSG:4326'):
+    """
+    Returns a transformer between two EPSGs. Transformers are built once per (in, out) pair and shared process-wide.
+
+    Args:
+        out_epsg (str): The EPSG that is desired. e.g., if EPSG:32611 is desired, out_epsg='EPSG:32611'.
+        in_epsg (str): The EPSG of the input coordinates. Default is EPSG:4326.
+
+    Returns:
+        transformer (pyproj.Transformer): The transformer, with x/y (lon/lat) axis order.
+
+    """
+    return _cached_transformer(normalize_epsg(in_epsg), normalize_epsg(out_epsg))
+
+
+def clear_transformer_cache():
+    """
+    Drops all cached transformers.
+    """
+    _cached_transformer.cache_clear()
+
+
+def reproject_lon_lat(lon, lat, out_epsg):
+    """
+    Reprojects arrays of coordinates from lat/lon (EPSG:4326) to the given EPSG in a single call.
+
+    Args:
+        lon (array-like): Longitudes in EPSG:4326.
+        lat (array-like): Latitudes in EPSG:4326.
+        out_epsg (str): The EPSG that is desired, e.g., 'EPSG:32611'.
+
+    Returns:
+        x (np.ndarray): Transformed x coordinates (float64).
+        y (np.ndarray): Transformed y coordinates (float64).
+
+    """
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    if lon.size == 0:
+        return lon.copy(), lat.copy()
+    x, y = get_transformer(out_epsg).transform(lon, lat)
+    return np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
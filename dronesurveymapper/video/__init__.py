@@ -4,6 +4,23 @@ Created on Tue May 20 14:55:26 2025
 
 @author: Labadmin
 """
+from .._lazy import lazy_exports
 
-from .video_exif_reader import *
-from .utils import *
+# Submodule -> public names it provides. Submodules are imported on first access (PEP 562), so importing the
+# package does not pull in OpenCV, pandas or the exiftool helpers until they are used.
+_EXPORTS = {
+    'video_exif_reader': ('DJIVideoExifReader',),
+    'utils': ('dms_to_epsg4326', 'elapsed_seconds_since_ref', 'get_first_second_indices', 'filter_dict_by_keys'),
+    'frame_writer': ('IMAGE_FORMATS', 'encode_params', 'FrameWriterPool'),
+    'telemetry': ('TELEMETRY_FIELDS', 'NUMERIC_FIELDS', 'EXIFTOOL_TAGS', 'EXIFTOOL_JSON_ARGS', 'INTERPOLATED_FIELDS',
+                  'GPS_DATETIME_FORMAT', 'GPS_DATETIME_FORMAT_SECONDS', 'read_exiftool_text', 'telemetry_from_rows',
+                  'type_telemetry', 'telemetry_from_exiftool_json', 'run_exiftool_json', 'read_telemetry_json',
+                  'parse_telemetry_text', 'first_sample_per_second'),
+    'exiftool_pool': ('ExifToolProcess', 'ExifToolPool'),
+    'frame_table': ('FRAME_COLUMNS', 'TABLE_DRIVERS', 'CSV_DATETIME_FORMAT', 'build_frame_table', 'write_frame_table'),
+    'sync': ('LINEAR_FIELDS', 'ANGLE_FIELDS', 'NEAREST_FIELDS', 'telemetry_times', 'interpolate_telemetry',
+             'sample_grid'),
+    'batch': ('VIDEO_EXTENSIONS', 'TASKS', 'find_videos', 'BatchManifest', 'process_videos'),
+}
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:31:44 2026
+
+@author: Labadmin
+"""
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing.util import Finalize
+
+from ..metrics import get_metrics
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov')
+TASKS = ('telemetry', 'frames', 'frame_table')
+# The frame table is built from the outputs of these tasks, once both are done
+FRAME_TABLE_INPUTS = ('telemetry', 'frames')
+
+# Per-worker-process exiftool pool, created by _init_worker
+_worker_exiftool_pool = None
+
+
+def find_videos(videos):
+    """
+    Resolves a folder or a list of videos to a sorted list of video paths.
+
+    Args:
+        videos (str or list of str): A folder containing videos, or a list of video paths.
+
+    Returns:
+        video_paths (list of str): Sorted video paths.
+
+    """
+    if isinstance(videos, str):
+        if os.path.isdir(videos):
+            return sorted(os.path.join(videos, name) for name in os.listdir(videos)
+                          if name.lower().endswith(VIDEO_EXTENSIONS))
+        videos = [videos]
+    return sorted(videos)
+
+
+def _output_dirs(video_paths, output_root, manifest, relative_to=None):
+    """
+    One output folder per video, named after the video (with a suffix if two videos share a name), or after its path
+    relative to relative_to (e.g., cardA/DJI_0001) if given.
+    Videos already in the manifest keep their folder, and new videos never take a folder the manifest assigned.
+    """
+    dirs = {}
+    used = set()
+    for entry in manifest.videos.values():
+        if 'output_dir' in entry:
+            used.add(os.path.normcase(os.path.abspath(entry['output_dir'])))
+    for video_path in video_paths:
+        entry = manifest.videos.get(os.path.abspath(video_path))
+        if entry is not None and 'output_dir' in entry:
+            dirs[video_path] = entry['output_dir']
+            continue
+        if relative_to is not None:
+            stem = os.path.splitext(os.path.relpath(os.path.abspath(video_path), os.path.abspath(relative_to)))[0]
+        else:
+            stem = os.path.splitext(os.path.basename(video_path))[0]
+        name, n = stem, 1
+        while os.path.normcase(os.path.abspath(os.path.join(output_root, name))) in used:
+            name = f'{stem}_{n}'
+            n += 1
+        dirs[video_path] = os.path.join(output_root, name)
+        used.add(os.path.normcase(os.path.abspath(dirs[video_path])))
+    return dirs
+
+
+def _init_worker(exiftool, persistent_exiftool):
+    global _worker_exiftool_pool
+    if persistent_exiftool:
+        from .exiftool_pool import ExifToolPool
+        _worker_exiftool_pool = ExifToolPool(size=1, exiftool=exiftool)
+        # Pool workers leave through os._exit, which skips atexit; multiprocessing finalizers still run
+        Finalize(_worker_exiftool_pool, _worker_exiftool_pool.close, exitpriority=10)
+
+
+def _telemetry_job(video_path, output_dir, exiftool):
+    """
+    Reads the telemetry of one video with exiftool and saves its JSON output for the frame table task.
+    """
+    from .telemetry import run_exiftool_json
+
+    metadata = run_exiftool_json(video_path, exiftool, _worker_exiftool_pool)
+    os.makedirs(output_dir, exist_ok=True)
+    telemetry_path = os.path.join(output_dir, 'telemetry.json')
+    with open(telemetry_path, 'w') as f_out:
+        json.dump(metadata, f_out)
+    return [telemetry_path]
+
+
+def _frames_job(video_path, output_dir, frame_options):
+    """
+    Extracts the frames of one video and saves their (filename, index, time) for the frame table task.
+    """
+    from .video_exif_reader import DJIVideoExifReader
+
+    reader = DJIVideoExifReader(video_path, output_dir, read_telemetry=False)
+    extracted = reader.extract_frames_from_video(**frame_options)
+    with open(os.path.join(output_dir, 'extracted_frames.json'), 'w') as f_out:
+        json.dump(extracted, f_out)
+    return [frame_filename for frame_filename, _, _ in extracted]
+
+
+def _frame_table_job(video_path, output_dir):
+    """
+    Writes the frame CSV of one video, with the telemetry interpolated at the time of each extracted frame.
+    """
+    from .telemetry import telemetry_from_exiftool_json
+    from .video_exif_reader import DJIVideoExifReader
+
+    reader = DJIVideoExifReader(video_path, output_dir, read_telemetry=False)
+    with open(os.path.join(output_dir, 'telemetry.json'), 'r') as f_in:
+        reader.telemetry = telemetry_from_exiftool_json(json.load(f_in))
+    with open(os.path.join(output_dir, 'extracted_frames.json'), 'r') as f_in:
+        reader.extracted_frames = [tuple(frame) for frame in json.load(f_in)]
+    reader.save_frame_csv()
+    return [os.path.join(output_dir, 'frames.csv')]
+
+
+class BatchManifest:
+    def __init__(self, manifest_path):
+        """
+        JSON record of the completed tasks of a batch, so an interrupted batch resumes where it stopped.
+        A task is only considered done while the video's size and mtime are unchanged.
+
+        Args:
+            manifest_path (str): Path to the manifest. Loaded if it exists.
+
+        """
+        self.manifest_path = manifest_path
+        self.videos = {}
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, 'r') as f_in:
+                self.videos = json.load(f_in).get('videos', {})
+
+    @staticmethod
+    def _signature(video_path):
+        st = os.stat(video_path)
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    def is_done(self, video_path, task):
+        entry = self.videos.get(os.path.abspath(video_path))
+        if entry is None or {k: entry.get(k) for k in ('size', 'mtime_ns')} != self._signature(video_path):
+            return False
+        return entry.get('tasks', {}).get(task, {}).get('status') == 'done'
+
+    def record(self, video_path, output_dir, task, status, outputs=None, error=None):
+        key = os.path.abspath(video_path)
+        entry = self.videos.get(key)
+        signature = self._signature(video_path)
+        if entry is None or {k: entry.get(k) for k in ('size', 'mtime_ns')} != signature:
+            entry = self.videos[key] = {**signature, 'output_dir': output_dir, 'tasks': {}}
+        result = {'status': status}
+        if outputs is not None:
+            result['n_outputs'] = len(outputs)
+            result['outputs'] = outputs
+        if error is not None:
+            result['error'] = error
+        entry['tasks'][task] = result
+        self.save()
+
+    def save(self):
+        """
+        Writes the manifest atomically, so an interruption never leaves it half written.
+        """
+        tmp_path = f'{self.manifest_path}.tmp'
+        with open(tmp_path, 'w') as f_out:
+            json.dump({'videos': self.videos}, f_out, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def process_videos(videos,
+                   output_root,
+                   workers=2,
+                   max_tasks_per_video=2,
+                   manifest_path=None,
+                   exiftool='exiftool',
+                   persistent_exiftool=True,
+                   relative_to=None,
+                   **frame_options):
+    """
+    Processes many DJI videos on a process pool. Each video has a telemetry task (exiftool), a frame extraction task
+    and, once both are done, a frame table task writing the frame CSV with the telemetry synchronized to the extracted
+    frames. Completed tasks are recorded in a manifest and skipped when the batch is re-run.
+
+    Args:
+        videos (str or list of str): A folder containing videos, or a list of video paths.
+        output_root (str): Folder for the outputs. Each video gets a sub-folder named after it.
+        workers (int): Number of worker processes. Default is 2.
+        max_tasks_per_video (int): Maximum number of tasks of the same video running at once.
+            1 runs telemetry then frames; 2 (default) runs both concurrently.
+        manifest_path (str): Path to the manifest. Default is output_root/manifest.json.
+        exiftool (str): exiftool executable. Default is 'exiftool'.
+        persistent_exiftool (bool): If True (default), each worker keeps one '-stay_open' exiftool process for all its videos.
+        relative_to (str): Optional folder the videos are in. Output folders then mirror the video paths relative to it,
+            so videos with the same name in different sub-folders (e.g., SD cards) keep apart.
+        **frame_options: Passed to DJIVideoExifReader.extract_frames_from_video (e.g., interval_seconds, mode, image_format).
+
+    Returns:
+        manifest (BatchManifest): The manifest, with the status of every task.
+
+    """
+    os.makedirs(output_root, exist_ok=True)
+    if manifest_path is None:
+        manifest_path = os.path.join(output_root, 'manifest.json')
+    manifest = BatchManifest(manifest_path)
+    video_paths = find_videos(videos)
+    output_dirs = _output_dirs(video_paths, output_root, manifest, relative_to)
+
+    # Tasks still to do, in video order
+    todo = []
+    for video_path in video_paths:
+        tasks = [task for task in TASKS if not manifest.is_done(video_path, task)]
+        # Rebuild the frame table from redone telemetry or frames
+        if 'frame_table' not in tasks and any(task in FRAME_TABLE_INPUTS for task in tasks):
+            tasks.append('frame_table')
+        todo += [(video_path, task) for task in tasks]
+    running = {}  # future -> (video_path, task)
+    running_per_video = {}
+    # Workers have their own (disabled) metrics; task latencies are recorded here. Tasks only start when a worker is
+    # free, so the time from submission to completion is the task's run time
+    metrics = get_metrics()
+    submitted = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(exiftool, persistent_exiftool)) as pool:
+        while todo or running:
+            # Submit every task whose video is under its concurrency limit, keeping the pool just saturated
+            for item in list(todo):
+                if len(running) >= workers:
+                    break
+                video_path, task = item
+                if running_per_video.get(video_path, 0) >= max_tasks_per_video:
+                    continue
+                output_dir = output_dirs[video_path]
+                if task == 'frame_table':
+                    waiting = [(video_path, other) for other in FRAME_TABLE_INPUTS]
+                    if any(other in todo or other in running.values() for other in waiting):
+                        continue
+                    if not all(manifest.is_done(video_path, other) for other in FRAME_TABLE_INPUTS):
+                        manifest.record(video_path, output_dir, task, 'failed',
+                                        error=f'Requires the {" and ".join(FRAME_TABLE_INPUTS)} tasks to succeed')
+                        metrics.count(f'batch.{task}_failed')
+                        todo.remove(item)
+                        continue
+                    future = pool.submit(_frame_table_job, video_path, output_dir)
+                elif task == 'telemetry':
+                    future = pool.submit(_telemetry_job, video_path, output_dir, exiftool)
+                else:
+                    future = pool.submit(_frames_job, video_path, output_dir, frame_options)
+                running[future] = item
+                submitted[future] = time.perf_counter()
+                running_per_video[video_path] = running_per_video.get(video_path, 0) + 1
+                todo.remove(item)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                video_path, task = running.pop(future)
+                running_per_video[video_path] -= 1
+                metrics.record(f'batch.{task}', time.perf_counter() - submitted.pop(future), video_path)
+                try:
+                    outputs = future.result()
+                    manifest.record(video_path, output_dirs[video_path], task, 'done', outputs=outputs)
+                    metrics.count(f'batch.{task}_done')
+                except Exception as e:
+                    manifest.record(video_path, output_dirs[video_path], task, 'failed', error=f'{type(e).__name__}: {e}')
+                    metrics.count(f'batch.{task}_failed')
+    return manifest
+
+
+def add_batch_arguments(parser):
+    """
+    Adds the process_videos arguments to an argparse parser (shared with the dronesurveymapper CLI).
+
+    Args:
+        parser (argparse.ArgumentParser): The parser.
+
+    """
+    parser.add_argument('videos', nargs='+', help='Folder containing videos, or video paths.')
+    parser.add_argument('output_root', help='Folder for the outputs (one sub-folder per video).')
+    parser.add_argument('--workers', type=int, default=2, help='Number of worker processes.')
+    parser.add_argument('--max_tasks_per_video', type=int, default=2, help='Maximum concurrent tasks per video.')
+    parser.add_argument('--manifest', default=None, help='Manifest path (default: output_root/manifest.json).')
+    parser.add_argument('--interval_seconds', type=float, default=1, help='Time between extracted frames.')
+    parser.add_argument('--mode', default='grab', choices=['grab', 'seek', 'keyframe'], help='Frame sampling mode.')
+    parser.add_argument('--exiftool', default='exiftool', help='exiftool executable.')
+
+
+def run_batch(args):
+    """
+    Runs process_videos from parsed add_batch_arguments arguments and reports the failed tasks.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Returns:
+        exit_code (int): 0 if every task succeeded, 1 otherwise.
+
+    """
+    videos = args.videos[0] if len(args.videos) == 1 else args.videos
+    manifest = process_videos(videos, args.output_root, workers=args.workers,
+                              max_tasks_per_video=args.max_tasks_per_video, manifest_path=args.manifest,
+                              exiftool=args.exiftool, interval_seconds=args.interval_seconds, mode=args.mode)
+    failed = [(video, task, result['error']) for video, entry in manifest.videos.items()
+              for task, result in entry['tasks'].items() if result['status'] == 'failed']
+    for video, task, error in failed:
+        print(f'{task} failed for {video}: {error}')
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Extract telemetry and frames from a batch of DJI videos.')
+    add_batch_arguments(parser)
+    return run_batch(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
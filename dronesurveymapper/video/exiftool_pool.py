@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:14:08 2026
+
+@author: Labadmin
+"""
+import queue
+import subprocess
+import threading
+import time
+
+
+class ExifToolProcess:
+    def __init__(self, exiftool='exiftool'):
+        """
+        A long-lived 'exiftool -stay_open True -@ -' process. Arguments are written to its stdin one per line and each
+        request ends with '-execute<N>'. The response is read until exiftool prints '{ready<N>}' on stdout, and stderr is
+        synchronized the same way with '-echo4'. Pipes are drained by reader threads so timeouts also work on Windows.
+
+        Args:
+            exiftool (str): exiftool executable. Default is 'exiftool'.
+
+        """
+        self.exiftool = exiftool
+        self.process = None
+        self._sequence = 0
+        self.start()
+
+    def start(self):
+        """
+        Starts (or restarts) the exiftool process.
+        """
+        self.kill()
+        self.process = subprocess.Popen([self.exiftool, '-stay_open', 'True', '-@', '-',
+                                         '-common_args', '-charset', 'filename=utf8'],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                        encoding='utf-8', errors='replace', bufsize=1)
+        self._stdout = queue.Queue()
+        self._stderr = queue.Queue()
+        for stream, lines in ((self.process.stdout, self._stdout), (self.process.stderr, self._stderr)):
+            threading.Thread(target=_pump, args=(stream, lines), daemon=True).start()
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def execute(self, *args, timeout=None):
+        """
+        Runs one exiftool command in the process.
+
+        Args:
+            *args (str): exiftool arguments, e.g., '-j', '-ee', 'video.MP4'.
+            timeout (float): Seconds to wait for the response. None waits forever.
+
+        Returns:
+            stdout (str): The output of the command.
+            stderr (str): The errors and warnings of the command.
+
+        """
+        if not self.alive:
+            raise RuntimeError('exiftool process is not running')
+        self._sequence += 1
+        ready = f'{{ready{self._sequence}}}'
+        request = [*args, '-echo4', ready, f'-execute{self._sequence}']
+        if any('\n' in arg for arg in request):
+            raise ValueError('exiftool arguments cannot contain newlines')
+        try:
+            self.process.stdin.write('\n'.join(request) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise RuntimeError(f'exiftool process died: {e}')
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        stdout = self._read_until(self._stdout, ready, deadline)
+        stderr = self._read_until(self._stderr, ready, deadline)
+        return stdout, stderr
+
+    def _read_until(self, lines, ready, deadline):
+        out = []
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError('exiftool did not respond in time')
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError('exiftool did not respond in time')
+            if line is None:
+                raise RuntimeError('exiftool process died')
+            if line.rstrip('\r\n') == ready:
+                return ''.join(out)
+            out.append(line)
+
+    def close(self, timeout=5):
+        """
+        Asks exiftool to exit, killing it if it does not within timeout seconds.
+        """
+        if self.alive:
+            try:
+                self.process.stdin.write('-stay_open\nFalse\n')
+                self.process.stdin.flush()
+                self.process.wait(timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+    def kill(self):
+        """
+        Kills the exiftool process, if running.
+        """
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+                self.process.wait()
+            for stream in (self.process.stdin, self.process.stdout, self.process.stderr):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+            self.process = None
+
+
+def _pump(stream, lines):
+    try:
+        for line in stream:
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    lines.put(None)  # EOF
+
+
+class ExifToolPool:
+    def __init__(self,
+                 size=2,
+                 exiftool='exiftool',
+                 timeout=600,
+                 retries=1):
+        """
+        A pool of long-lived exiftool processes shared by video readers, so each video does not pay for Perl startup.
+        A process that crashes or times out is restarted and the request is retried up to retries times.
+
+        Args:
+            size (int): Number of exiftool processes. Default is 2.
+            exiftool (str): exiftool executable. Default is 'exiftool'.
+            timeout (float): Seconds to wait for one request. Default is 600.
+            retries (int): Number of retries after a crash or timeout. Default is 1.
+
+        """
+        self.exiftool = exiftool
+        self.timeout = timeout
+        self.retries = retries
+        self._processes = [ExifToolProcess(exiftool) for _ in range(size)]
+        self._idle = queue.Queue()
+        for process in self._processes:
+            self._idle.put(process)
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, *args):
+        """
+        Runs one exiftool command on an idle process of the pool. Blocks while every process is busy.
+
+        Args:
+            *args (str): exiftool arguments.
+
+        Returns:
+            stdout (str): The output of the command.
+            stderr (str): The errors and warnings of the command.
+
+        """
+        if self._closed:
+            raise RuntimeError('ExifToolPool is closed')
+        process = self._idle.get()
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    if not process.alive:
+                        process.start()
+                    return process.execute(*args, timeout=self.timeout)
+                except (RuntimeError, TimeoutError):
+                    # The process state is unknown; start a fresh one
+                    process.start()
+                    if attempt == self.retries:
+                        raise
+        finally:
+            self._idle.put(process)
+
+    def close(self):
+        """
+        Shuts down every exiftool process.
+        """
+        self._closed = True
+        for process in self._processes:
+            process.close()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:37 2026
+
+@author: Labadmin
+"""
+import os
+import numpy as np
+import pandas as pd
+
+from ..metrics import get_metrics
+from .telemetry import first_sample_per_second
+
+# Columns of the frame table, in output order. 'Sample Time' is the elapsed GPS time of the sample, in seconds
+FRAME_COLUMNS = ['Image Name', 'Sample Time', 'Sample Duration',
+                 'ISO', 'Shutter Speed', 'F Number',
+                 'Digital Zoom', 'Drone Roll', 'Drone Pitch',
+                 'Drone Yaw', 'GPS Latitude', 'GPS Longitude',
+                 'Absolute Altitude', 'Relative Altitude',
+                 'Gimbal Pitch', 'Gimbal Yaw', 'GPS Date/Time']
+TABLE_DRIVERS = {'.csv': 'CSV',
+                 '.parquet': 'Parquet'}
+# CSV format of 'GPS Date/Time', as printed by exiftool (milliseconds are appended)
+CSV_DATETIME_FORMAT = '%Y:%m:%d %H:%M:%S'
+
+
+def build_frame_table(telemetry, positions=None, frame_extension='.jpg', frame_names=None, columns=None):
+    """
+    Builds the per-frame table from a typed telemetry table in one columnar step.
+
+    Args:
+        telemetry (pd.DataFrame): Typed telemetry from telemetry.telemetry_from_rows or telemetry_from_exiftool_json.
+        positions (array-like of int): Rows of telemetry to keep, one per frame. Default is the first sample of each second.
+        frame_extension (str): Extension of the frame images, used to name them. Default is '.jpg'.
+        frame_names (list of str): Optional frame image names. Default is frame_00000<ext>, frame_00001<ext>, ...
+        columns (list of str): Output columns. Default is FRAME_COLUMNS. Other telemetry fields (e.g., 'Gimbal Roll')
+            can be added for uses beyond the frame CSV.
+
+    Returns:
+        table (pd.DataFrame): One row per frame with the given columns.
+
+    """
+    if positions is None:
+        positions = first_sample_per_second(telemetry['Elapsed (s)'])
+    samples = telemetry.iloc[np.asarray(positions, dtype=np.int64)].reset_index(drop=True)
+    if frame_names is None:
+        frame_names = [f'frame_{i:05d}{frame_extension}' for i in range(len(samples))]
+    elif len(frame_names) != len(samples):
+        raise ValueError(f'Got {len(frame_names)} frame names for {len(samples)} frames')
+
+    table = samples.reindex(columns=FRAME_COLUMNS if columns is None else columns)
+    table['Image Name'] = pd.Series(frame_names, dtype=object)
+    table['Sample Time'] = samples['Elapsed (s)']
+    return table
+
+
+def _csv_table(table):
+    """
+    Formats the frame table for CSV like the exiftool values it used to copy: whole-number ISO and exiftool GPS times
+    (e.g., 2024:06:01 17:00:00.123Z). Other values are written as numbers in their base unit.
+    """
+    table = table.copy()
+    table['ISO'] = table['ISO'].round().astype('Int64')
+    gps_time = table['GPS Date/Time']
+    if pd.api.types.is_datetime64_any_dtype(gps_time.dtype):
+        milliseconds = (gps_time.dt.microsecond // 1000).astype('Int64').astype(str).str.zfill(3)
+        gps_text = gps_time.dt.strftime(CSV_DATETIME_FORMAT) + '.' + milliseconds + 'Z'
+        table['GPS Date/Time'] = gps_text.where(gps_time.notna())
+    return table
+
+
+def write_frame_table(table, path, driver=None, out_epsg='EPSG:4326'):
+    """
+    Writes a frame table as a table (CSV or Parquet) or as frame points (GeoJSON, FlatGeobuf or GeoParquet).
+    Frames without a GPS position are left out of the point outputs.
+
+    Args:
+        table (pd.DataFrame): Frame table from build_frame_table.
+        path (str): Output path.
+        driver (str): 'CSV', 'Parquet', 'GeoJSON', 'FlatGeobuf', 'GPKG' or 'GeoParquet'. Inferred from the extension if None
+            ('.csv', '.parquet', '.geojson', '.fgb', '.gpkg', '.geoparquet').
+        out_epsg (str): EPSG of the frame points. Default is 'EPSG:4326'.
+
+    Returns:
+        n_frames (int): Number of frames written.
+
+    """
+    if driver is None:
+        driver = TABLE_DRIVERS.get(os.path.splitext(path)[1].lower())
+    if driver == 'CSV':
+        with get_metrics().timer('write.CSV', path):
+            _csv_table(table).to_csv(path)
+        return len(table)
+    if driver == 'Parquet':
+        with get_metrics().timer('write.Parquet', path):
+            table.to_parquet(path, index=False)
+        return len(table)
+
+    # The spatial stack (shapely, pyproj) is only imported for the point outputs
+    from ..projection import reproject_lon_lat
+    from ..writers import infer_driver, point_chunks, write_features
+
+    if driver is None:
+        driver = infer_driver(path)
+    points = table[table['GPS Latitude'].notna() & table['GPS Longitude'].notna()]
+    x, y = reproject_lon_lat(points['GPS Longitude'].to_numpy(dtype=np.float64),
+                             points['GPS Latitude'].to_numpy(dtype=np.float64),
+                             out_epsg)
+    points = points.assign(x=x, y=y)
+    return write_features(path, point_chunks([points]), out_epsg, driver=driver)
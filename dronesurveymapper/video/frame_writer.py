@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 18:40:12 2026
+
+@author: Labadmin
+"""
+import queue
+import threading
+import cv2
+
+IMAGE_FORMATS = {'jpg': '.jpg',
+                 'jpeg': '.jpg',
+                 'png': '.png',
+                 'webp': '.webp'}
+
+
+def encode_params(image_format, quality):
+    """
+    Builds the cv2.imwrite parameters for a format.
+
+    Args:
+        image_format (str): 'jpg', 'png' or 'webp'.
+        quality (int): 0-100 quality for JPEG and WebP. For PNG, mapped to a compression level (higher quality = faster, larger files).
+
+    Returns:
+        params (list of int): cv2.imwrite parameters.
+
+    """
+    image_format = image_format.lower()
+    if image_format in ('jpg', 'jpeg'):
+        return [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+    if image_format == 'webp':
+        return [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+    if image_format == 'png':
+        return [cv2.IMWRITE_PNG_COMPRESSION, int(round(9 * (100 - quality) / 100))]
+    raise ValueError(f'Unsupported image format {image_format}, expected one of {list(IMAGE_FORMATS)}')
+
+
+class FrameWriterPool:
+    def __init__(self,
+                 image_format='jpg',
+                 quality=95,
+                 scale=None,
+                 workers=2,
+                 max_queue=8):
+        """
+        Encodes and writes video frames on background threads, so decoding does not stall on the encoder or the disk.
+        The queue is bounded: submit() blocks once max_queue frames are waiting, which caps memory use.
+        With workers=0 frames are written synchronously in submit().
+
+        Args:
+            image_format (str): 'jpg' (default), 'png' or 'webp'.
+            quality (int): Encoding quality, 0-100. Default is 95.
+            scale (float): Optional downscale factor in (0, 1], e.g., 0.5 halves width and height.
+            workers (int): Number of writer threads. Default is 2.
+            max_queue (int): Maximum number of frames waiting to be written. Default is 8.
+
+        """
+        if image_format.lower() not in IMAGE_FORMATS:
+            raise ValueError(f'Unsupported image format {image_format}, expected one of {list(IMAGE_FORMATS)}')
+        if scale is not None and not 0 < scale <= 1:
+            raise ValueError('scale must be in (0, 1].')
+        self.extension = IMAGE_FORMATS[image_format.lower()]
+        self.params = encode_params(image_format, quality)
+        self.scale = scale
+        self.errors = []
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, frame, path):
+        if self.scale is not None and self.scale != 1:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        if not cv2.imwrite(path, frame, self.params):
+            raise IOError(f'Could not write frame {path}')
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, frame, path_stem):
+        """
+        Queues a frame to be written. Blocks while the queue is full.
+
+        Args:
+            frame (np.ndarray): BGR frame from cv2.
+            path_stem (str): Output path without extension.
+
+        Returns:
+            path (str): The path the frame will be written to.
+
+        """
+        if self.errors:
+            raise self.errors[0]
+        path = f'{path_stem}{self.extension}'
+        if self._threads:
+            self._queue.put((frame, path))
+        else:
+            self._write(frame, path)
+        return path
+
+    def close(self):
+        """
+        Waits for every queued frame to be written and stops the threads. Raises the first write error, if any.
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.errors:
+            raise self.errors[0]
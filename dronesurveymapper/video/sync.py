@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:20:51 2026
+
+@author: Labadmin
+"""
+import numpy as np
+import pandas as pd
+
+# Telemetry fields interpolated linearly between samples
+LINEAR_FIELDS = ['GPS Latitude', 'GPS Longitude', 'Absolute Altitude', 'Relative Altitude',
+                 'Drone Roll', 'Drone Pitch', 'Gimbal Pitch', 'Gimbal Roll', 'Elapsed (s)']
+# Headings in degrees, interpolated along the shortest arc so 179 -> -179 does not swing through 0
+ANGLE_FIELDS = ['Drone Yaw', 'Gimbal Yaw']
+# Camera settings change in steps; they take the value of the nearest sample
+NEAREST_FIELDS = ['Sample Duration', 'ISO', 'Shutter Speed', 'F Number', 'Digital Zoom']
+
+
+def telemetry_times(telemetry):
+    """
+    Video time of each telemetry sample, in seconds.
+    DJI stamps each sample with its position in the video ('Sample Time'), which is the same clock as the frame
+    presentation times. The GPS clock ('Elapsed (s)') is only used if the sample times are missing or not increasing.
+
+    Args:
+        telemetry (pd.DataFrame): Typed telemetry from telemetry.telemetry_from_rows or telemetry_from_exiftool_json.
+
+    Returns:
+        times (np.ndarray): float64 seconds, one per sample.
+
+    """
+    times = telemetry['Sample Time'].to_numpy(dtype=np.float64)
+    if len(times) and np.isfinite(times).all() and (np.diff(times) > 0).all():
+        return times
+    return telemetry['Elapsed (s)'].to_numpy(dtype=np.float64)
+
+
+def _interp_angle(times, sample_times, degrees):
+    """
+    Interpolates headings through their unwrapped (continuous) form and wraps the result back to [-180, 180).
+    """
+    valid = np.isfinite(degrees)
+    if not valid.any():
+        return np.full(len(times), np.nan)
+    unwrapped = np.rad2deg(np.unwrap(np.deg2rad(degrees[valid])))
+    out = np.interp(times, sample_times[valid], unwrapped)
+    return (out + 180) % 360 - 180
+
+
+def _interp_linear(times, sample_times, values):
+    valid = np.isfinite(values)
+    if not valid.any():
+        return np.full(len(times), np.nan)
+    return np.interp(times, sample_times[valid], values[valid])
+
+
+def interpolate_telemetry(telemetry, times, time_offset=0.0):
+    """
+    Resamples the telemetry at arbitrary video times, e.g., the presentation times of extracted frames.
+    Position and attitude are interpolated linearly (headings along the shortest arc), camera settings take the
+    nearest sample and 'GPS Date/Time' is interpolated. Times outside the telemetry are NaN/NaT.
+
+    Args:
+        telemetry (pd.DataFrame): Typed telemetry from telemetry.telemetry_from_rows or telemetry_from_exiftool_json.
+        times (array-like): Video times to sample at, in seconds.
+        time_offset (float): Seconds added to times before matching, to correct a known lag between video and telemetry.
+            Default is 0.
+
+    Returns:
+        synced (pd.DataFrame): One row per time, with the telemetry columns. 'Sample Time' holds the requested times.
+
+    """
+    times = np.asarray(times, dtype=np.float64)
+    query = times + time_offset
+    sample_times = telemetry_times(telemetry)
+    order = np.argsort(sample_times, kind='stable')
+    sample_times = sample_times[order]
+    samples = telemetry.iloc[order]
+
+    synced = {}
+    for name in LINEAR_FIELDS:
+        synced[name] = _interp_linear(query, sample_times, samples[name].to_numpy(dtype=np.float64))
+    for name in ANGLE_FIELDS:
+        synced[name] = _interp_angle(query, sample_times, samples[name].to_numpy(dtype=np.float64))
+    if len(sample_times):
+        after = np.clip(np.searchsorted(sample_times, query), 0, len(sample_times) - 1)
+        before = np.clip(after - 1, 0, len(sample_times) - 1)
+        nearest = np.where(np.abs(query - sample_times[before]) <= np.abs(sample_times[after] - query), before, after)
+    else:
+        nearest = np.zeros(len(query), dtype=np.int64)
+    for name in NEAREST_FIELDS:
+        values = samples[name].to_numpy(dtype=np.float64)
+        synced[name] = values[nearest] if len(values) else np.full(len(query), np.nan)
+
+    gps_time = samples['GPS Date/Time']
+    valid = gps_time.notna().to_numpy()
+    if valid.any():
+        ns = gps_time[valid].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        # Interpolate offsets from the first time stamp; epoch nanoseconds do not fit a float64 exactly
+        offset = np.interp(query, sample_times[valid], (ns - ns[0]).astype(np.float64))
+        synced['GPS Date/Time'] = pd.to_datetime(ns[0] + np.round(offset).astype(np.int64))
+    else:
+        synced['GPS Date/Time'] = pd.Series(pd.NaT, index=range(len(query)), dtype='datetime64[ns]')
+    synced['Sample Time'] = times
+
+    synced = pd.DataFrame(synced)
+    outside = (query < sample_times[0]) | (query > sample_times[-1]) if len(sample_times) else np.ones(len(query), bool)
+    synced.loc[outside, synced.columns.drop('Sample Time')] = np.nan
+    return synced.reindex(columns=[c for c in telemetry.columns if c in synced.columns])
+
+
+def sample_grid(duration, interval_seconds, start=0.0):
+    """
+    Regular sample times, e.g., every 0.2 s or every 5 s of a clip.
+
+    Args:
+        duration (float): Length of the clip, in seconds.
+        interval_seconds (float): Time between samples, in seconds.
+        start (float): First sample time, in seconds. Default is 0.
+
+    Returns:
+        times (np.ndarray): float64 sample times in [start, duration].
+
+    """
+    if interval_seconds <= 0:
+        raise ValueError('interval_seconds must be positive.')
+    n = int(np.floor((duration - start) / interval_seconds + 1e-9)) + 1
+    return start + interval_seconds * np.arange(max(n, 0), dtype=np.float64)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 19:52:30 2026
+
+@author: Labadmin
+"""
+import json
+import subprocess
+import numpy as np
+import pandas as pd
+
+from ..metrics import get_metrics
+
+# Per-sample fields of the DJI embedded telemetry, in output order
+TELEMETRY_FIELDS = ['Sample Time', 'Sample Duration', 'ISO', 'Shutter Speed', 'F Number',
+                    'Digital Zoom', 'Drone Roll', 'Drone Pitch', 'Drone Yaw', 'GPS Latitude',
+                    'GPS Longitude', 'Absolute Altitude', 'Relative Altitude', 'Gimbal Pitch',
+                    'Gimbal Roll', 'Gimbal Yaw', 'GPS Date/Time']
+NUMERIC_FIELDS = ['Sample Duration', 'ISO', 'F Number', 'Digital Zoom', 'Drone Roll', 'Drone Pitch',
+                  'Drone Yaw', 'Absolute Altitude', 'Relative Altitude', 'Gimbal Pitch', 'Gimbal Roll',
+                  'Gimbal Yaw']
+# exiftool tag names (as printed with -j) of the telemetry fields
+EXIFTOOL_TAGS = {'SampleTime': 'Sample Time',
+                 'SampleDuration': 'Sample Duration',
+                 'ISO': 'ISO',
+                 'ShutterSpeed': 'Shutter Speed',
+                 'FNumber': 'F Number',
+                 'DigitalZoom': 'Digital Zoom',
+                 'DroneRoll': 'Drone Roll',
+                 'DronePitch': 'Drone Pitch',
+                 'DroneYaw': 'Drone Yaw',
+                 'GPSLatitude': 'GPS Latitude',
+                 'GPSLongitude': 'GPS Longitude',
+                 'AbsoluteAltitude': 'Absolute Altitude',
+                 'RelativeAltitude': 'Relative Altitude',
+                 'GimbalPitch': 'Gimbal Pitch',
+                 'GimbalRoll': 'Gimbal Roll',
+                 'GimbalYaw': 'Gimbal Yaw',
+                 'GPSDateTime': 'GPS Date/Time'}
+# Extract embedded (per-sample) metadata as JSON, with numeric values and the sub-document of each tag
+EXIFTOOL_JSON_ARGS = ['-j', '-n', '-ee', '-G3']
+# Fields that are often missing from a sample and are interpolated from their neighbours
+INTERPOLATED_FIELDS = ['Drone Roll']
+
+GPS_DATETIME_FORMAT = '%Y:%m:%d %H:%M:%S.%fZ'
+# Some firmwares write whole-second GPS times, without the fraction
+GPS_DATETIME_FORMAT_SECONDS = '%Y:%m:%d %H:%M:%SZ'
+_NUMBER_RE = r'^\s*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)'
+_DMS_RE = r'(\d+)\s*deg\s*(\d+)\'\s*([\d.]+)"\s*([NSEW])'
+
+
+def read_exiftool_text(txt_path):
+    """
+    Reads the human-readable output of exiftool into (Variable, Value) rows.
+
+    Args:
+        txt_path (str): Path to the output of 'exiftool -ee'.
+
+    Returns:
+        rows (pd.DataFrame): One row per line, with 'Variable' and 'Value' columns.
+
+    """
+    variables = []
+    values = []
+    with open(txt_path, 'r', encoding='utf-8', errors='replace') as f_in:
+        for line in f_in:
+            variable, sep, value = line.partition(':')
+            if sep:
+                variables.append(variable.strip())
+                values.append(value.strip())
+    return pd.DataFrame({'Variable': pd.Series(variables, dtype=object), 'Value': pd.Series(values, dtype=object)})
+
+
+def telemetry_from_rows(rows):
+    """
+    Turns (Variable, Value) rows into a typed per-sample table in one vectorized pass.
+    Rows are grouped by the 'Sample Time' row that starts each sample and pivoted, so optional or missing rows
+    (Drone Roll, Gimbal Roll, Warning, repeated camera info) only affect their own column.
+
+    Args:
+        rows (pd.DataFrame): 'Variable' and 'Value' columns, in file order.
+
+    Returns:
+        telemetry (pd.DataFrame): One row per sample with the TELEMETRY_FIELDS columns. Numeric fields, 'Sample Time' (s),
+            'Shutter Speed' (s) and 'GPS Latitude'/'GPS Longitude' (decimal degrees) are float64, 'GPS Date/Time' is
+            parsed to datetimes and 'Elapsed (s)' is the GPS time since the first sample.
+
+    """
+    sample_id = (rows['Variable'] == 'Sample Time').cumsum()
+    rows = rows.assign(sample=sample_id.to_numpy())
+    # Drop the file header before the first sample and everything that is not a telemetry field
+    rows = rows[(rows['sample'] > 0) & rows['Variable'].isin(TELEMETRY_FIELDS)]
+    rows = rows.drop_duplicates(['sample', 'Variable'], keep='first')
+    telemetry = rows.pivot(index='sample', columns='Variable', values='Value')
+    telemetry = telemetry.reindex(columns=TELEMETRY_FIELDS).reset_index(drop=True)
+    telemetry.columns.name = None
+    return type_telemetry(telemetry)
+
+
+def type_telemetry(telemetry):
+    """
+    Converts the raw columns of a telemetry table to their types, interpolates the optional fields and adds 'Elapsed (s)'.
+    Numeric input (exiftool -n) is used as is. Text input is converted: units are stripped, 'Sample Time' and
+    'Shutter Speed' become seconds and the DMS 'GPS Latitude'/'GPS Longitude' strings become signed decimal degrees.
+
+    Args:
+        telemetry (pd.DataFrame): Table with TELEMETRY_FIELDS columns.
+
+    Returns:
+        telemetry (pd.DataFrame): The typed table.
+
+    """
+    for name in NUMERIC_FIELDS:
+        column = telemetry[name]
+        if _is_text(column):
+            # Strip units, e.g., '0.03 s'
+            column = column.astype(str).str.extract(_NUMBER_RE, expand=False)
+        telemetry[name] = pd.to_numeric(column, errors='coerce').astype(np.float64)
+    if _is_text(telemetry['Sample Time']):
+        telemetry['Sample Time'] = _text_to_seconds(telemetry['Sample Time'])
+    if _is_text(telemetry['Shutter Speed']):
+        telemetry['Shutter Speed'] = _fraction_to_float(telemetry['Shutter Speed'])
+    for name in ('Sample Time', 'Shutter Speed'):
+        telemetry[name] = pd.to_numeric(telemetry[name], errors='coerce').astype(np.float64)
+    for name in ('GPS Latitude', 'GPS Longitude'):
+        if _is_text(telemetry[name]):
+            telemetry[name] = _dms_to_degrees(telemetry[name])
+        telemetry[name] = pd.to_numeric(telemetry[name], errors='coerce').astype(np.float64)
+    for name in INTERPOLATED_FIELDS:
+        telemetry[name] = telemetry[name].interpolate(limit_direction='both')
+
+    gps_time = telemetry['GPS Date/Time']
+    if not pd.api.types.is_datetime64_any_dtype(gps_time.dtype):
+        text = gps_time.astype(str).str.strip()
+        gps_time = pd.to_datetime(text, format=GPS_DATETIME_FORMAT, errors='coerce')
+        gps_time = gps_time.fillna(pd.to_datetime(text, format=GPS_DATETIME_FORMAT_SECONDS, errors='coerce'))
+    telemetry['GPS Date/Time'] = gps_time
+    if len(telemetry):
+        telemetry['Elapsed (s)'] = (gps_time - gps_time.iloc[0]).dt.total_seconds().to_numpy(dtype=np.float64)
+    else:
+        telemetry['Elapsed (s)'] = pd.Series(dtype=np.float64)
+    return telemetry
+
+
+def _is_text(column):
+    # exiftool -n gives numbers (possibly in an object column), the text output gives strings
+    return pd.api.types.infer_dtype(column, skipna=True) in ('string', 'mixed')
+
+
+def _text_to_seconds(column):
+    """
+    Converts exiftool durations ('1.03 s' or 'H:MM:SS') to seconds.
+    """
+    column = column.astype(str)
+    hms = column.str.extract(r'^\s*(\d+):(\d+):([\d.]+)').astype(np.float64)
+    seconds = hms[0] * 3600 + hms[1] * 60 + hms[2]
+    plain = pd.to_numeric(column.str.extract(_NUMBER_RE, expand=False), errors='coerce')
+    return seconds.fillna(plain)
+
+
+def _fraction_to_float(column):
+    """
+    Converts exposure times ('1/1000' or '2') to seconds.
+    """
+    parts = column.astype(str).str.extract(r'^\s*([\d.]+)(?:/([\d.]+))?').astype(np.float64)
+    return parts[0] / parts[1].fillna(1.0)
+
+
+def _dms_to_degrees(column):
+    """
+    Converts DMS strings with cardinal directions (e.g., 53 deg 24' 29.32" N) to signed decimal degrees in one pass.
+    """
+    parts = column.astype(str).str.extract(_DMS_RE)
+    degrees = (parts[0].astype(np.float64) + parts[1].astype(np.float64) / 60 + parts[2].astype(np.float64) / 3600)
+    return degrees.where(~parts[3].isin(['S', 'W']), -degrees)
+
+
+def telemetry_from_exiftool_json(metadata):
+    """
+    Builds a typed per-sample table from the JSON metadata object of one video ('exiftool -j -n -ee -G3').
+    Each embedded sample is a sub-document (Doc1, Doc2, ...) whose tags become the columns of one row.
+
+    Args:
+        metadata (dict): The JSON object exiftool prints for the video.
+
+    Returns:
+        telemetry (pd.DataFrame): See telemetry_from_rows.
+
+    """
+    columns = {field: {} for field in TELEMETRY_FIELDS}
+    for key, value in metadata.items():
+        group, _, tag = key.partition(':')
+        field = EXIFTOOL_TAGS.get(tag)
+        if field is None or not group.startswith('Doc') or not group[3:].isdigit():
+            continue
+        columns[field][int(group[3:])] = value
+    telemetry = pd.DataFrame({field: pd.Series(values, dtype=object) for field, values in columns.items()})
+    telemetry = telemetry.sort_index().reset_index(drop=True)
+    # Samples are the documents that carry a time stamp
+    telemetry = telemetry[telemetry['Sample Time'].notna()].reset_index(drop=True)
+    return type_telemetry(telemetry)
+
+
+def run_exiftool_json(video_path, exiftool='exiftool', pool=None):
+    """
+    Runs exiftool on a video and returns its JSON metadata object, read straight from the pipe (nothing is written to disk).
+
+    Args:
+        video_path (str): Path to the video.
+        exiftool (str): exiftool executable. Default is 'exiftool'. Ignored if pool is given.
+        pool (ExifToolPool): Optional pool of long-lived exiftool processes to run the command on.
+
+    Returns:
+        metadata (dict): The JSON object exiftool prints for the video.
+
+    """
+    with get_metrics().timer('video.exiftool', video_path):
+        if pool is not None:
+            stdout, stderr = pool.execute(*EXIFTOOL_JSON_ARGS, video_path)
+        else:
+            result = subprocess.run([exiftool, *EXIFTOOL_JSON_ARGS, video_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            stdout, stderr = result.stdout, result.stderr.decode(errors='replace')
+    if not stdout.strip():
+        raise RuntimeError(f'exiftool failed on {video_path}: {stderr.strip()}')
+    return json.loads(stdout)[0]
+
+
+def read_telemetry_json(video_path, exiftool='exiftool', pool=None):
+    """
+    Extracts the per-sample telemetry of a DJI video through exiftool's JSON output.
+
+    Args:
+        video_path (str): Path to the video.
+        exiftool (str): exiftool executable. Default is 'exiftool'. Ignored if pool is given.
+        pool (ExifToolPool): Optional pool of long-lived exiftool processes to run the command on.
+
+    Returns:
+        telemetry (pd.DataFrame): See telemetry_from_rows.
+
+    """
+    metadata = run_exiftool_json(video_path, exiftool, pool)
+    with get_metrics().timer('video.telemetry_parse', video_path):
+        return telemetry_from_exiftool_json(metadata)
+
+
+def parse_telemetry_text(txt_path):
+    """
+    Parses the output of 'exiftool -ee' on a DJI video into a typed per-sample table.
+
+    Args:
+        txt_path (str): Path to the exiftool output.
+
+    Returns:
+        telemetry (pd.DataFrame): See telemetry_from_rows.
+
+    """
+    with get_metrics().timer('video.telemetry_parse', txt_path):
+        return telemetry_from_rows(read_exiftool_text(txt_path))
+
+
+def first_sample_per_second(elapsed):
+    """
+    Positions of the first sample in each whole second of elapsed time.
+
+    Args:
+        elapsed (array-like): Seconds since the first sample.
+
+    Returns:
+        positions (np.ndarray): Integer positions into elapsed.
+
+    """
+    seconds = np.floor(np.asarray(elapsed, dtype=np.float64))
+    return np.flatnonzero(~pd.Series(seconds).duplicated().to_numpy())
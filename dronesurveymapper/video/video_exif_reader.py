@@ -5,48 +5,112 @@ Created on Tue May 20 14:33:05 2025
 @author: Labadmin
 """
 import os
+import time
 import subprocess
 import cv2
+import numpy as np
 import pandas as pd
 
-from .utils import get_first_second_indices, elapsed_seconds_since_ref, filter_dict_by_keys, dms_to_epsg4326
+from ..metrics import get_metrics
+from .frame_table import FRAME_COLUMNS, build_frame_table, write_frame_table
+from .frame_writer import FrameWriterPool
+from .sync import interpolate_telemetry
+from .telemetry import parse_telemetry_text, read_telemetry_json, first_sample_per_second
 
 
 class DJIVideoExifReader():
-    def __init__(self, video_path, output_dir, txt_path=None):
+    def __init__(self, video_path, output_dir, txt_path=None, use_json=True, exiftool='exiftool', exiftool_pool=None,
+                 read_telemetry=True):
+        """
+        Reads the embedded telemetry of a DJI video and extracts georeferenced frames.
+        By default the telemetry is read from exiftool's JSON output straight into self.telemetry.
+        If txt_path is given (or use_json is False), the human-readable 'exiftool -ee' text file is parsed instead.
+        With read_telemetry=False exiftool is not run until parse_exiftxt is called (e.g., when only extracting frames).
+
+        Args:
+            video_path (str): Path to the DJI MP4.
+            output_dir (str): Folder for the extracted frames and CSV. Created if it does not exist.
+            txt_path (str): Optional existing 'exiftool -ee' text output to parse instead of running exiftool.
+            use_json (bool): If True (default), read the telemetry through 'exiftool -j -n -ee -G3'.
+            exiftool (str): exiftool executable. Default is 'exiftool'.
+            exiftool_pool (ExifToolPool): Optional pool of long-lived exiftool processes, shared between readers.
+            read_telemetry (bool): If True (default), run exiftool now. Otherwise defer it to parse_exiftxt.
+
+        """
         # Ensure the input video path exists
         if not os.path.isfile(video_path):
             raise FileNotFoundError(f'Video file not found: {video_path}')
         self.video_path = video_path
+        self.exiftool = exiftool
+        self.exiftool_pool = exiftool_pool
 
         # Create the output directory if it does not exist
         os.makedirs(output_dir, exist_ok=True)
         self.output_dir = output_dir
-
-        if txt_path is None:
-            self.txt_path = self.exif_to_txt()
+        self.frame_extension = '.jpg'
+        self.extracted_frames = None
+
+        self.use_json = use_json
+        self.telemetry = None
+        self.txt_path = txt_path
+        if read_telemetry:
+            self._read_telemetry()
+
+    def _read_telemetry(self):
+        if self.txt_path is not None:
+            return
+        if self.use_json:
+            self.telemetry = read_telemetry_json(self.video_path, self.exiftool, self.exiftool_pool)
         else:
-            self.txt_path = txt_path
+            self.txt_path = self.exif_to_txt()
 
     def exif_to_txt(self):
         txt_file = self.video_path.replace('.MP4', '.txt')
         txt_path = os.path.join(self.output_dir, txt_file)
         with open(txt_path, 'w') as f_out:
-            _ = subprocess.call(
-                ['exiftool', '-ee', self.video_path],
-                stdout=f_out,
-                stderr=subprocess.PIPE)
+            if self.exiftool_pool is not None:
+                stdout, _ = self.exiftool_pool.execute('-ee', self.video_path)
+                f_out.write(stdout)
+            else:
+                _ = subprocess.call(
+                    [self.exiftool, '-ee', self.video_path],
+                    stdout=f_out,
+                    stderr=subprocess.PIPE)
 
         return txt_path
 
-    def extract_frames_from_video(self):
+    def extract_frames_from_video(self, interval_seconds=1, mode='grab', image_format='jpg', quality=95,
+                                  scale=None, writer_workers=2, max_queue=8):
         """
-        Extracts frames from an MP4 video at a specified interval and saves them as JPG images.
+        Extracts frames from an MP4 video at a specified interval and saves them as images.
+        Sampled frames are the ones closest to each multiple of interval_seconds.
+        Decoding runs on this thread while a FrameWriterPool encodes and writes frames in the background.
+
+        Modes:
+            'grab': Walks the stream with grab() and only decodes/retrieves the sampled frames. Best for short intervals.
+            'seek': Seeks straight to each sampled frame index. Best when the interval is longer than the keyframe spacing.
+            'keyframe': Fast approximate mode. Finds keyframes from the packet flags without decoding, then decodes only
+                the keyframe nearest to each sample time. Frame times follow the keyframe spacing of the video.
+
+        Args:
+            interval_seconds (float): Time between extracted frames, in seconds. Default is 1.
+            mode (str): 'grab' (default), 'seek' or 'keyframe'.
+            image_format (str): 'jpg' (default), 'png' or 'webp'.
+            quality (int): Encoding quality, 0-100. Default is 95.
+            scale (float): Optional downscale factor in (0, 1].
+            writer_workers (int): Number of background writer threads. 0 writes synchronously. Default is 2.
+            max_queue (int): Maximum number of decoded frames waiting to be written. Default is 8.
 
         Returns:
-            None
+            extracted (list of tuple): (frame filename, frame index, presentation time in seconds) of each saved frame.
         """
-        interval_seconds = 1  # TODO: Add support to this class for different interval_seconds
+        if interval_seconds <= 0:
+            raise ValueError('interval_seconds must be positive.')
+        if mode not in ('grab', 'seek', 'keyframe'):
+            raise ValueError(f"Unknown mode {mode}, expected 'grab', 'seek' or 'keyframe'.")
+
+        metrics = get_metrics()
+        start = time.perf_counter()
         # Open the video file
         video_capture = cv2.VideoCapture(self.video_path)
 
@@ -54,222 +118,246 @@ class DJIVideoExifReader():
         fps = video_capture.get(cv2.CAP_PROP_FPS)
         if fps <= 0:
             raise ValueError('Invalid FPS value. Cannot extract frames.')
-
-        # Calculate the number of frames to skip between extractions
-        frame_interval = int(fps * interval_seconds)
-
-        # Initialize frame counter
-        frame_count = 0
-        saved_frame_count = 0
-
+        frame_count = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        try:
+            if mode == 'grab':
+                frames = self._iter_frames_grab(video_capture, fps, interval_seconds)
+            elif mode == 'seek':
+                targets = self._sample_indices(fps, frame_count, interval_seconds)
+                frames = self._iter_frames_seek(video_capture, fps, targets)
+            else:
+                keyframes = self._find_keyframes()
+                targets = self._nearest_keyframes(keyframes, fps, frame_count, interval_seconds)
+                frames = self._iter_frames_seek(video_capture, fps, targets)
+
+            extracted = []
+            with FrameWriterPool(image_format, quality, scale, writer_workers, max_queue) as writer:
+                for frame_index, time_s, frame in frames:
+                    # Queue the frame; blocks while the writers are behind
+                    frame_stem = os.path.join(self.output_dir, f'frame_{len(extracted):05d}')
+                    frame_filename = writer.submit(frame, frame_stem)
+                    extracted.append((frame_filename, frame_index, time_s))
+        finally:
+            # Release the video capture object
+            video_capture.release()
+
+        self.frame_extension = writer.extension
+        self.extracted_frames = extracted
+        metrics.record('video.frames', time.perf_counter() - start, self.video_path)
+        metrics.count('video.frames_extracted', len(extracted))
+        return extracted
+
+    def _sample_indices(self, fps, frame_count, interval_seconds):
+        """
+        Frame indices closest to each multiple of interval_seconds.
+        """
+        indices = []
+        k = 0
         while True:
-            # Read the next frame
+            index = int(round(k * interval_seconds * fps))
+            if index >= frame_count:
+                return indices
+            if not indices or index != indices[-1]:
+                indices.append(index)
+            k += 1
+
+    def _iter_frames_grab(self, video_capture, fps, interval_seconds):
+        """
+        Yields the sampled frames, skipping the others with grab() so they are never retrieved or colour-converted.
+        """
+        frame_index = 0
+        k = 0
+        next_index = 0
+        while video_capture.grab():
+            if frame_index >= next_index:
+                success, frame = video_capture.retrieve()
+                if not success:
+                    break
+                yield (*self._decoded_position(video_capture, fps, frame_index), frame)
+                # Next sample time; skip any that fall on the same frame
+                while next_index <= frame_index:
+                    k += 1
+                    next_index = int(round(k * interval_seconds * fps))
+            frame_index += 1
+
+    def _iter_frames_seek(self, video_capture, fps, frame_indices):
+        """
+        Yields the given frames by seeking to each one.
+        """
+        for frame_index in frame_indices:
+            video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
             success, frame = video_capture.read()
             if not success:
-                break  # Exit loop if no more frames
+                break
+            yield (*self._decoded_position(video_capture, fps, frame_index), frame)
 
-            # Save frame if it's at the correct interval
-            if frame_count % frame_interval == 0:
-                # Construct output frame filename
-                frame_filename = os.path.join(self.output_dir, f'frame_{saved_frame_count:05d}.jpg')
+    @staticmethod
+    def _decoded_position(video_capture, fps, frame_index):
+        """
+        Index and presentation time (s) of the frame just decoded, as reported by the decoder. Seeks can land on another
+        frame than requested and variable frame rate videos drift from index / fps, so the requested index is only used
+        if the backend does not report a position.
+        """
+        # The position is that of the next frame once a frame has been read
+        decoded_index = int(video_capture.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+        if decoded_index < 0:
+            decoded_index = frame_index
+        time_ms = video_capture.get(cv2.CAP_PROP_POS_MSEC)
+        time_s = time_ms / 1000 if time_ms > 0 or decoded_index == 0 else decoded_index / fps
+        return decoded_index, time_s
+
+    def _find_keyframes(self):
+        """
+        Finds the keyframe indices of the video by reading the raw packets without decoding them.
+        """
+        raw_capture = cv2.VideoCapture(self.video_path, cv2.CAP_FFMPEG)
+        try:
+            raw_capture.set(cv2.CAP_PROP_FORMAT, -1)  # Raw, undecoded packets
+            keyframes = []
+            frame_index = 0
+            while raw_capture.grab():
+                if raw_capture.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                    keyframes.append(frame_index)
+                frame_index += 1
+        finally:
+            raw_capture.release()
+        if not keyframes:
+            raise ValueError('No keyframes found. Cannot extract frames in keyframe mode.')
+        return keyframes
+
+    def _nearest_keyframes(self, keyframes, fps, frame_count, interval_seconds):
+        """
+        The keyframe nearest to each sample time, without repeats.
+        """
+        keyframes = np.asarray(keyframes)
+        targets = np.asarray(self._sample_indices(fps, frame_count, interval_seconds), dtype=np.int64)
+        after = np.clip(np.searchsorted(keyframes, targets), 0, len(keyframes) - 1)
+        before = np.clip(after - 1, 0, len(keyframes) - 1)
+        use_before = np.abs(targets - keyframes[before]) <= np.abs(keyframes[after] - targets)
+        nearest = np.where(use_before, keyframes[before], keyframes[after])
+        return list(dict.fromkeys(nearest.tolist()))
 
-                # Save frame as JPG
-                cv2.imwrite(frame_filename, frame)
-                saved_frame_count += 1
+    def parse_exiftxt(self):
+        """
+        Parses the exiftool telemetry of the video into a typed per-sample table (see telemetry.telemetry_from_rows),
+        stored in self.telemetry, and selects the first sample of each second.
+        The text output is parsed if self.txt_path is set, otherwise the JSON telemetry read at construction is used.
 
-            frame_count += 1
+        Returns:
+            frames (dict): Per-sample field dicts, keyed by the elapsed seconds since the first sample (as strings).
+                Only the first of several samples with the same elapsed time is kept.
+            frame_keys (list of str): Keys of the first sample in each second.
+        """
+        if self.telemetry is None:
+            self._read_telemetry()
+        if self.txt_path is not None:
+            self.telemetry = parse_telemetry_text(self.txt_path)
+        keys = self.telemetry['Elapsed (s)'].astype(str)
+        # GPS times only change once per second on some firmwares: samples sharing a time keep the first one
+        unique = ~keys.duplicated(keep='first').to_numpy()
+        frames = self.telemetry.drop(columns=['Sample Time', 'Elapsed (s)'])[unique].set_index(keys[unique]).to_dict('index')
+        frame_keys = keys.iloc[first_sample_per_second(self.telemetry['Elapsed (s)'])].tolist()
+        return frames, frame_keys
 
-        # Release the video capture object
-        video_capture.release()
+    def sync_telemetry(self, times=None, time_offset=0.0):
+        """
+        Interpolates the telemetry at the presentation time of each extracted frame (see sync.interpolate_telemetry).
 
-    def parse_exiftxt(self):
-        # TODO: This function needs tidying
-        df = pd.read_fwf(self.txt_path, header=None, usecols=[0, 2], names=['Variable', 'Value'])
-        values_to_remove = ['Protocol', 'Serial Number', 'Model', 'Frame Width', 'Frame Height', 'Frame Rate']
-        df = df[~df['Variable'].isin(values_to_remove)]  # Have to do some cleaning so the loop works
-        # Find index where frames start
-        frame_starts = [i for i, val in enumerate(df['Variable'].tolist()) if val == 'Sample Time']
-        frames = {}
-        prev_drone_roll = 0
-
-        for index in frame_starts:
-            frame_dict = {}
-
-            # sample_time, not highly useful due to the constantly changing format
-            sample_time_row = df.iloc[index]
-            sample_time_variable = sample_time_row['Variable']
-            assert sample_time_variable == 'Sample Time', f'Expected Sample Time but got {sample_time_variable} at {index}'
-            sample_time_value = sample_time_row['Value']
-
-            # sample_duration
-            sample_duration_row = df.iloc[index + 1]
-            sample_duration_variable = sample_duration_row['Variable']
-            assert sample_duration_variable == 'Sample Duration', f'Expected Sample Duration but got {sample_duration_variable} at {index + 1}'
-            sample_duration_value = sample_duration_row['Value']
-            frame_dict['Sample Duration'] = sample_duration_value
-
-            # ISO
-            ISO_row = df.iloc[index + 2]
-            ISO_variable = ISO_row['Variable']
-            assert ISO_variable == 'ISO', f'Expected ISO but got {ISO_variable} at {index + 2}'
-            ISO_value = ISO_row['Value']
-            frame_dict['ISO'] = ISO_value
-
-            # shutter_speed
-            shutter_speed_row = df.iloc[index + 3]
-            shutter_speed_variable = shutter_speed_row['Variable']
-            assert shutter_speed_variable == 'Shutter Speed', f'Expected Shutter Speed but got {shutter_speed_variable} at {index + 3}'
-            shutter_speed_value = shutter_speed_row['Value']
-            frame_dict['Shutter Speed'] = shutter_speed_value
-
-            # f_number
-            f_number_row = df.iloc[index + 4]
-            f_number_variable = f_number_row['Variable']
-            assert f_number_variable == 'F Number', f'Expected F Number but got {f_number_variable} at {index + 4}'
-            f_number_value = f_number_row['Value']
-            frame_dict['F Number'] = f_number_value
-
-            # digital_zoom
-            digital_zoom_row = df.iloc[index + 5]
-            digital_zoom_variable = digital_zoom_row['Variable']
-            assert digital_zoom_variable == 'Digital Zoom', f'Expected Digital Zoom but got {digital_zoom_variable} at {index + 5}'
-            digital_zoom_value = digital_zoom_row['Value']
-            frame_dict['Digital Zoom'] = digital_zoom_value
-
-            # drone_roll
-            drone_roll_row = df.iloc[index + 6]
-            drone_roll_variable = drone_roll_row['Variable']
-            try:  # Many drone rolls are missing
-                assert drone_roll_variable == 'Drone Roll', f'Expected Drone Roll but got {drone_roll_variable} at {index + 6}'
-                drone_roll_value = drone_roll_row['Value']
-                frame_dict['Drone Roll'] = drone_roll_value
-                prev_drone_roll = drone_roll_value
-            except AssertionError:
-                # If drone roll is not found, interpolate
-                next_drone_roll_row_index = df['Variable'].tolist().index('Drone Roll', index + 7)
-                next_drone_roll_row = df.iloc[next_drone_roll_row_index]
-                next_drone_roll_variable = next_drone_roll_row['Variable']
-                assert next_drone_roll_variable == 'Drone Roll', f'Expected Drone Roll but got {drone_roll_variable} at {index + 6}'
-                next_drone_roll_value = drone_roll_row['Value']
-                avg_drone_roll_value = (float(next_drone_roll_value) + float(prev_drone_roll)) / 2
-                frame_dict['Drone Roll'] = avg_drone_roll_value
-                index -= 1  # Increment the index to account for the missing row
-
-            # drone_pitch
-            drone_pitch_row = df.iloc[index + 7]
-            drone_pitch_variable = drone_pitch_row['Variable']
-            assert drone_pitch_variable == 'Drone Pitch', f'Expected Drone Pitch but got {drone_pitch_variable} at {index + 7}'
-            drone_pitch_value = drone_pitch_row['Value']
-            frame_dict['Drone Pitch'] = drone_pitch_value
-
-            # drone_yaw
-            drone_yaw_row = df.iloc[index + 8]
-            drone_yaw_variable = drone_yaw_row['Variable']
-            assert drone_yaw_variable == 'Drone Yaw', f'Expected Drone Yaw but got {drone_yaw_variable} at {index + 8}'
-            drone_yaw_value = drone_yaw_row['Value']
-            frame_dict['Drone Yaw'] = drone_yaw_value
-
-            # gps_latitude
-            gps_latitude_row = df.iloc[index + 9]
-            gps_latitude_variable = gps_latitude_row['Variable']
-            assert gps_latitude_variable == 'GPS Latitude', f'Expected GPS Latitude but got {gps_latitude_variable} at {index + 9}'
-            gps_latitude_value = gps_latitude_row['Value']
-            frame_dict['GPS Latitude'] = gps_latitude_value
-
-            # gps_longitude
-            gps_longitude_row = df.iloc[index + 10]
-            gps_longitude_variable = gps_longitude_row['Variable']
-            assert gps_longitude_variable == 'GPS Longitude', f'Expected GPS Longitude but got {gps_longitude_variable} at {index + 10}'
-            gps_longitude_value = gps_longitude_row['Value']
-            frame_dict['GPS Longitude'] = gps_longitude_value
-
-            # absolute_altitude
-            absolute_altitude_row = df.iloc[index + 11]
-            absolute_altitude_variable = absolute_altitude_row['Variable']
-            assert absolute_altitude_variable == 'Absolute Altitude', f'Expected Absolute Altitude but got {absolute_altitude_variable} at {index + 11}'
-            absolute_altitude_value = absolute_altitude_row['Value']
-            frame_dict['Absolute Altitude'] = absolute_altitude_value
-
-            # relative_altitude
-            relative_altitude_row = df.iloc[index + 12]
-            relative_altitude_variable = relative_altitude_row['Variable']
-            assert relative_altitude_variable == 'Relative Altitude', f'Expected Relative Altitude but got {relative_altitude_variable} at {index + 12}'
-            relative_altitude_value = relative_altitude_row['Value']
-            frame_dict['Relative Altitude'] = relative_altitude_value
-
-            # gimbal_pitch
-            gimbal_pitch_row = df.iloc[index + 13]
-            gimbal_pitch_variable = gimbal_pitch_row['Variable']
-            assert gimbal_pitch_variable == 'Gimbal Pitch', f'Expected Gimbal Pitch but got {gimbal_pitch_variable} at {index + 13}'
-            gimbal_pitch_value = gimbal_pitch_row['Value']
-            frame_dict['Gimbal Pitch'] = gimbal_pitch_value
-
-            # gimbal_yaw
-            gimbal_yaw_row = df.iloc[index + 14]
-            gimbal_yaw_variable = gimbal_yaw_row['Variable']
-            if gimbal_yaw_variable == 'Gimbal Roll':  # Gimbal Roll is very rarely recorded
-                index += 1
-                gimbal_yaw_row = df.iloc[index + 14]
-                gimbal_yaw_variable = gimbal_yaw_row['Variable']
-            assert gimbal_yaw_variable == 'Gimbal Yaw', f'Expected Gimbal Yaw but got {gimbal_yaw_variable} at {index + 14}'
-            gimbal_yaw_value = gimbal_yaw_row['Value']
-            frame_dict['Gimbal Yaw'] = gimbal_yaw_value
-
-            # gps_date_time
-            gps_date_time_row = df.iloc[index + 15]
-            gps_date_time_variable = gps_date_time_row['Variable']
-            if gps_date_time_variable == 'Warning':  # Clunky handling of Warning row for now
-                gps_date_time_row = df.iloc[index + 16]
-                gps_date_time_variable = gps_date_time_row['Variable']
-            assert gps_date_time_variable == 'GPS Date/Time', f'Expected GPS Date/Time but got {gps_date_time_variable} at {index + 16}'
-            gps_date_time_value = gps_date_time_row['Value']
-            frame_dict['GPS Date/Time'] = gps_date_time_value
-
-            if index == frame_starts[0]:
-                ref_time = gps_date_time_value
-
-            elapsed = elapsed_seconds_since_ref(ref_time, gps_date_time_value)
-
-            frames[elapsed] = frame_dict
-        _, frame_keys = get_first_second_indices(frames)
-        return frames, frame_keys
+        Args:
+            times (array-like): Optional video times to sample at, in seconds. Default is the times of the extracted frames.
+            time_offset (float): Seconds added to the times to correct a known video/telemetry lag. Default is 0.
 
-    def save_frame_csv(self, frames, frame_keys):
-        # Filter frames
-        frames = filter_dict_by_keys(frames, frame_keys)
-
-        # Init dataframe
-        df = pd.DataFrame(columns=['Image Name', 'Sample Time', 'Sample Duration',
-                                   'ISO', 'Shutter Speed', 'F Number',
-                                   'Digital Zoom', 'Drone Roll', 'Drone Pitch',
-                                   'Drone Yaw', 'GPS Latitude', 'GPS Longitude',
-                                   'Absolute Altitude', 'Relative Altitude',
-                                   'Gimbal Pitch', 'Gimbal Yaw', 'GPS Date/Time'])
-
-        # Iter over frames
-        for i, key in enumerate(frames):
-            img_name = f'frame_{i:05d}.jpg'
-            lat = frames[key]['GPS Latitude']
-            lon = frames[key]['GPS Longitude']
-            lat, lon = dms_to_epsg4326(lat, lon)
-
-            row = [img_name,
-                   key,
-                   frames[key]['Sample Duration'],
-                   frames[key]['ISO'],
-                   frames[key]['Shutter Speed'],
-                   frames[key]['F Number'],
-                   frames[key]['Digital Zoom'],
-                   frames[key]['Drone Roll'],
-                   frames[key]['Drone Pitch'],
-                   frames[key]['Drone Yaw'],
-                   lat,
-                   lon,
-                   frames[key]['Absolute Altitude'],
-                   frames[key]['Relative Altitude'],
-                   frames[key]['Gimbal Pitch'],
-                   frames[key]['Gimbal Yaw'],
-                   frames[key]['GPS Date/Time']]
-
-            df.loc[i] = row
-        df.to_csv(os.path.join(self.output_dir, 'frames.csv'))
+        Returns:
+            synced (pd.DataFrame): One telemetry row per time.
+        """
+        if times is None:
+            if self.extracted_frames is None:
+                raise ValueError('No extracted frames to synchronize. Run extract_frames_from_video or pass times.')
+            times = [time_s for _, _, time_s in self.extracted_frames]
+        if self.telemetry is None or self.txt_path is not None:
+            self.parse_exiftxt()
+        return interpolate_telemetry(self.telemetry, times, time_offset)
+
+    def frame_table(self, frames=None, frame_keys=None, columns=None):
+        """
+        Builds the frame metadata table, one row per frame (see frame_table.build_frame_table).
+        If frames were extracted, the telemetry is interpolated at each frame's presentation time, so every row matches
+        its image; frames and frame_keys are then ignored. Otherwise the first sample of each second is used (or the
+        given frames), matching frames extracted at 1 s intervals.
+        The table is built column by column from the typed telemetry, with coordinates already in decimal degrees.
+
+        Args:
+            frames (dict): Optional per-sample field dicts from parse_exiftxt. Default is self.telemetry.
+            frame_keys (list of str): Keys of frames to use, from parse_exiftxt. Required if frames is given.
+            columns (list of str): Output columns. Default is frame_table.FRAME_COLUMNS.
+
+        Returns:
+            table (pd.DataFrame): The frame table.
+        """
+        if self.extracted_frames is not None:
+            frame_names = [os.path.basename(frame_filename) for frame_filename, _, _ in self.extracted_frames]
+            return build_frame_table(self.sync_telemetry(), np.arange(len(frame_names)), frame_names=frame_names,
+                                     columns=columns)
+        if frames is None:
+            if self.telemetry is None or self.txt_path is not None:
+                self.parse_exiftxt()
+            return build_frame_table(self.telemetry, frame_extension=self.frame_extension, columns=columns)
+        samples = pd.DataFrame.from_dict(frames, orient='index').loc[frame_keys]
+        samples['Elapsed (s)'] = samples.index.astype(np.float64)
+        return build_frame_table(samples, np.arange(len(samples)), self.frame_extension, columns=columns)
+
+    def save_frame_csv(self, frames=None, frame_keys=None, path=None, driver=None, out_epsg='EPSG:4326'):
+        """
+        Writes the frame metadata table (see frame_table).
+
+        Args:
+            frames (dict): Optional per-sample field dicts from parse_exiftxt. Default is self.telemetry.
+                Ignored if frames were extracted (see frame_table).
+            frame_keys (list of str): Keys of frames to write, from parse_exiftxt. Required if frames is given.
+            path (str): Output path. Default is output_dir/frames.csv.
+            driver (str): 'CSV', 'Parquet', 'GeoJSON', 'FlatGeobuf', 'GPKG' or 'GeoParquet'. Inferred from the extension if None.
+            out_epsg (str): EPSG of the frame points for the spatial formats. Default is 'EPSG:4326'.
+
+        Returns:
+            table (pd.DataFrame): The frame table.
+        """
+        table = self.frame_table(frames, frame_keys)
+        if path is None:
+            path = os.path.join(self.output_dir, 'frames.csv')
+        write_frame_table(table, path, driver, out_epsg)
+        return table
+
+    def save_frame_footprints(self, path, focal_length_35mm, out_epsg='EPSG:4326', driver=None, ground_elevation=None,
+                              max_distance=None):
+        """
+        Writes the ground footprint polygon of each frame with its metadata (see footprints.frame_footprints).
+        Frames whose footprint is undefined (no position, or a view that reaches the horizon) are left out.
+
+        Args:
+            path (str): Output path.
+            focal_length_35mm (float): 35mm equivalent focal length of the video camera (mm), e.g., 24.
+            out_epsg (str): EPSG of the polygons. Default is 'EPSG:4326'.
+            driver (str): 'GeoJSON', 'FlatGeobuf', 'GPKG' or 'GeoParquet'. Inferred from the extension if None.
+            ground_elevation (float): Optional constant ground elevation (m). Default is flat ground at the take-off point.
+            max_distance (float): Optional maximum ground distance of a footprint corner from the camera (m).
+
+        Returns:
+            n_features (int): Number of footprints written.
+        """
+        from ..footprints import frame_footprints, polygon_chunks
+        from ..writers import write_features
+
+        video_capture = cv2.VideoCapture(self.video_path)
+        width = video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)
+        height = video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        video_capture.release()
+        if width <= 0 or height <= 0:
+            raise ValueError(f'Could not read the frame size of {self.video_path}')
+
+        # The gimbal roll tilts the footprint, so it is kept even though the frame CSV leaves it out
+        table = self.frame_table(columns=FRAME_COLUMNS + ['Gimbal Roll'])
+        chunks = polygon_chunks([table], frame_footprints, focal_length_35mm=focal_length_35mm,
+                                width=width, height=height, out_epsg=out_epsg, ground_elevation=ground_elevation,
+                                max_distance=max_distance)
+        return write_features(path, chunks, out_epsg, driver=driver, geometry_type='Polygon')
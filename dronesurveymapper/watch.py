@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:14:36 2026
+
+@author: Labadmin
+"""
+import os
+import json
+import time
+
+from .image.discovery import iter_survey_images, JPEG_EXTENSIONS
+from .image.metadata_cache import file_signature
+from .video.batch import VIDEO_EXTENSIONS
+
+
+class FolderWatcher:
+    def __init__(self,
+                 folder,
+                 output,
+                 out_epsg='EPSG:4326',
+                 video_output_root=None,
+                 footprints_output=None,
+                 settle_seconds=5.0,
+                 recursive=True,
+                 state_path=None,
+                 workers=1,
+                 video_workers=2,
+                 exiftool='exiftool',
+                 interval_seconds=1):
+        """
+        Watches a folder for newly arrived survey images and videos (e.g., as SD cards are copied) and processes only
+        those, appending the new images to a GeoPackage layer instead of rebuilding it.
+        A file is processed once its size and modification time have not changed for settle_seconds, so files that are
+        still being copied are left for a later poll. Processed files are recorded in a JSON state file, so a restarted
+        watcher carries on where it stopped.
+
+        Args:
+            folder (str): Folder to watch.
+            output (str): GeoPackage (.gpkg) of image points, created or extended.
+            out_epsg (str): EPSG of the output layers. Default is EPSG:4326.
+            video_output_root (str): Folder for the video outputs (see video.batch.process_videos). Videos are ignored if None.
+            footprints_output (str): Optional GeoPackage (.gpkg) of image footprints, created or extended.
+            settle_seconds (float): Time a file must stay unchanged before it is processed. Default is 5.
+            recursive (bool): If True (default), also watch sub-folders.
+            state_path (str): State file. Default is output + '.watch.json'.
+            workers (int): Number of parallel image metadata readers. Default is 1.
+            video_workers (int): Number of video worker processes. Default is 2.
+            exiftool (str): exiftool executable. Default is 'exiftool'.
+            interval_seconds (float): Time between extracted video frames. Default is 1.
+
+        """
+        for path in (output, footprints_output):
+            if path is not None and not path.lower().endswith('.gpkg'):
+                raise ValueError(f'Watch outputs are extended in place and must be GeoPackages (.gpkg), got {path}')
+        self.folder = folder
+        self.output = output
+        self.out_epsg = out_epsg
+        self.video_output_root = video_output_root
+        self.footprints_output = footprints_output
+        self.settle_seconds = settle_seconds
+        self.recursive = recursive
+        self.state_path = state_path if state_path is not None else f'{output}.watch.json'
+        self.workers = workers
+        self.video_workers = video_workers
+        self.exiftool = exiftool
+        self.interval_seconds = interval_seconds
+        self.failures = []
+        # Output folders inside the watched folder (e.g., extracted video frames) are not scanned
+        self._exclude = []
+        output_dirs = [os.path.dirname(os.path.abspath(path)) for path in (output, footprints_output) if path is not None]
+        if video_output_root is not None:
+            output_dirs.append(video_output_root)
+        for output_dir in output_dirs:
+            rel_dir = os.path.relpath(os.path.abspath(output_dir), os.path.abspath(folder))
+            if rel_dir != '.' and rel_dir != '..' and not rel_dir.startswith('..' + os.sep):
+                self._exclude.append(rel_dir.replace(os.sep, '/'))
+
+        self.processed = {}
+        if os.path.isfile(self.state_path):
+            with open(self.state_path, 'r') as f_in:
+                self.processed = json.load(f_in).get('processed', {})
+        # path -> (signature, time the signature was first seen)
+        self._pending = {}
+
+    def _save_state(self):
+        tmp_path = f'{self.state_path}.tmp'
+        with open(tmp_path, 'w') as f_out:
+            json.dump({'processed': self.processed}, f_out)
+        os.replace(tmp_path, self.state_path)
+
+    def _scan(self):
+        """
+        Finds the files that are new and no longer changing.
+
+        Returns:
+            images (list of str): Ready images.
+            videos (list of str): Ready videos.
+
+        """
+        extensions = JPEG_EXTENSIONS + (VIDEO_EXTENSIONS if self.video_output_root is not None else ())
+        now = time.monotonic()
+        ready = []
+        for path in iter_survey_images(self.folder, recursive=self.recursive, exclude=self._exclude,
+                                       extensions=extensions):
+            key = os.path.abspath(path)
+            if key in self.processed:
+                continue
+            try:
+                signature = file_signature(path)
+            except OSError:
+                continue  # Removed since it was listed
+            previous = self._pending.get(key)
+            if previous is None or previous[0] != signature:
+                self._pending[key] = (signature, now)
+            elif signature[0] > 0 and now - previous[1] >= self.settle_seconds:
+                ready.append(path)
+        videos = [path for path in ready if path.lower().endswith(VIDEO_EXTENSIONS)]
+        images = [path for path in ready if not path.lower().endswith(VIDEO_EXTENSIONS)]
+        return images, videos
+
+    def _mark_processed(self, paths):
+        for path in paths:
+            key = os.path.abspath(path)
+            self.processed[key] = list(self._pending.pop(key)[0])
+        self._save_state()
+
+    def _process_images(self, images):
+        from .image.ingest import iter_image_metadata
+        from .image.survey_table import build_survey_table
+        from .writers import write_features, point_chunks
+
+        records = []
+        for image_path, metadata, error in iter_image_metadata(images, workers=self.workers):
+            if error is None and metadata.lon_lat is None:
+                error = 'No GPS coordinates in EXIF data'
+            if error is not None:
+                self.failures.append((image_path, error))
+                continue
+            records.append(metadata)
+        if records:
+            table = build_survey_table(records, self.out_epsg)
+            write_features(self.output, point_chunks([table]), self.out_epsg, driver='GPKG', append=True)
+            if self.footprints_output is not None:
+                from .footprints import polygon_chunks, survey_footprints
+
+                chunks = polygon_chunks([table], survey_footprints, out_epsg=self.out_epsg)
+                write_features(self.footprints_output, chunks, self.out_epsg, driver='GPKG', geometry_type='Polygon',
+                               append=True)
+        return len(records)
+
+    def _process_videos(self, videos):
+        from .video.batch import process_videos
+
+        # Videos arrive over many polls: folders follow the paths in the watched folder so same-named videos of
+        # different cards never share one
+        manifest = process_videos(videos, self.video_output_root, workers=self.video_workers, exiftool=self.exiftool,
+                                  relative_to=self.folder, interval_seconds=self.interval_seconds)
+        for video in videos:
+            for task, result in manifest.videos.get(os.path.abspath(video), {}).get('tasks', {}).items():
+                if result['status'] == 'failed':
+                    self.failures.append((video, f"{task}: {result['error']}"))
+
+    def poll(self):
+        """
+        Scans the folder once and processes the files that are ready.
+
+        Returns:
+            n_images (int): Number of images added to the output.
+            n_videos (int): Number of videos processed.
+
+        """
+        images, videos = self._scan()
+        n_images = 0
+        if images:
+            n_images = self._process_images(images)
+            self._mark_processed(images)
+        if videos:
+            self._process_videos(videos)
+            self._mark_processed(videos)
+        return n_images, len(videos)
+
+    def run(self, poll_seconds=10.0, max_polls=None, callback=None):
+        """
+        Polls the folder until interrupted (Ctrl+C) or max_polls is reached.
+
+        Args:
+            poll_seconds (float): Time between polls. Default is 10.
+            max_polls (int): Optional number of polls to stop after.
+            callback (callable): Optional function of (n_images, n_videos), called after each poll that found files.
+
+        """
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                n_images, n_videos = self.poll()
+                if callback is not None and (n_images or n_videos):
+                    callback(n_images, n_videos)
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(poll_seconds)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 16:07:44 2026
+
+@author: Labadmin
+"""
+import os
+import json
+import math
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import CRS
+
+from .projection import normalize_epsg
+from .metrics import get_metrics
+
+DRIVERS = {'.geojson': 'GeoJSON',
+           '.json': 'GeoJSON',
+           '.fgb': 'FlatGeobuf',
+           '.gpkg': 'GPKG',
+           '.parquet': 'GeoParquet',
+           '.geoparquet': 'GeoParquet'}
+# Drivers whose layers can be extended in place
+APPENDABLE_DRIVERS = ['GPKG']
+
+
+def infer_driver(path):
+    """
+    Infers the output driver from a file extension.
+
+    Args:
+        path (str): Output path.
+
+    Returns:
+        driver (str): 'GeoJSON', 'FlatGeobuf', 'GPKG' or 'GeoParquet'.
+
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in DRIVERS:
+        raise ValueError(f'Cannot infer output format from {path}, expected one of {list(DRIVERS)}')
+    return DRIVERS[ext]
+
+
+def point_chunks(tables, x_col='x', y_col='y'):
+    """
+    Turns a stream of tables with projected coordinate columns into (properties, point geometries) chunks.
+
+    Args:
+        tables (iterable of pd.DataFrame): Tables with x and y columns.
+        x_col (str): Name of the x column. Default is 'x'.
+        y_col (str): Name of the y column. Default is 'y'.
+
+    Yields:
+        properties (pd.DataFrame): The remaining columns.
+        geometry (np.ndarray): shapely Points.
+
+    """
+    for table in tables:
+        geometry = shapely.points(table[x_col].to_numpy(dtype=np.float64), table[y_col].to_numpy(dtype=np.float64))
+        yield table.drop(columns=[x_col, y_col]), geometry
+
+
+def write_features(path, chunks, crs, driver=None, geometry_type='Point', append=False):
+    """
+    Writes features to a spatial file incrementally, one chunk at a time, so memory is bounded by the chunk size.
+
+    Args:
+        path (str): Output path.
+        chunks (iterable): (properties DataFrame, shapely geometry array) pairs, e.g., from point_chunks.
+        crs (str): EPSG of the geometries, e.g., 'EPSG:32611'.
+        driver (str): 'GeoJSON', 'FlatGeobuf', 'GPKG' or 'GeoParquet'. Inferred from the extension if None.
+        geometry_type (str): Geometry type of the layer, e.g., 'Point' or 'Polygon'.
+        append (bool): If True, add the features to an existing layer instead of replacing it. GPKG only.
+
+    Returns:
+        n_features (int): Number of features written.
+
+    """
+    if driver is None:
+        driver = infer_driver(path)
+    if append and driver not in APPENDABLE_DRIVERS:
+        raise ValueError(f'Cannot append to {driver}, expected one of {APPENDABLE_DRIVERS}')
+    if driver not in DRIVERS.values():
+        raise ValueError(f'Unsupported driver {driver}')
+    metrics = get_metrics()
+    # Time spent producing the chunks (e.g., reading images) is not counted as writing
+    with metrics.consumer_timer(f'write.{driver}', chunks) as chunks:
+        n_features = _write(path, chunks, crs, driver, geometry_type, append)
+    metrics.count('write.features', n_features)
+    return n_features
+
+
+def _write(path, chunks, crs, driver, geometry_type, append):
+    if driver == 'GeoJSON':
+        return _write_geojson(path, chunks, crs)
+    if driver == 'GeoParquet':
+        return _write_geoparquet(path, chunks, crs, geometry_type)
+    if driver == 'FlatGeobuf':
+        # GDAL spools features to a temporary file to build the packed Hilbert R-tree, so memory stays bounded
+        return _write_ogr(path, chunks, crs, geometry_type, 'FlatGeobuf', {'SPATIAL_INDEX': 'YES'})
+    return _write_ogr(path, chunks, crs, geometry_type, 'GPKG', {'SPATIAL_INDEX': 'YES'},
+                      append=append and os.path.exists(path))
+
+
+# Stand-in (properties, geometry) chunk for writing an empty layer when no chunk was given
+_EMPTY_CHUNK = (pd.DataFrame(), np.empty(0, dtype=object))
+
+
+def _json_column(values):
+    """
+    Converts a column to JSON-serializable Python values (NaN/NaT/NA become None, datetimes become ISO strings).
+    """
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return [None if pd.isna(v) else v.isoformat() for v in values]
+    out = values.astype(object).where(values.notna(), None).tolist()
+    return [v.item() if isinstance(v, np.generic) else v for v in out]
+
+
+def _write_geojson(path, chunks, crs):
+    epsg = normalize_epsg(crs)
+    n_features = 0
+    with open(path, 'w', encoding='utf-8') as f_out:
+        f_out.write('{\n"type": "FeatureCollection",\n')
+        if epsg != 'EPSG:4326':
+            code = epsg.split(':')[1]
+            f_out.write(f'"crs": {{ "type": "name", "properties": {{ "name": "urn:ogc:def:crs:EPSG::{code}" }} }},\n')
+        f_out.write('"features": [\n')
+        for properties, geometry in chunks:
+            names = list(properties.columns)
+            columns = [_json_column(properties[name]) for name in names]
+            geometries = shapely.to_geojson(geometry)
+            for i, geom in enumerate(geometries):
+                props = json.dumps({name: _finite(col[i]) for name, col in zip(names, columns)})
+                sep = ',\n' if n_features else ''
+                f_out.write(f'{sep}{{ "type": "Feature", "properties": {props}, "geometry": {geom} }}')
+                n_features += 1
+        f_out.write('\n]\n}\n')
+    return n_features
+
+
+def _finite(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _arrow_table(properties, geometry, schema=None):
+    """
+    Converts a chunk to a pyarrow Table with a WKB geometry column.
+    """
+    import pyarrow as pa
+
+    properties = properties.copy()
+    for name in properties.columns:
+        if isinstance(properties[name].dtype, pd.CategoricalDtype):
+            properties[name] = properties[name].astype(object)
+    properties['geometry'] = shapely.to_wkb(geometry)
+    if schema is None:
+        schema = pa.Schema.from_pandas(properties, preserve_index=False)
+        # Columns that are empty in the first chunk would otherwise be typed null
+        schema = pa.schema([pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in schema])
+        schema = schema.set(schema.get_field_index('geometry'), pa.field('geometry', pa.binary()))
+    return pa.Table.from_pandas(properties, schema=schema, preserve_index=False)
+
+
+def _write_geoparquet(path, chunks, crs, geometry_type):
+    import pyarrow.parquet as pq
+
+    geo = {'version': '1.0.0',
+           'primary_column': 'geometry',
+           'columns': {'geometry': {'encoding': 'WKB',
+                                    'geometry_types': [geometry_type],
+                                    'crs': CRS.from_user_input(normalize_epsg(crs)).to_json_dict()}}}
+    writer = None
+    n_features = 0
+    try:
+        for properties, geometry in chunks:
+            if writer is None:
+                table = _arrow_table(properties, geometry)
+                schema = table.schema.with_metadata({**(table.schema.metadata or {}), b'geo': json.dumps(geo).encode()})
+                writer = pq.ParquetWriter(path, schema)
+            else:
+                table = _arrow_table(properties, geometry, writer.schema.remove_metadata())
+            writer.write_table(table.replace_schema_metadata(writer.schema.metadata))
+            n_features += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        # No chunks at all: write an empty layer, as the other drivers do
+        table = _arrow_table(*_EMPTY_CHUNK)
+        schema = table.schema.with_metadata({**(table.schema.metadata or {}), b'geo': json.dumps(geo).encode()})
+        with pq.ParquetWriter(path, schema) as empty_writer:
+            empty_writer.write_table(table.replace_schema_metadata(schema.metadata))
+    return n_features
+
+
+def _write_ogr(path, chunks, crs, geometry_type, driver, layer_options, append=False):
+    import pyarrow as pa
+    from pyogrio.raw import write_arrow
+
+    chunks = iter(chunks)
+    # With no chunks at all an empty layer is written, as the other drivers do
+    first_table = _arrow_table(*next(chunks, _EMPTY_CHUNK))
+    schema = first_table.schema
+    counter = [0]
+
+    def batches():
+        table = first_table
+        while True:
+            counter[0] += table.num_rows
+            yield from table.to_batches()
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            table = _arrow_table(*chunk, schema)
+
+    reader = pa.RecordBatchReader.from_batches(schema, batches())
+    write_arrow(reader, path, driver=driver, geometry_name='geometry', geometry_type=geometry_type,
+                crs=CRS.from_user_input(normalize_epsg(crs)).to_wkt(), append=append,
+                layer_options=None if append else layer_options)
+    return counter[0]
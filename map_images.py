@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:44:19 2026
+
+@author: Labadmin
+"""
+import sys
+
+from dronesurveymapper.cli import main
+
+if __name__ == '__main__':
+    raise SystemExit(main(['image', *sys.argv[1:]]))
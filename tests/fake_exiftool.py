@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:40:19 2026
+
+@author: Labadmin
+"""
+import os
+import sys
+import json
+import time
+
+# Stand-in for 'exiftool -stay_open True -@ -', for testing ExifToolPool without exiftool.
+# Each request prints a JSON list with one {'SourceFile': file} object per file argument, then '{ready<N>}' on stdout
+# and the '-echo4' text on stderr. File arguments can also be directives:
+#   sleep=<seconds>: wait before answering (to trigger a timeout).
+#   crash_once=<marker path>: exit without answering if the marker file exists, deleting it (so a restart succeeds).
+
+
+def run_request(args):
+    files = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in ('-echo4', '-charset'):
+            skip = True  # Option with a value
+        elif not arg.startswith('-'):
+            files.append(arg)
+    for arg in files:
+        name, _, value = arg.partition('=')
+        if name == 'sleep':
+            time.sleep(float(value))
+        elif name == 'crash_once' and os.path.isfile(value):
+            os.remove(value)
+            os._exit(1)
+    files = [path for path in files if '=' not in path]
+    for path in files:
+        if not os.path.exists(path):
+            sys.stderr.write(f'Error: File not found - {path}\n')
+    sys.stdout.write(json.dumps([{'SourceFile': path} for path in files if os.path.exists(path)]) + '\n')
+
+
+def main(argv):
+    if argv[:2] != ['-stay_open', 'True']:
+        run_request(argv)
+        return 0
+    common_args = argv[argv.index('-common_args') + 1:] if '-common_args' in argv else []
+    request = []
+    for line in sys.stdin:
+        line = line.rstrip('\n')
+        if request == ['-stay_open'] and line == 'False':
+            return 0
+        if not line.startswith('-execute'):
+            request.append(line)
+            continue
+        run_request(request + common_args)
+        sys.stdout.write(f'{{ready{line[len("-execute"):]}}}\n')
+        sys.stdout.flush()
+        if '-echo4' in request:
+            sys.stderr.write(request[request.index('-echo4') + 1] + '\n')
+        sys.stderr.flush()
+        request = []
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
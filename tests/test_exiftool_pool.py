@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:52:06 2026
+
+@author: Labadmin
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dronesurveymapper.video.exiftool_pool import ExifToolPool  # noqa: E402
+
+FAKE_EXIFTOOL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_exiftool.py')
+
+
+@unittest.skipIf(os.name == 'nt', 'The fake exiftool is launched through a shell script')
+class TestExifToolPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        # ExifToolPool takes a single executable, so the fake script is wrapped to run with this interpreter
+        self.exiftool = os.path.join(self.tmp_dir, 'exiftool')
+        with open(self.exiftool, 'w') as f_out:
+            f_out.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_EXIFTOOL}" "$@"\n')
+        os.chmod(self.exiftool, 0o755)
+        self.video_path = os.path.join(self.tmp_dir, 'DJI_0001.MP4')
+        open(self.video_path, 'wb').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_request(self):
+        with ExifToolPool(size=1, exiftool=self.exiftool, timeout=10) as pool:
+            for _ in range(2):
+                stdout, stderr = pool.execute('-j', '-n', self.video_path)
+                self.assertEqual(json.loads(stdout), [{'SourceFile': self.video_path}])
+                self.assertEqual(stderr, '')
+            stdout, stderr = pool.execute('-j', os.path.join(self.tmp_dir, 'missing.MP4'))
+            self.assertEqual(json.loads(stdout), [])
+            self.assertIn('File not found', stderr)
+
+    def test_timeout(self):
+        with ExifToolPool(size=1, exiftool=self.exiftool, timeout=0.5, retries=0) as pool:
+            with self.assertRaises(TimeoutError):
+                pool.execute('-j', 'sleep=5')
+            # The stuck process was replaced
+            stdout, _ = pool.execute('-j', self.video_path)
+            self.assertEqual(json.loads(stdout), [{'SourceFile': self.video_path}])
+
+    def test_crash_restart(self):
+        marker_path = os.path.join(self.tmp_dir, 'crash')
+        open(marker_path, 'w').close()
+        with ExifToolPool(size=1, exiftool=self.exiftool, timeout=10, retries=1) as pool:
+            stdout, _ = pool.execute('-j', f'crash_once={marker_path}', self.video_path)
+            self.assertFalse(os.path.exists(marker_path))
+            self.assertEqual(json.loads(stdout), [{'SourceFile': self.video_path}])
+
+
+if __name__ == '__main__':
+    unittest.main()